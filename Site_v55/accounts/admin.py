@@ -4,7 +4,7 @@ from .models import UserProfile
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ['user', 'is_admin']
+    list_display = ['user', 'is_admin', 'comment_count', 'favorite_count']
     list_filter = ['is_admin']
     search_fields = ['user__username', 'user__email']
     ordering = ['user__username']
@@ -0,0 +1,49 @@
+"""
+Backend de autenticação e verificação de administrador do site
+
+O AuthenticationMiddleware carrega só o User; ler user.profile.is_admin
+custava uma consulta extra em toda requisição autenticada. O
+ProfileModelBackend traz o perfil na mesma consulta (select_related) e o
+SiteAdminMiddleware expõe request.is_site_admin, calculado uma vez e só
+quando alguém o usa.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserProfile
+
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend que carrega o UserProfile junto com o usuário"""
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def is_site_admin(user):
+    """True se o usuário está autenticado e tem is_admin no perfil"""
+    if not user.is_authenticated:
+        return False
+    try:
+        return user.profile.is_admin
+    except UserProfile.DoesNotExist:
+        return False
+
+
+class SiteAdminMiddleware:
+    """Define request.is_site_admin (preguiçoso; depois do AuthenticationMiddleware)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.is_site_admin = SimpleLazyObject(lambda: is_site_admin(request.user))
+        return self.get_response(request)
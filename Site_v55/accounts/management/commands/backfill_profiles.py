@@ -0,0 +1,61 @@
+"""
+Cria o UserProfile que falta em contas antigas
+
+Uso:
+    python manage.py backfill_profiles [--batch-size 1000] [--recount]
+
+O signal post_save só cria perfis de usuários novos; contas anteriores a
+ele (ou importadas sem signals) ganham o perfil aqui, em lotes com
+bulk_create, já com os contadores de comentários e favoritos. Com
+--recount, os contadores de todos os perfis são recalculados. Pode ser
+executado mais de uma vez.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import UserProfile, refresh_activity_counts
+
+
+class Command(BaseCommand):
+    help = 'Cria perfis (UserProfile) em lote para usuários que não têm um'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Perfis por bulk_create')
+        parser.add_argument(
+            '--recount',
+            action='store_true',
+            help='Recalcula comment_count e favorite_count de todos os perfis'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size precisa ser positivo.')
+
+        processed = 0
+        last_pk = 0
+        while True:
+            # Por chave primária crescente: cada lote é uma consulta indexada
+            user_ids = list(
+                User.objects.filter(pk__gt=last_pk, profile__isnull=True)
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            # ignore_conflicts: o perfil pode ter sido criado no meio do caminho (get_profile)
+            UserProfile.objects.bulk_create(
+                [UserProfile(user_id=pk) for pk in user_ids], ignore_conflicts=True
+            )
+            refresh_activity_counts(UserProfile.objects.filter(user_id__in=user_ids))
+            processed += len(user_ids)
+            last_pk = user_ids[-1]
+
+        if processed:
+            # Com ignore_conflicts o banco não informa quantas linhas entraram
+            self.stdout.write(self.style.SUCCESS(f'✅ {processed} usuários sem perfil processados.'))
+        else:
+            self.stdout.write('✅ Todos os usuários já têm perfil.')
+
+        if options['recount']:
+            updated = refresh_activity_counts()
+            self.stdout.write(self.style.SUCCESS(f'✅ Contadores recalculados em {updated} perfis.'))
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:05
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# Lista de usuários do painel admin: busca por prefixo, LOWER(coluna) LIKE 'abc%'
+SEARCH_INDEXES = {
+    'accounts_user_username_lower': 'username',
+    'accounts_user_email_lower': 'email',
+}
+# ... e paginação por cursor em (date_joined, id)
+DATE_JOINED_INDEX = 'accounts_user_date_joined_id'
+
+
+def populate_activity_counts(apps, schema_editor):
+    """Contadores iniciais a partir dos comentários e favoritos existentes"""
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+
+    def counted(model):
+        subquery = (
+            apps.get_model('mammals', model).objects.filter(user_id=OuterRef('user_id'))
+            .order_by().values('user_id').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+    UserProfile.objects.update(comment_count=counted('Comment'), favorite_count=counted('Favorite'))
+
+
+def create_search_indexes(apps, schema_editor):
+    """Índices em auth_user (o modelo User não é deste app, então via SQL)"""
+    # No PostgreSQL, text_pattern_ops permite usar o índice em LIKE 'prefixo%'
+    opclass = ' text_pattern_ops' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, column in SEARCH_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX {name} ON auth_user (LOWER({column}){opclass})')
+    schema_editor.execute(f'CREATE INDEX {DATE_JOINED_INDEX} ON auth_user (date_joined, id)')
+
+
+def drop_search_indexes(apps, schema_editor):
+    for name in [*SEARCH_INDEXES, DATE_JOINED_INDEX]:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('mammals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Comentários'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='favorite_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Favoritos'),
+        ),
+        migrations.RunPython(populate_activity_counts, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
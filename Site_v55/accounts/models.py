@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -17,6 +19,9 @@ class UserProfile(models.Model):
         verbose_name="É Administrador",
         help_text="Define se o usuário tem privilégios administrativos"
     )
+    # Contadores mantidos pelos signals de Comment/Favorite (evitam COUNT na lista de usuários)
+    comment_count = models.PositiveIntegerField(default=0, verbose_name="Comentários")
+    favorite_count = models.PositiveIntegerField(default=0, verbose_name="Favoritos")
 
     class Meta:
         verbose_name = "Perfil de Usuário"
@@ -26,8 +31,42 @@ class UserProfile(models.Model):
         return f"Perfil de {self.user.username}"
 
 
+def get_profile(user):
+    """
+    Perfil do usuário, criado na hora para contas antigas que não têm um
+    (o signal só cria perfis de usuários novos; ver backfill_profiles)
+    """
+    try:
+        return user.profile
+    except UserProfile.DoesNotExist:
+        profile, created = UserProfile.objects.get_or_create(user=user)
+        if created:
+            refresh_activity_counts(UserProfile.objects.filter(pk=profile.pk))
+            profile.refresh_from_db(fields=['comment_count', 'favorite_count'])
+        user.profile = profile
+        return profile
+
+
+def refresh_activity_counts(profiles=None):
+    """
+    Recalcula comment_count e favorite_count com um UPDATE por subconsulta
+    (após bulk_create ou para corrigir divergências)
+    """
+    from mammals.models import Comment, Favorite
+
+    def counted(model):
+        subquery = (
+            model.objects.filter(user_id=OuterRef('user_id'))
+            .order_by().values('user_id').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+    profiles = UserProfile.objects.all() if profiles is None else profiles
+    return profiles.update(comment_count=counted(Comment), favorite_count=counted(Favorite))
+
+
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    """Cria ou atualiza UserProfile automaticamente - CORRIGIDO para evitar duplicação"""
-    # Usar get_or_create para evitar erro de duplicação
-    UserProfile.objects.get_or_create(user=instance)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Cria o UserProfile apenas para usuários novos (login e edições não tocam no perfil)"""
+    if created and not raw:
+        instance.profile = UserProfile.objects.create(user=instance)
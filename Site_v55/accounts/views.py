@@ -1,10 +1,29 @@
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.utils.translation import get_language, activate
-from .models import UserProfile
+from .models import get_profile
+
+
+def remember_language(response, language):
+    """
+    Guarda o idioma no cookie lido pelo LocaleMiddleware (e não na sessão,
+    o que forçava uma gravação na tabela de sessões a cada login/logout)
+    """
+    response.set_cookie(
+        settings.LANGUAGE_COOKIE_NAME,
+        language,
+        max_age=settings.LANGUAGE_COOKIE_AGE,
+        path=settings.LANGUAGE_COOKIE_PATH,
+        domain=settings.LANGUAGE_COOKIE_DOMAIN,
+        secure=settings.LANGUAGE_COOKIE_SECURE,
+        httponly=settings.LANGUAGE_COOKIE_HTTPONLY,
+        samesite=settings.LANGUAGE_COOKIE_SAMESITE,
+    )
+    return response
 
 
 def register_view(request):
@@ -46,22 +65,19 @@ def register_view(request):
                 email=email,
                 password=password
             )
-            
-            # Criar perfil (get_or_create para evitar duplicação)
-            UserProfile.objects.get_or_create(user=user, defaults={'is_admin': False})
+            # O perfil é criado pelo signal post_save (created=True)
             
             # Salvar idioma atual antes do login
             current_language = get_language()
             
-            # Fazer login automático
-            login(request, user)
+            # Fazer login automático (com o backend que carrega o perfil)
+            login(request, user, backend=settings.AUTHENTICATION_BACKENDS[0])
             
             # Restaurar idioma após login
             activate(current_language)
-            request.session['django_language'] = current_language
             
             messages.success(request, f'Bem-vindo, {username}! Sua conta foi criada com sucesso.')
-            return redirect('mammals:index')
+            return remember_language(redirect('mammals:index'), current_language)
         
         except Exception as e:
             messages.error(request, f'Erro ao criar conta: {str(e)}')
@@ -94,7 +110,6 @@ def login_view(request):
             
             # Restaurar idioma após login
             activate(current_language)
-            request.session['django_language'] = current_language
             
             # Configurar duração da sessão
             if not remember:
@@ -104,7 +119,7 @@ def login_view(request):
             
             # Redirecionar para a página solicitada ou para o index
             next_page = request.GET.get('next', 'mammals:index')
-            return redirect(next_page)
+            return remember_language(redirect(next_page), current_language)
         else:
             messages.error(request, 'Usuário ou senha incorretos.')
     
@@ -120,16 +135,15 @@ def logout_view(request):
     
     # Restaurar idioma após logout
     activate(current_language)
-    request.session['django_language'] = current_language
     
     messages.info(request, 'Você saiu da sua conta.')
-    return redirect('mammals:index')
+    return remember_language(redirect('mammals:index'), current_language)
 
 
 @login_required
 def profile_view(request):
     """View para visualizar perfil do usuário"""
-    user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    user_profile = get_profile(request.user)
     
     context = {
         'user_profile': user_profile,
@@ -143,7 +157,7 @@ def profile_view(request):
 @login_required
 def edit_profile_view(request):
     """View para editar perfil do usuário"""
-    user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    user_profile = get_profile(request.user)
     
     if request.method == 'POST':
         username = request.POST.get('username', '').strip()
@@ -0,0 +1,61 @@
+"""
+Benchmarks dos caminhos mais usados do catálogo - bench_catalog.py
+
+Mede index, search (com e sem busca), mammal_detail, global_map_data e
+favorites_view em catálogos sintéticos de vários tamanhos (ver conftest.py).
+"""
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    return Client()
+
+
+def get(client, url, **params):
+    """Requisição que precisa dar 200 (uma regressão não pode virar um 404 rápido)"""
+    def run():
+        response = client.get(url, params)
+        assert response.status_code == 200, response.status_code
+        return response
+    return run
+
+
+def test_index(bench, client):
+    bench('index', get(client, reverse('mammals:index')))
+
+
+def test_index_deep_page(bench, client):
+    """Página profunda: com cursor, custa o mesmo que a primeira"""
+    from mammals.models import Mammal
+    from mammals.pagination import encode_cursor
+
+    name, pk = Mammal.objects.order_by('-common_name', '-id').values_list('common_name', 'id')[30]
+    bench('index (página profunda)', get(client, reverse('mammals:index'), after=encode_cursor(name, pk)))
+
+
+def test_search_all(bench, client):
+    bench('search (sem busca)', get(client, reverse('mammals:search')))
+
+
+def test_search_query(bench, client):
+    bench('search (q=rato)', get(client, reverse('mammals:search'), q='rato'))
+
+
+def test_mammal_detail(bench, client, synthetic_catalog):
+    bench('mammal_detail', get(client, reverse('mammals:detail', args=[synthetic_catalog['mammal_id']])))
+
+
+def test_global_map_data(bench, client):
+    bench('global_map_data', get(client, reverse('mammals:global_map_data')))
+
+
+def test_favorites_view(bench, client, synthetic_catalog):
+    client.force_login(synthetic_catalog['user'])
+    bench('favorites_view', get(client, reverse('mammals:favorites')))
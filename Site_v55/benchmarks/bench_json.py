@@ -0,0 +1,114 @@
+"""
+Benchmark da serialização JSON - bench_json.py
+
+Compara o caminho antigo (instâncias de Mammal + dicts + JsonResponse com
+DjangoJSONEncoder) com o novo (tuplas de values_list + FastJsonResponse)
+para o payload completo do mapa global, em um catálogo sintético.
+
+Uso (a partir de Site_v55/):
+    python benchmarks/bench_json.py [--species 5000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'extinct_mammals_django.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.http import JsonResponse  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+from mammals import fastjson  # noqa: E402
+from mammals.models import Mammal  # noqa: E402
+
+
+FIELDS = ('id', 'common_name', 'binomial_name', 'continent', 'image_asset')
+
+
+def legacy_payload():
+    """Caminho anterior: uma instância de modelo por linha"""
+    species = []
+    for mammal in Mammal.objects.only(*FIELDS):
+        species.append({
+            'id': mammal.pk,
+            'common_name': mammal.common_name,
+            'binomial_name': mammal.binomial_name,
+            'continent': mammal.continent or 'Unknown',
+            'image_filename': mammal.image_asset,
+        })
+    return JsonResponse({'success': True, 'species': species}).content
+
+
+def fast_payload():
+    """Caminho novo: tuplas direto do banco e serialização rápida"""
+    species = [
+        {
+            'id': mammal_id,
+            'common_name': common_name,
+            'binomial_name': binomial_name,
+            'continent': continent or 'Unknown',
+            'image_filename': image_asset,
+        }
+        for mammal_id, common_name, binomial_name, continent, image_asset
+        in Mammal.objects.values_list(*FIELDS)
+    ]
+    return fastjson.FastJsonResponse({'success': True, 'species': species}).content
+
+
+def serialize_only(payload, dumps):
+    return lambda: dumps(payload)
+
+
+def best_ms(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--species', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    # Banco de teste temporário (não altera db.sqlite3)
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Mammal.objects.bulk_create(
+            Mammal(
+                common_name=f'Espécie sintética {index}',
+                binomial_name=f'Genus species{index}',
+                description='Mamífero extinto. ' * 20,
+                continent=('Oceania', 'América do Sul', 'África')[index % 3],
+                image_asset=f'images/synthetic/{index}.webp',
+            )
+            for index in range(args.species)
+        )
+
+        backend = 'orjson' if fastjson.orjson is not None else 'json (stdlib)'
+        print(f"📊 {args.species} espécies, melhor de {args.repeat} execuções - backend: {backend}")
+
+        legacy = best_ms(legacy_payload, args.repeat)
+        fast = best_ms(fast_payload, args.repeat)
+        print(f"   Consulta + serialização (antigo): {legacy:8.2f} ms")
+        print(f"   Consulta + serialização (novo):   {fast:8.2f} ms  ({legacy / fast:.1f}x)")
+
+        payload = {'success': True, 'species': list(Mammal.objects.values(*FIELDS))}
+        encoder = lambda data: JsonResponse(data).content  # noqa: E731
+        legacy = best_ms(serialize_only(payload, encoder), args.repeat)
+        fast = best_ms(serialize_only(payload, fastjson.dumps), args.repeat)
+        print(f"   Só serialização (JsonResponse):   {legacy:8.2f} ms")
+        print(f"   Só serialização (fastjson):       {fast:8.2f} ms  ({legacy / fast:.1f}x)")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compara dois resultados de benchmark (benchmarks/results/<commit>.json)
+
+Uso:
+    python benchmarks/compare.py results/abc1234.json results/def5678.json [--threshold 10]
+
+Mostra a variação de mediana, consultas e pico de memória por caso e
+tamanho. Sai com código 1 se algum caso ficou mais lento que o limite
+(em %) ou passou a fazer mais consultas.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path):
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return data, {(result['name'], result['size']): result for result in data['results']}
+
+
+def percent(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara dois resultados de benchmark')
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Aumento de mediana (%%) considerado regressão')
+    args = parser.parse_args(argv)
+
+    base_info, base = load(args.base)
+    head_info, head = load(args.head)
+
+    print(f"📊 {base_info['commit']} → {head_info['commit']}")
+    print(f"   {'caso':<34} {'n':>7} {'mediana ms':>20} {'Δ%':>8} {'consultas':>10} {'pico KiB':>18}")
+
+    regressions = []
+    for key in sorted(base.keys() & head.keys(), key=lambda item: (item[1], item[0])):
+        before, after = base[key], head[key]
+        delta = percent(before['median_ms'], after['median_ms'])
+        slower = delta > args.threshold
+        more_queries = after['queries'] > before['queries']
+        marker = '❌' if slower or more_queries else '  '
+        print(
+            f"{marker} {key[0]:<34} {key[1]:>7} "
+            f"{before['median_ms']:>9.2f} → {after['median_ms']:>8.2f} {delta:>+7.1f}% "
+            f"{before['queries']:>4} → {after['queries']:<3} "
+            f"{before['peak_kib']:>8.1f} → {after['peak_kib']:<8.1f}"
+        )
+        if slower or more_queries:
+            regressions.append(key)
+
+    missing = base.keys() - head.keys()
+    for name, size in sorted(missing):
+        print(f"⚠️  {name} (n={size}) não existe em {head_info['commit']}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressão(ões) acima de {args.threshold:.0f}% ou com mais consultas")
+        return 1
+    print("\n✅ Nenhuma regressão")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Infraestrutura dos benchmarks (estilo pytest-benchmark, sem dependências extras)
+
+Uso (a partir de Site_v55/, offline):
+    DJANGO_SETTINGS_MODULE=extinct_mammals_django.settings \\
+        pytest benchmarks/bench_catalog.py --sizes 100,10000,100000
+
+Cada tamanho gera um catálogo sintético (mammals.synthetic) uma única vez.
+A fixture `bench` mede latência, consultas SQL e pico de memória, e os
+resultados vão para benchmarks/results/<commit>.json (ver compare.py).
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import django
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+_results = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--sizes', default='100,10000,100000',
+                    help='Tamanhos dos catálogos sintéticos (separados por vírgula)')
+    group.addoption('--rounds', type=int, default=5, help='Execuções medidas por caso')
+    group.addoption('--bench-json', default=None,
+                    help='Arquivo de resultados (padrão: benchmarks/results/<commit>.json)')
+
+
+def pytest_generate_tests(metafunc):
+    if 'catalog_size' in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption('sizes').split(',') if size.strip()]
+        metafunc.parametrize('catalog_size', sizes, ids=[f'n{size}' for size in sizes], scope='session')
+
+
+@pytest.fixture(scope='session')
+def synthetic_catalog(catalog_size, django_db_setup, django_db_blocker):
+    """Catálogo sintético com comentários, favoritos, avaliações e coordenadas"""
+    from django.contrib.auth.models import User
+    from mammals import synthetic, views
+    from mammals.models import Comment, Mammal
+
+    with django_db_blocker.unblock():
+        Mammal.objects.all().delete()
+        User.objects.all().delete()
+        cache.clear()
+
+        started = time.perf_counter()
+        summary = synthetic.generate_catalog(
+            mammals=catalog_size,
+            users=max(10, catalog_size // 10),
+            comments=catalog_size * 2,
+            favorites=catalog_size,
+            ratings=catalog_size,
+            seed=catalog_size,
+        )
+        print(f"\n📦 Catálogo sintético de {catalog_size} espécies em {time.perf_counter() - started:.1f}s")
+
+        user = User.objects.filter(username__startswith=synthetic.USERNAME_PREFIX).order_by('pk').first()
+        # Espécie com mais comentários (pior caso da página de detalhes)
+        busiest = (
+            Comment.objects.values('mammal_id').annotate(n=Count('id'))
+            .order_by('-n', 'mammal_id').values_list('mammal_id', flat=True).first()
+        )
+
+    # As coordenadas do mapa vêm de GEOCODING_DATA (indexado por id)
+    with mock.patch.object(views, 'GEOCODING_DATA', summary['coordinates']):
+        yield {'size': catalog_size, 'user': user, 'mammal_id': busiest, 'summary': summary}
+
+    with django_db_blocker.unblock():
+        Mammal.objects.all().delete()
+        User.objects.all().delete()
+
+
+@pytest.fixture
+def bench(request, synthetic_catalog):
+    """Mede uma função: latência (ms), consultas SQL e pico de memória (KiB)"""
+    rounds = request.config.getoption('rounds')
+
+    def measure(name, func):
+        func()  # aquecimento (caches de ETag/compressão, como em produção)
+
+        timings = []
+        for _ in range(rounds):
+            queries = []
+            with connection.execute_wrapper(_counter(queries)):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        result = {
+            'name': name,
+            'size': synthetic_catalog['size'],
+            'rounds': rounds,
+            'min_ms': round(min(timings), 3),
+            'median_ms': round(statistics.median(timings), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'queries': len(queries),
+            'peak_kib': round(peak / 1024, 1),
+        }
+        _results.append(result)
+        return result
+
+    return measure
+
+
+def _counter(queries):
+    """execute_wrapper que anota cada consulta (não depende de DEBUG)"""
+    def wrapper(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def pytest_sessionfinish(session):
+    if not _results:
+        return
+    commit = _commit()
+    path = Path(session.config.getoption('bench_json') or RESULTS_DIR / f'{commit}.json')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'results': _results,
+    }, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    terminal = session.config.pluginmanager.get_plugin('terminalreporter')
+    terminal.write_line('')
+    terminal.write_line(f"📊 {'caso':<34} {'n':>7} {'mediana ms':>11} {'consultas':>10} {'pico KiB':>10}")
+    for result in _results:
+        terminal.write_line(
+            f"   {result['name']:<34} {result['size']:>7} {result['median_ms']:>11.2f} "
+            f"{result['queries']:>10} {result['peak_kib']:>10.1f}"
+        )
+    terminal.write_line(f"💾 Resultados em {path}")
@@ -46,15 +46,34 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'mammals.middleware.AutoInitMiddleware',  # Auto-inicialização do banco
     'django.middleware.security.SecurityMiddleware',
+    'mammals.middleware.CompressionMiddleware',  # br/zstd/gzip de HTML e JSON
+    'mammals.middleware.MetricsMiddleware',  # Consultas/cache/tempo por view (/metrics)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # i18n middleware
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.backends.SiteAdminMiddleware',  # request.is_site_admin (sem consulta extra)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Sessões: 'cached_db' (cache na frente do banco; padrão), 'db' ou 'signed_cookies'
+# (sem tabela; os dados ficam num cookie assinado com a SECRET_KEY)
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+
+# Usuário e perfil na mesma consulta (ver accounts.backends). O ModelBackend
+# continua na lista para as sessões abertas antes dele (BACKEND_SESSION_KEY)
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 ROOT_URLCONF = 'extinct_mammals_django.urls'
 
 TEMPLATES = [
@@ -135,6 +154,9 @@ LANGUAGES = [
     ('en', 'English'),
 ]
 
+# Preferência de idioma guardada em cookie (não na sessão) por um ano
+LANGUAGE_COOKIE_AGE = 60 * 60 * 24 * 365
+
 # Diretório para arquivos de tradução
 LOCALE_PATHS = [
     BASE_DIR / 'locale',
@@ -170,6 +192,46 @@ MESSAGE_TAGS = {
 # Security settings for production only (não afeta desenvolvimento local)
 IS_TESTING = 'pytest' in sys.modules or 'test' in sys.argv
 
+# Cache instrumentado (acertos/faltas aparecem em /metrics): 'locmem' (memória
+# de cada processo; padrão, usado em produção) ou 'db' (tabela compartilhada;
+# criar com manage.py createcachetable). As traduções do run_worker chegam ao
+# servidor web pela tabela Translation, não pelo cache.
+CACHE_MODE = os.environ.get('CACHE_MODE', 'locmem')
+# O padrão do Django (300 chaves) descarta traduções e páginas antes de serem reaproveitadas
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 50000))
+CACHES = {
+    'default': {
+        'locmem': {
+            'BACKEND': 'mammals.cache.InstrumentedLocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        },
+        'db': {
+            'BACKEND': 'mammals.cache.InstrumentedDatabaseCache',
+            'LOCATION': 'mammals_cache',
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        },
+    }[CACHE_MODE]
+}
+
+# Métricas por view: endereços que podem ler /metrics
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
+# Máximo de consultas SQL por view; nos testes, estourar o orçamento falha o teste
+QUERY_BUDGETS = {
+    'mammals:index': 6,
+    'mammals:detail': 12,
+    'mammals:gallery': 3,
+    'mammals:search': 3,
+    'mammals:global_map_data': 3,
+    'mammals:sync': 4,
+    'mammals:facets': 5,
+    'mammals:favorites': 8,
+}
+QUERY_BUDGET_ENFORCE = IS_TESTING
+
+# Tradução automática: 'google' (deep-translator) ou 'stub' (sem rede, testes de carga)
+TRANSLATION_BACKEND = os.environ.get('TRANSLATION_BACKEND', 'google')
+
 if not DEBUG and not IS_TESTING:
     SECURE_SSL_REDIRECT = True
     SESSION_COOKIE_SECURE = True
@@ -187,7 +249,24 @@ import dj_database_url
 # WhiteNoise para servir arquivos estáticos
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Gera também static/sw-precache.js (URLs com hash) para o Service Worker
+STATICFILES_STORAGE = 'mammals.storage.PrecacheManifestStaticFilesStorage'
+
+# Recursos pré-carregados pelo Service Worker na instalação
+PWA_PRECACHE_STATIC = [
+    'css/style.css',
+    'css/accessibility.css',
+    'css/alerts.css',
+    'css/cookie-consent.css',
+    'css/buttons_fix.css',
+    'css/error-pages.css',
+    'js/script.js',
+    'js/cookie-consent.js',
+    'js/pwa.js',
+    'manifest.json',
+    'images/icons/icon-192x192.png',
+]
+PWA_PRECACHE_PAGES = ['/', '/offline/']
 
 # Configuração de banco de dados para produção
 if os.environ.get('DATABASE_URL'):
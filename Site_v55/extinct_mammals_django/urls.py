@@ -6,14 +6,16 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
+from mammals.views import prometheus_metrics
 
 urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),  # URL para mudança de idioma
+    path('metrics', prometheus_metrics, name='metrics'),  # Prometheus (sem prefixo de idioma)
 ]
 
 urlpatterns += i18n_patterns(
     path('admin/', admin.site.urls),
-    path('', include('mammals.urls')),
+    path('', include('mammals.urls')),  # painel próprio em painel/ (admin/ é do admin do Django)
     path('accounts/', include('accounts.urls')),
 )
 
@@ -0,0 +1,24 @@
+"""
+Configuração do gunicorn (gunicorn -c gunicorn.conf.py)
+
+Cada worker tem o próprio LocMemCache: antes de atender a primeira
+requisição, ele aquece o seu (mammals.warmup.warm_process). As traduções já
+estão na tabela Translation (warm_caches no preDeploy).
+"""
+import time
+
+
+def post_worker_init(worker):
+    from mammals import warmup
+
+    started = time.perf_counter()
+    try:
+        visits, failures = warmup.warm_process()
+    except Exception:
+        # Sem cache aquecido o worker continua atendendo, só mais devagar no início
+        worker.log.exception('Aquecimento do cache falhou')
+        return
+    worker.log.info(
+        'Cache aquecido em %.1fs: %d requisições, %d falhas',
+        time.perf_counter() - started, len(visits), len(failures),
+    )
@@ -1,14 +1,72 @@
 from django.contrib import admin
-from .models import Mammal, Comment, Favorite, Rating
+from . import facets, jobs
+from .models import Mammal, MammalImage, Dossier, DossierSection, Comment, Favorite, Rating, FacetTerm, Job
+
+
+class FacetTermFilter(admin.SimpleListFilter):
+    """Filtro da lista lido do vocabulário FacetTerm (sem DISTINCT na tabela)"""
+    kind = None
+    key_field = None
+
+    def lookups(self, request, model_admin):
+        return facets.terms(self.kind)
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.key_field: self.value()})
+        return queryset
+
+
+class ContinentFilter(FacetTermFilter):
+    title = 'Continente'
+    parameter_name = 'continent'
+    kind = FacetTerm.CONTINENT
+    key_field = 'continent_key'
+
+
+class TaxonomyOrderFilter(FacetTermFilter):
+    title = 'Ordem Taxonômica'
+    parameter_name = 'taxonomy'
+    kind = FacetTerm.ORDER
+    key_field = 'taxonomy_key'
+
+
+class MammalImageInline(admin.TabularInline):
+    model = MammalImage
+    fields = ['position', 'image_asset', 'caption']
+    extra = 0
 
 
 @admin.register(Mammal)
 class MammalAdmin(admin.ModelAdmin):
     list_display = ['common_name', 'binomial_name', 'continent', 'taxonomy_order', 'created_at']
-    list_filter = ['continent', 'taxonomy_order', 'created_at']
+    list_filter = [ContinentFilter, TaxonomyOrderFilter, 'created_at']
     search_fields = ['common_name', 'binomial_name', 'description']
     ordering = ['common_name']
     date_hierarchy = 'created_at'
+    inlines = [MammalImageInline]
+
+
+class DossierSectionInline(admin.StackedInline):
+    model = DossierSection
+    fields = ['position', 'anchor', 'nav_label', 'title', 'body']
+    extra = 0
+
+
+@admin.register(Dossier)
+class DossierAdmin(admin.ModelAdmin):
+    list_display = ['title', 'mammal', 'language', 'updated_at']
+    list_filter = ['language']
+    search_fields = ['title', 'mammal__common_name', 'mammal__binomial_name']
+    raw_id_fields = ['mammal']
+    inlines = [DossierSectionInline]
+
+
+@admin.register(FacetTerm)
+class FacetTermAdmin(admin.ModelAdmin):
+    list_display = ['label', 'kind', 'key']
+    list_filter = ['kind']
+    search_fields = ['label', 'key']
 
 
 @admin.register(Comment)
@@ -44,3 +102,17 @@ class RatingAdmin(admin.ModelAdmin):
     def stars_display(self, obj):
         return obj.stars_display
     stars_display.short_description = 'Estrelas'
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'updated_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'key', 'last_error']
+    readonly_fields = ['locked_by', 'locked_at', 'last_error', 'created_at', 'updated_at']
+    actions = ['retry_jobs']
+
+    @admin.action(description='Executar novamente')
+    def retry_jobs(self, request, queryset):
+        count = jobs.retry(queryset)
+        self.message_user(request, f'{count} tarefas voltaram para a fila.')
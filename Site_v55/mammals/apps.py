@@ -7,5 +7,5 @@ class MammalsConfig(AppConfig):
     
     def ready(self):
         """Executado quando o app está pronto"""
-        # Importar apenas para registrar signals, se houver
-        pass
+        # Importar apenas para registrar signals e tarefas em segundo plano
+        from . import signals, tasks  # noqa: F401
@@ -0,0 +1,102 @@
+"""
+Ações em massa do painel admin de mamíferos
+
+Cada ação recebe um queryset e trabalha em conjunto: a exclusão apaga as
+linhas com um DELETE por tabela (as tabelas vêm das relações declaradas nos
+modelos), sem carregar objetos nem disparar os signals por linha, e faz a
+manutenção do catálogo (versão, tombstones, contagens por faceta e
+contadores dos perfis) uma vez para todas as espécies. Tradução e imagens só agendam tarefas (mammals.tasks), e a
+resposta volta sem esperar por elas.
+"""
+from django.db import models, transaction
+from django.db.models import ProtectedError
+
+from accounts.models import UserProfile, refresh_activity_counts
+
+from . import catalog, facets, tasks
+from .models import Comment, Favorite, Mammal, MammalTombstone
+from .translation_service import clear_mammal_translations
+
+
+def _raw_delete(queryset):
+    """DELETE direto no banco: sem Collector, sem signals e sem cascata em Python"""
+    return queryset._raw_delete(queryset.db)
+
+
+def _delete_dependents(model, queryset):
+    """
+    Remove o que aponta para as linhas do queryset, das folhas para a raiz,
+    seguindo model._meta.related_objects: um ForeignKey novo entra sozinho.
+    CASCADE apaga (recursivo), SET_NULL limpa o campo e DO_NOTHING fica com
+    o banco; qualquer outra regra com linhas ligadas impede a exclusão.
+    """
+    for relation in model._meta.related_objects:
+        field = relation.field
+        if relation.many_to_many:
+            through = field.remote_field.through
+            _raw_delete(through._base_manager.filter(**{f'{field.m2m_reverse_field_name()}__in': queryset}))
+            continue
+        related = relation.related_model._base_manager.filter(**{f'{field.name}__in': queryset})
+        if relation.on_delete is models.CASCADE:
+            _delete_dependents(relation.related_model, related)
+            _raw_delete(related)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{field.name: None})
+        elif relation.on_delete is not models.DO_NOTHING and related.exists():
+            raise ProtectedError(
+                f'{relation.related_model._meta.label}.{field.name} impede a exclusão em massa',
+                set(related),
+            )
+
+
+def delete_mammals(queryset):
+    """
+    Exclui as espécies e tudo o que aponta para elas (das folhas para a raiz)
+    com a manutenção do catálogo feita em conjunto
+
+    Returns:
+        Número de espécies removidas
+    """
+    rows = list(queryset.order_by().values_list('pk', 'continent_key', 'taxonomy_key'))
+    if not rows:
+        return 0
+    ids = [pk for pk, continent_key, taxonomy_key in rows]
+    with transaction.atomic():
+        user_ids = set(Comment.objects.filter(mammal_id__in=ids).order_by().values_list('user_id', flat=True))
+        user_ids.update(Favorite.objects.filter(mammal_id__in=ids).order_by().values_list('user_id', flat=True))
+
+        doomed = Mammal.objects.filter(pk__in=ids)
+        _delete_dependents(Mammal, doomed)
+        _raw_delete(doomed)
+
+        version = catalog.bump_version(count_delta=-len(ids))
+        MammalTombstone.objects.bulk_create(
+            MammalTombstone(mammal_id=pk, catalog_version=version) for pk in ids
+        )
+        facets.subtract_counts((continent_key, taxonomy_key) for pk, continent_key, taxonomy_key in rows)
+        if user_ids:
+            refresh_activity_counts(UserProfile.objects.filter(user_id__in=user_ids))
+    return len(ids)
+
+
+def retranslate_mammals(queryset):
+    """Descarta as traduções em cache e agenda a tradução (executada pelo run_worker)"""
+    clear_mammal_translations(queryset)
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    tasks.queue_mammal_refresh(ids, names=('translate_mammal',))
+    return len(ids)
+
+
+def regenerate_images(queryset):
+    """Agenda a revalidação de image_asset (tasks.regenerate_images)"""
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    tasks.queue_regenerate_images(ids)
+    return len(ids)
+
+
+# Nome (valor do formulário) -> (função, rótulo, mensagem de sucesso)
+ACTIONS = {
+    'delete': (delete_mammals, 'Excluir', '{} espécies removidas.'),
+    'retranslate': (retranslate_mammals, 'Traduzir novamente', 'Tradução de {} espécies agendada.'),
+    'regenerate_images': (regenerate_images, 'Revalidar imagens', 'Revalidação das imagens de {} espécies na fila.'),
+}
@@ -0,0 +1,55 @@
+"""
+Backends de cache instrumentados
+
+Contam acertos e faltas de cada requisição para o MetricsMiddleware
+(mammals.metrics). O comportamento do cache não muda; as consultas do cache
+em banco contam no orçamento das views (QUERY_BUDGETS) e também em
+separado, como cache_queries.
+"""
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import cache_io, record_cache
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Registra acertos/faltas em get() (get_many e get_or_set passam por ele)"""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache(misses=1)
+            return default
+        record_cache(hits=1)
+        return value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedDatabaseCache(InstrumentedCacheMixin, DatabaseCache):
+    """Tabela compartilhada entre processos (CACHE_MODE=db)"""
+
+    def get_many(self, keys, version=None):
+        with cache_io():
+            return super().get_many(keys, version=version)
+
+    def _base_set(self, *args, **kwargs):
+        with cache_io():
+            return super()._base_set(*args, **kwargs)
+
+    def _base_delete_many(self, keys):
+        with cache_io():
+            return super()._base_delete_many(keys)
+
+    def has_key(self, key, version=None):
+        with cache_io():
+            return super().has_key(key, version=version)
+
+    def clear(self):
+        with cache_io():
+            return super().clear()
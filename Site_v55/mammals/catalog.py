@@ -0,0 +1,158 @@
+"""
+Versionamento do catálogo para a sincronização offline do PWA
+
+Cada alteração em um Mammal recebe um número de versão crescente (contador
+global em CatalogState) e cada exclusão deixa um MammalTombstone. Assim,
+/sync/?since=N devolve apenas o que mudou depois da versão N.
+
+A mesma versão compõe os ETags das respostas derivadas do catálogo, para
+que o Service Worker revalide em segundo plano recebendo 304 quando nada mudou.
+"""
+import hashlib
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Substr
+from django.utils.translation import get_language
+
+from .images import srcset_for
+from .models import CatalogState, Mammal, MammalTombstone
+
+
+# Colunas de cada linha em "rows" (mesmos campos da resposta de /search/)
+SYNC_FIELDS = (
+    'id', 'common_name', 'binomial_name', 'description',
+    'image_filename', 'image_srcset', 'continent', 'taxonomy_order',
+)
+
+# Tamanho da descrição enviada (igual a Mammal.short_description)
+DESCRIPTION_LENGTH = 200
+
+# Total de espécies em cache, por versão do catálogo
+COUNT_CACHE_KEY = 'catalog:mammal_count'
+COUNT_CACHE_TIMEOUT = 60 * 60
+
+
+def current_version():
+    """Versão atual do catálogo (0 se o contador ainda não existe)"""
+    return CatalogState.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def bump_version(count_delta=0):
+    """
+    Incrementa o contador global de forma atômica e retorna a nova versão.
+    Chamado dentro da transação da alteração, vale só se ela for confirmada.
+
+    Args:
+        count_delta: variação do total de espécies (+1 ao criar, -1 ao excluir)
+    """
+    changes = {'version': F('version') + 1}
+    if count_delta:
+        changes['mammal_count'] = F('mammal_count') + count_delta
+    with transaction.atomic():
+        if not CatalogState.objects.filter(pk=1).update(**changes):
+            CatalogState.objects.get_or_create(pk=1)
+            CatalogState.objects.filter(pk=1).update(**changes)
+        version = CatalogState.objects.values_list('version', flat=True).get(pk=1)
+    cache.delete(COUNT_CACHE_KEY)
+    # De novo no commit: até lá, outra requisição pode pôr o total antigo de volta
+    transaction.on_commit(lambda: cache.delete(COUNT_CACHE_KEY))
+    return version
+
+
+def mammal_count():
+    """Total de espécies sem COUNT(*): contador do catálogo, em cache até a próxima versão"""
+    count = cache.get(COUNT_CACHE_KEY)
+    if count is None:
+        count = CatalogState.objects.filter(pk=1).values_list('mammal_count', flat=True).first() or 0
+        cache.set(COUNT_CACHE_KEY, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def map_data_cache_key():
+    """Chave dos dados do mapa global (views.global_map_data): muda a cada versão"""
+    return f'catalog:map_data:{current_version()}'
+
+
+def refresh_mammal_count():
+    """Recalcula o total (após bulk_create ou exclusões em massa, que não disparam signals)"""
+    CatalogState.objects.get_or_create(pk=1)
+    CatalogState.objects.filter(pk=1).update(mammal_count=Mammal.objects.count())
+    return bump_version()
+
+
+def sync_row(mammal_id, common_name, binomial_name, description, image_asset, continent, taxonomy_order):
+    """Linha compacta (lista na ordem de SYNC_FIELDS) para o PWA"""
+    if description and len(description) > DESCRIPTION_LENGTH:
+        description = description[:DESCRIPTION_LENGTH] + '...'
+    return [
+        mammal_id,
+        common_name or '',
+        binomial_name or '',
+        description or '',
+        image_asset,
+        srcset_for(image_asset),
+        continent or '',
+        taxonomy_order or '',
+    ]
+
+
+def sync_rows(queryset):
+    """
+    Linhas de sync_row() direto de values_list, sem instanciar modelos
+
+    A descrição é cortada no banco (um caractere a mais que o limite, para
+    saber se precisa de reticências): a descrição completa não é transferida.
+    """
+    rows = queryset.annotate(
+        description_excerpt=Substr('description', 1, DESCRIPTION_LENGTH + 1)
+    ).values_list(
+        'id', 'common_name', 'binomial_name', 'description_excerpt',
+        'image_asset', 'continent', 'taxonomy_order'
+    )
+    return [sync_row(*values) for values in rows]
+
+
+def changes_since(since):
+    """
+    Alterações do catálogo depois da versão `since`
+
+    Returns:
+        dict com a versão atual, se é uma cópia completa, as colunas,
+        as linhas alteradas e os ids removidos
+    """
+    version = current_version()
+    # since=0 (primeiro acesso) ou maior que a atual (banco recriado): cópia completa
+    full = since <= 0 or since > version
+
+    mammals = Mammal.objects.order_by('id')
+    deleted = []
+    if not full:
+        mammals = mammals.filter(catalog_version__gt=since)
+        deleted = sorted(set(
+            MammalTombstone.objects.filter(catalog_version__gt=since)
+            .values_list('mammal_id', flat=True)
+        ))
+
+    return {
+        'version': version,
+        'full': full,
+        'fields': SYNC_FIELDS,
+        'rows': sync_rows(mammals),
+        'deleted': deleted,
+    }
+
+
+def make_etag(*parts):
+    """ETag a partir das partes informadas e do build atual dos estáticos"""
+    # URLs de imagens (srcset) mudam a cada collectstatic
+    build = getattr(staticfiles_storage, 'manifest_hash', '')
+    value = '|'.join(str(part) for part in (*parts, build))
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def catalog_etag(request, *args, **kwargs):
+    """ETag das respostas calculadas sobre o catálogo inteiro (busca, mapa global)"""
+    return make_etag(current_version(), get_language())
@@ -0,0 +1,86 @@
+"""
+Compressão das respostas dinâmicas (HTML e JSON)
+
+Negocia br, zstd e gzip pelo Accept-Encoding. Brotli e Zstandard são
+opcionais: sem os pacotes instalados, apenas gzip é oferecido.
+"""
+import gzip
+
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:  # pragma: no cover - depende do ambiente
+        zstd = None
+
+
+# Bytes aleatórios no cabeçalho gzip (mitigação do BREACH, igual ao GZipMiddleware)
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+def _brotli(content):
+    return brotli.compress(content, quality=5)
+
+
+def _zstd(content):
+    return zstd.compress(content, 10)
+
+
+def _gzip(content):
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+# Ordem de preferência: a primeira aceita pelo cliente é usada
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS['br'] = _brotli
+if zstd is not None:
+    ENCODERS['zstd'] = _zstd
+ENCODERS['gzip'] = _gzip
+
+
+def accepted_encodings(header):
+    """Codificações aceitas no Accept-Encoding (ignora as com q=0)"""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name.strip():
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def negotiate(header, encodings=None):
+    """Melhor codificação disponível para o Accept-Encoding, ou None"""
+    accepted = accepted_encodings(header)
+    for name in encodings or ENCODERS:
+        if name in ENCODERS and (name in accepted or '*' in accepted):
+            return name
+    return None
+
+
+def compress(content, encoding, padded=False):
+    """
+    Comprime o conteúdo
+
+    Args:
+        padded: adiciona bytes aleatórios ao gzip (respostas não cacheáveis,
+            que podem conter tokens CSRF)
+    """
+    if encoding == 'gzip' and padded:
+        return compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+    return ENCODERS[encoding](content)
@@ -6,7 +6,8 @@ from functools import wraps
 def admin_required(view_func):
     """
     Decorator para views que requerem privilégios de administrador.
-    Verifica se o usuário está autenticado e se tem is_admin=True no perfil.
+    Verifica se o usuário está autenticado e se tem is_admin=True no perfil
+    (request.is_site_admin, sem consulta extra ao banco).
     """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
@@ -15,7 +16,7 @@ def admin_required(view_func):
             return redirect('accounts:login')
         
         # Verificar se o usuário tem perfil e é admin
-        if hasattr(request.user, 'profile') and request.user.profile.is_admin:
+        if request.is_site_admin:
             return view_func(request, *args, **kwargs)
         
         messages.error(request, 'Acesso negado. Você precisa ser administrador.')
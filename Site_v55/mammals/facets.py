@@ -0,0 +1,150 @@
+"""
+Facetas de filtro (continente e ordem taxonômica)
+
+Os valores livres de Mammal.continent/taxonomy_order são normalizados em
+continent_key/taxonomy_key, filtrados por igualdade (com índice) em vez de
+UPPER(col) = UPPER(%s). O vocabulário fica em FacetTerm, para os filtros
+não precisarem de um DISTINCT sobre a tabela de mamíferos.
+
+As contagens por faceta ficam materializadas em FacetCount, ajustadas a
+cada save/delete de Mammal (sem GROUP BY por requisição).
+"""
+import operator
+from collections import Counter
+from functools import reduce
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import FacetCount, FacetTerm, Mammal
+
+
+TERMS_CACHE_KEY = 'facets:terms:{kind}'
+TERMS_CACHE_TIMEOUT = 60 * 60
+COUNTS_CACHE_KEY = 'facets:counts'
+
+
+def normalize(value):
+    """Chave de comparação: sem espaços nas pontas, em minúsculas"""
+    return (value or '').strip().lower()[:100]
+
+
+def apply_keys(mammal):
+    """Preenche as chaves normalizadas a partir dos campos de texto"""
+    mammal.continent_key = normalize(mammal.continent)
+    mammal.taxonomy_key = normalize(mammal.taxonomy_order)
+
+
+def register_terms(mammal):
+    """Garante os termos do mamífero no vocabulário (a primeira grafia vira o rótulo)"""
+    for kind, key, label in (
+        (FacetTerm.CONTINENT, mammal.continent_key, mammal.continent),
+        (FacetTerm.ORDER, mammal.taxonomy_key, mammal.taxonomy_order),
+    ):
+        if key:
+            FacetTerm.objects.get_or_create(kind=kind, key=key, defaults={'label': label.strip()[:100]})
+
+
+def clear_terms(kind):
+    cache.delete(TERMS_CACHE_KEY.format(kind=kind))
+    cache.delete(COUNTS_CACHE_KEY)
+
+
+def terms(kind):
+    """Lista de (chave, rótulo) do vocabulário, em cache"""
+    cache_key = TERMS_CACHE_KEY.format(kind=kind)
+    result = cache.get(cache_key)
+    if result is None:
+        result = list(FacetTerm.objects.filter(kind=kind).values_list('key', 'label'))
+        cache.set(cache_key, result, TERMS_CACHE_TIMEOUT)
+    return result
+
+
+def _count_rows(continent_key, taxonomy_key):
+    """Linhas de FacetCount afetadas por uma espécie com essas chaves"""
+    rows = []
+    if continent_key:
+        rows.append((FacetCount.CONTINENT, continent_key, ''))
+    if taxonomy_key:
+        rows.append((FacetCount.ORDER, '', taxonomy_key))
+    if continent_key and taxonomy_key:
+        rows.append((FacetCount.PAIR, continent_key, taxonomy_key))
+    return rows
+
+
+def adjust_counts(continent_key, taxonomy_key, delta):
+    """Soma `delta` às contagens das facetas de uma espécie (atômico, via F())"""
+    with transaction.atomic():
+        for kind, continent, taxonomy in _count_rows(continent_key, taxonomy_key):
+            lookup = {'kind': kind, 'continent_key': continent, 'taxonomy_key': taxonomy}
+            if not FacetCount.objects.filter(**lookup).update(count=F('count') + delta):
+                FacetCount.objects.get_or_create(**lookup)
+                FacetCount.objects.filter(**lookup).update(count=F('count') + delta)
+    cache.delete(COUNTS_CACHE_KEY)
+
+
+def subtract_counts(keys):
+    """
+    Desconta as espécies removidas em massa das contagens das facetas
+
+    Args:
+        keys: (continent_key, taxonomy_key) de cada espécie removida
+
+    Um único UPDATE, só nas linhas de FacetCount dessas chaves.
+    """
+    totals = Counter(row for continent_key, taxonomy_key in keys for row in _count_rows(continent_key, taxonomy_key))
+    if totals:
+        whens = [
+            When(kind=kind, continent_key=continent, taxonomy_key=taxonomy, then=Value(n))
+            for (kind, continent, taxonomy), n in totals.items()
+        ]
+        FacetCount.objects.filter(
+            reduce(operator.or_, (Q(kind=kind, continent_key=continent, taxonomy_key=taxonomy)
+                                  for kind, continent, taxonomy in totals))
+        ).update(count=F('count') - Case(*whens, default=Value(0)))
+    cache.delete(COUNTS_CACHE_KEY)
+    return len(totals)
+
+
+def rebuild_counts():
+    """Recalcula todas as contagens com um único GROUP BY (após cargas em massa)"""
+    totals = Counter()
+    pairs = Mammal.objects.values_list('continent_key', 'taxonomy_key').annotate(n=Count('id')).order_by()
+    for continent_key, taxonomy_key, n in pairs:
+        for row in _count_rows(continent_key, taxonomy_key):
+            totals[row] += n
+
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(
+            FacetCount(kind=kind, continent_key=continent, taxonomy_key=taxonomy, count=n)
+            for (kind, continent, taxonomy), n in totals.items()
+        )
+    cache.delete(COUNTS_CACHE_KEY)
+    return len(totals)
+
+
+def facet_counts():
+    """Contagens por continente, por ordem e por par, com os rótulos do vocabulário (em cache)"""
+    result = cache.get(COUNTS_CACHE_KEY)
+    if result is not None:
+        return result
+
+    labels = {
+        FacetCount.CONTINENT: dict(terms(FacetTerm.CONTINENT)),
+        FacetCount.ORDER: dict(terms(FacetTerm.ORDER)),
+    }
+    result = {'continents': [], 'orders': [], 'pairs': []}
+    rows = FacetCount.objects.filter(count__gt=0).order_by('kind', 'continent_key', 'taxonomy_key')
+    for kind, continent_key, taxonomy_key, count in rows.values_list(
+        'kind', 'continent_key', 'taxonomy_key', 'count'
+    ):
+        if kind == FacetCount.PAIR:
+            result['pairs'].append([continent_key, taxonomy_key, count])
+        else:
+            key = continent_key or taxonomy_key
+            group = 'continents' if kind == FacetCount.CONTINENT else 'orders'
+            result[group].append({'key': key, 'label': labels[kind].get(key, key), 'count': count})
+    cache.set(COUNTS_CACHE_KEY, result, TERMS_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,42 @@
+"""
+Serialização JSON rápida para os endpoints da API
+
+Usa orjson quando instalado e o json da biblioteca padrão como alternativa.
+Os tipos do Django (lazy strings, Decimal, datetime...) são convertidos pelo
+DjangoJSONEncoder nos dois casos, então a saída é a mesma.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(data):
+    """Serializa para bytes UTF-8 (JSON compacto)"""
+    if orjson is not None:
+        # datetimes passam pelo DjangoJSONEncoder (mesmo formato do JsonResponse)
+        return orjson.dumps(data, default=_django_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def records(fields, rows):
+    """Lista de dicts a partir de tuplas de values_list(), sem instanciar modelos"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class FastJsonResponse(HttpResponse):
+    """Equivalente ao JsonResponse usando dumps() (aceita listas no topo)"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,314 @@
+"""
+Pipeline de imagens responsivas
+Gera variantes redimensionadas (AVIF/WebP) das imagens de static/images
+e mantém um manifesto indexado pelo hash do conteúdo de cada original,
+com dimensões, tamanho, cor dominante e placeholder (LQIP) de cada imagem
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+
+from django.conf import settings
+
+
+# Larguras geradas para cada imagem (nunca amplia além do original)
+VARIANT_WIDTHS = (320, 640, 1280)
+
+# Formatos gerados, do mais eficiente para o mais compatível
+VARIANT_FORMATS = ('avif', 'webp')
+
+VARIANT_QUALITY = {
+    'avif': 55,
+    'webp': 75,
+}
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Caminhos relativos a static/ (usados com a tag {% static %})
+VARIANTS_PREFIX = 'images/variants'
+MANIFEST_NAME = 'manifest.json'
+
+# Pastas de static/images que não contêm fotos de espécies
+IGNORED_DIRS = ('variants', 'icons', 'screenshots')
+
+# Valor padrão do atributo sizes para os cards do grid
+CARD_SIZES = '(max-width: 700px) 100vw, 400px'
+
+# Largura do placeholder embutido (LQIP) - poucas centenas de bytes
+PLACEHOLDER_WIDTH = 16
+
+
+def get_images_dir():
+    """Diretório de origem das imagens (static/images)"""
+    return os.path.join(settings.BASE_DIR, 'static', 'images')
+
+
+def get_variants_dir():
+    return os.path.join(settings.BASE_DIR, 'static', *VARIANTS_PREFIX.split('/'))
+
+
+def get_manifest_path():
+    return os.path.join(get_variants_dir(), MANIFEST_NAME)
+
+
+def file_digest(path):
+    """Hash SHA-1 (16 caracteres) do conteúdo do arquivo"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def iter_source_images():
+    """Percorre static/images e retorna caminhos relativos (com '/')"""
+    images_dir = get_images_dir()
+    for root, dirs, files in os.walk(images_dir):
+        if root == images_dir:
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                full_path = os.path.join(root, name)
+                yield os.path.relpath(full_path, images_dir).replace(os.sep, '/')
+
+
+def variant_path(digest, width, fmt):
+    """Caminho (relativo a static/) de uma variante"""
+    return f'{VARIANTS_PREFIX}/{digest}-{width}.{fmt}'
+
+
+def target_widths(source_width):
+    """Larguras a gerar para uma imagem, sem ampliar o original"""
+    return sorted({min(width, source_width) for width in VARIANT_WIDTHS})
+
+
+def available_formats():
+    """Formatos suportados pelo Pillow instalado"""
+    from PIL import features
+    return [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+
+
+def dominant_color(image):
+    """Cor dominante (hex) a partir da paleta reduzida da imagem"""
+    from PIL import Image
+
+    thumb = image.convert('RGB')
+    thumb.thumbnail((64, 64))
+    palette = thumb.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    count, index = max(palette.getcolors())
+    r, g, b = palette.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def placeholder_data_uri(image):
+    """Miniatura borrada em WebP como data URI (LQIP)"""
+    from PIL import Image, ImageFilter
+
+    width, height = image.size
+    thumb = image.convert('RGB').resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))),
+        Image.BILINEAR
+    ).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    thumb.save(buffer, 'WEBP', quality=30)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_variants(relative_path, digest, formats):
+    """
+    Gera as variantes de uma imagem (executado nos processos do pool)
+
+    Returns:
+        Entrada do manifesto para o hash informado
+    """
+    from PIL import Image, ImageOps
+
+    source_path = os.path.join(get_images_dir(), *relative_path.split('/'))
+    variants_dir = get_variants_dir()
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        width, height = image.size
+
+        variants = {fmt: [] for fmt in formats}
+        for target in target_widths(width):
+            resized = image
+            if target != width:
+                target_height = max(1, round(height * target / width))
+                resized = image.resize((target, target_height), Image.LANCZOS)
+            for fmt in formats:
+                path = variant_path(digest, target, fmt)
+                output = os.path.join(variants_dir, os.path.basename(path))
+                if not os.path.exists(output):
+                    resized.save(output, fmt.upper(), quality=VARIANT_QUALITY[fmt])
+                variants[fmt].append([target, path])
+
+        color = dominant_color(image)
+        placeholder = placeholder_data_uri(image)
+
+    return {
+        'source': relative_path,
+        'width': width,
+        'height': height,
+        'bytes': os.path.getsize(source_path),
+        'color': color,
+        'placeholder': placeholder,
+        'variants': variants,
+    }
+
+
+def perceptual_hash(relative_path):
+    """
+    dHash de 64 bits: compara pixels vizinhos de uma miniatura 9x8 em tons
+    de cinza. Imagens iguais em outro formato/tamanho têm distância ~0.
+    """
+    from PIL import Image
+
+    source_path = os.path.join(get_images_dir(), *relative_path.split('/'))
+    with Image.open(source_path) as image:
+        image.draft('L', (64, 64))
+        pixels = image.convert('L').resize((9, 8), Image.LANCZOS).tobytes()
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def resolve_image_asset(image_filename, available=None):
+    """
+    Resolve um image_filename (texto livre) para o caminho real em static/images:
+    exato, depois ignorando maiúsculas, depois pelo nome sem extensão.
+
+    Returns:
+        Caminho relativo canônico ou '' se o arquivo não existir
+    """
+    if not image_filename:
+        return ''
+    if available is None:
+        available = get_source_images()
+    if image_filename in available:
+        return image_filename
+
+    lowered = image_filename.lower()
+    stem = os.path.splitext(lowered)[0]
+    by_stem = ''
+    for path in available:
+        if path.lower() == lowered:
+            return path
+        if not by_stem and os.path.splitext(path.lower())[0] == stem:
+            by_stem = path
+    return by_stem
+
+
+def load_manifest(path=None):
+    """Lê o manifesto do disco (vazio se ainda não foi gerado)"""
+    path = path or get_manifest_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}, 'assets': {}}
+    data.setdefault('files', {})
+    data.setdefault('assets', {})
+    return data
+
+
+def save_manifest(manifest, path=None):
+    path = path or get_manifest_path()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+_manifest = None
+
+
+def get_manifest():
+    """Manifesto carregado uma única vez por processo"""
+    global _manifest
+    if _manifest is None:
+        _manifest = load_manifest()
+    return _manifest
+
+
+def reset_manifest():
+    """Descarta o manifesto em memória (após rebuild ou em testes)"""
+    global _manifest, _source_images
+    _manifest = None
+    _source_images = None
+
+
+_source_images = None
+
+
+def get_source_images():
+    """
+    Imagens de static/images, listadas uma única vez por processo: as do
+    manifesto gerado no build ou, sem manifesto, uma varredura da pasta
+    """
+    global _source_images
+    if _source_images is None:
+        files = get_manifest()['files']
+        _source_images = sorted(files) if files else list(iter_source_images())
+    return _source_images
+
+
+def get_asset(image_filename):
+    """Entrada do manifesto para um image_filename/image_asset (ou None)"""
+    if not image_filename:
+        return None
+    manifest = get_manifest()
+    digest = manifest['files'].get(image_filename, {}).get('digest')
+    if not digest:
+        return None
+    return manifest['assets'].get(digest)
+
+
+def build_srcset(asset, fmt):
+    """Monta o valor de srcset de um formato a partir da entrada do manifesto"""
+    from django.templatetags.static import static
+
+    return ', '.join(
+        f'{static(path)} {width}w' for width, path in asset['variants'].get(fmt, [])
+    )
+
+
+def image_payload(image_asset, sizes=CARD_SIZES):
+    """Dados de uma imagem para o front-end (src, srcset por formato, dimensões)"""
+    from django.templatetags.static import static
+
+    payload = {'src': static(f'images/{image_asset}'), 'sizes': sizes, 'sources': {}}
+    asset = get_asset(image_asset)
+    if asset:
+        payload.update({
+            'width': asset['width'],
+            'height': asset['height'],
+            'color': asset.get('color', ''),
+            'placeholder': asset.get('placeholder', ''),
+        })
+        for fmt in VARIANT_FORMATS:
+            if asset['variants'].get(fmt):
+                payload['sources'][fmt] = build_srcset(asset, fmt)
+    return payload
+
+
+def srcset_for(image_filename, fmt='webp'):
+    """srcset de um image_filename ('' se não houver variantes)"""
+    asset = get_asset(image_filename)
+    if not asset:
+        return ''
+    return build_srcset(asset, fmt)
@@ -0,0 +1,205 @@
+"""
+Fila de tarefas em segundo plano guardada no banco (modelo Job)
+
+Tarefas são funções registradas com @task (ver mammals.tasks). enqueue()
+grava a linha na transação de quem chamou: a tarefa só fica visível para
+os workers depois do commit. O comando run_worker executa as pendentes em
+processos separados; cada worker reserva uma tarefa com um UPDATE
+condicional (funciona no SQLite e no PostgreSQL, sem locks de linha) e as
+falhas voltam para a fila com espera exponencial até max_attempts.
+"""
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+
+# Espera antes da nova tentativa: RETRY_DELAY * 2 ** (tentativas - 1) segundos
+RETRY_DELAY = 30
+
+# Tarefas "em execução" há mais tempo que isso são de um worker que morreu
+STALE_AFTER = 60 * 30
+
+# Candidatas lidas por consulta (se outro worker reservar uma, tenta a próxima)
+CLAIM_BATCH = 10
+
+# Nome -> (função, máximo de tentativas, espera padrão em segundos)
+TASKS = {}
+
+
+def task(name=None, max_attempts=3, delay=0):
+    """
+    Registra uma função como tarefa (os argumentos vêm do payload, em JSON)
+
+    Args:
+        delay: segundos entre o agendamento e a execução, por padrão
+    """
+    def register(func):
+        TASKS[name or func.__name__] = (func, max_attempts, delay)
+        return func
+    return register
+
+
+def enqueue_many(specs, delay=None):
+    """
+    Agenda várias tarefas com um bulk_create
+
+    Args:
+        specs: tuplas (nome, payload, chave); chaves já pendentes são puladas
+        delay: segundos até a execução (padrão: o de cada tarefa)
+
+    Returns:
+        Lista de Jobs criados
+    """
+    specs = list(specs)
+    for name, payload, key in specs:
+        if name not in TASKS:
+            raise LookupError(f'Tarefa desconhecida: {name}')
+
+    keys = {key for name, payload, key in specs if key}
+    pending = set()
+    if keys:
+        pending = set(Job.objects.filter(key__in=keys, status=Job.PENDING).values_list('key', flat=True))
+
+    now = timezone.now()
+    new_jobs = []
+    for name, payload, key in specs:
+        if key and key in pending:
+            continue
+        pending.add(key)
+        func, max_attempts, default_delay = TASKS[name]
+        wait = default_delay if delay is None else delay
+        new_jobs.append(Job(
+            name=name, payload=payload or {}, key=key,
+            max_attempts=max_attempts, run_after=now + timedelta(seconds=wait),
+        ))
+    return Job.objects.bulk_create(new_jobs) if new_jobs else []
+
+
+def enqueue(name, payload=None, key='', delay=None):
+    """Agenda uma tarefa (None se já houver uma pendente com a mesma chave)"""
+    created = enqueue_many([(name, payload, key)], delay=delay)
+    return created[0] if created else None
+
+
+def worker_name(pid=None):
+    """Identificação gravada em locked_by: máquina e processo"""
+    return f'{socket.gethostname()}:{pid or os.getpid()}'
+
+
+def claim(worker_id):
+    """Reserva a próxima tarefa pendente (None se não houver nenhuma)"""
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+        .order_by('run_after', 'id').values_list('pk', flat=True)[:CLAIM_BATCH]
+    )
+    for pk in candidates:
+        # Só uma UPDATE encontra a linha ainda pendente: quem a mudou, ficou com ela
+        claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING, locked_by=worker_id, locked_at=now,
+            attempts=F('attempts') + 1, updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def execute(job):
+    """
+    Executa uma tarefa reservada e grava o resultado
+
+    Returns:
+        True se a tarefa terminou sem erro
+    """
+    func = TASKS[job.name][0] if job.name in TASKS else None
+    try:
+        if func is None:
+            raise LookupError(f'Tarefa desconhecida: {job.name}')
+        func(**job.payload)
+    except Exception:
+        now = timezone.now()
+        changes = {'locked_by': '', 'locked_at': None, 'last_error': traceback.format_exc(), 'updated_at': now}
+        if job.attempts < job.max_attempts:
+            changes.update(
+                status=Job.PENDING,
+                run_after=now + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1)),
+            )
+        else:
+            changes['status'] = Job.FAILED
+        Job.objects.filter(pk=job.pk).update(**changes)
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, locked_by='', locked_at=None, last_error='', updated_at=timezone.now()
+    )
+    return True
+
+
+def work(worker_id=None, stop=None, burst=False, poll_interval=1.0, max_jobs=0):
+    """
+    Laço de um worker: reserva e executa tarefas até stop ser sinalizado
+
+    Args:
+        stop: threading/multiprocessing Event que encerra o laço
+        burst: termina quando não houver mais tarefas prontas
+        max_jobs: termina depois de N tarefas (0 = sem limite)
+
+    Returns:
+        Número de tarefas executadas
+    """
+    worker_id = worker_id or worker_name()
+    done = 0
+    while not (stop and stop.is_set()):
+        # Processo de longa duração: descarta conexões quebradas ou antigas
+        close_old_connections()
+        job = claim(worker_id)
+        if job is None:
+            if burst:
+                break
+            if stop:
+                stop.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+            continue
+        execute(job)
+        done += 1
+        if max_jobs and done >= max_jobs:
+            break
+    return done
+
+
+def release(worker_id):
+    """Devolve à fila as tarefas de um worker que morreu no meio da execução"""
+    return Job.objects.filter(status=Job.RUNNING, locked_by=worker_id).update(
+        status=Job.PENDING, locked_by='', locked_at=None, updated_at=timezone.now()
+    )
+
+
+def requeue_stale(seconds=STALE_AFTER):
+    """Devolve à fila tarefas presas em execução (worker de outra máquina que caiu)"""
+    limit = timezone.now() - timedelta(seconds=seconds)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=limit).update(
+        status=Job.PENDING, locked_by='', locked_at=None, updated_at=timezone.now()
+    )
+
+
+def retry(queryset):
+    """Agenda de novo tarefas que falharam (tentativas zeradas)"""
+    return queryset.filter(status=Job.FAILED).update(
+        status=Job.PENDING, attempts=0, run_after=timezone.now(), updated_at=timezone.now()
+    )
+
+
+def purge_finished(days=7):
+    """Remove tarefas concluídas há mais de N dias (as que falharam ficam para análise)"""
+    limit = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, updated_at__lt=limit).delete()
+    return deleted
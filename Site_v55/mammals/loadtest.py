@@ -0,0 +1,329 @@
+"""
+Teste de carga com usuários virtuais concorrentes
+
+Cada usuário virtual roda em uma thread e repete cenários sorteados pelos
+pesos do "mix" (navegação anônima, navegação em inglês, rajadas de busca
+enquanto se digita, favoritos e comentários). A aplicação pode ser chamada
+no próprio processo (django.test.Client, mesma pilha de middlewares) ou
+por HTTP, contra um gunicorn local. O relatório traz vazão, p50/p95/p99 e
+taxa de erros por endpoint (nome da URL).
+"""
+import http.cookiejar
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+
+DEFAULT_MIX = 'anonymous=50,english=20,search=15,favorite=10,comment=5'
+
+# Palavras digitadas nas rajadas de busca (uma requisição por letra)
+SEARCH_WORDS = ('rato', 'lobo', 'morcego', 'tilacino', 'foca', 'canguru')
+
+
+class InProcessTransport:
+    """Requisições direto na aplicação, sem rede"""
+
+    def __init__(self):
+        self.client = Client()
+
+    def login(self, username, password):
+        return self.client.login(username=username, password=password)
+
+    def get(self, path, params=None):
+        return self.client.get(path, params or {}).status_code
+
+    def post(self, path, data):
+        return self.client.post(path, data).status_code
+
+    def close(self):
+        # Cada thread abre as próprias conexões com o banco
+        connections.close_all()
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    """Requisições HTTP (ex.: gunicorn local), com cookies e token CSRF"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect()
+        )
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+    def _csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == 'csrftoken'), '')
+
+    def login(self, username, password):
+        login_url = reverse('accounts:login')
+        self.get(login_url)
+        return self.post(login_url, {'username': username, 'password': password}) == 302
+
+    def get(self, path, params=None):
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        return self._open(urllib.request.Request(url))
+
+    def post(self, path, data):
+        token = self._csrf_token()
+        body = urllib.parse.urlencode({**data, 'csrfmiddlewaretoken': token}).encode('utf-8')
+        request = urllib.request.Request(self.base_url + path, data=body, headers={
+            'X-CSRFToken': token,
+            'Referer': self.base_url + path,
+        })
+        return self._open(request)
+
+    def close(self):
+        pass
+
+
+class EndpointStats:
+    """Latências (segundos) e respostas de um endpoint"""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+
+    def add(self, latency, status):
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.statuses.update(other.statuses)
+        self.errors += other.errors
+
+
+def percentile(values, p):
+    """Percentil pelo método do posto mais próximo (values já ordenados)"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+class VirtualUser:
+    """Um visitante: transporte anônimo e, se preciso, um autenticado"""
+
+    def __init__(self, index, transport_factory, mammal_ids, credentials, seed):
+        self.index = index
+        self.rng = random.Random(seed + index)
+        self.transport_factory = transport_factory
+        self.mammal_ids = mammal_ids
+        self.credentials = credentials
+        self.anonymous = transport_factory()
+        self._authenticated = None
+        self.stats = {}
+
+    @property
+    def authenticated(self):
+        if self._authenticated is None:
+            transport = self.transport_factory()
+            if not self.credentials or not transport.login(*self.credentials):
+                raise RuntimeError(f'Falha no login do usuário virtual {self.index}')
+            self._authenticated = transport
+        return self._authenticated
+
+    def mammal_id(self):
+        return self.rng.choice(self.mammal_ids)
+
+    def record(self, label, start, status):
+        self.stats.setdefault(label, EndpointStats()).add(time.perf_counter() - start, status)
+
+    def request(self, method, label, path, data=None, authenticated=False):
+        start = time.perf_counter()
+        try:
+            transport = self.authenticated if authenticated else self.anonymous
+            status = getattr(transport, method)(path, data)
+        except Exception as error:
+            status = type(error).__name__
+        self.record(label, start, status)
+
+    def get(self, label, path, params=None, authenticated=False):
+        self.request('get', label, path, params, authenticated)
+
+    def post(self, label, path, data):
+        self.request('post', label, path, data, authenticated=True)
+
+    def close(self):
+        self.anonymous.close()
+        if self._authenticated is not None:
+            self._authenticated.close()
+
+
+# ============================================================================
+# CENÁRIOS
+# ============================================================================
+
+def browse_anonymous(user):
+    """Página inicial, uma espécie e os dados do mapa"""
+    user.get('mammals:index', reverse('mammals:index'))
+    user.get('mammals:detail', reverse('mammals:detail', args=[user.mammal_id()]))
+    user.get('mammals:global_map_data', reverse('mammals:global_map_data'))
+
+
+def browse_english(user):
+    """Mesma navegação em /en/ (passa pelo serviço de tradução)"""
+    with translation.override('en'):
+        index = reverse('mammals:index')
+        detail = reverse('mammals:detail', args=[user.mammal_id()])
+    user.get('en:mammals:index', index)
+    user.get('en:mammals:detail', detail)
+
+
+def search_burst(user):
+    """Uma requisição por letra digitada, como a busca ao vivo"""
+    word = user.rng.choice(SEARCH_WORDS)
+    for length in range(1, len(word) + 1):
+        user.get('mammals:search', reverse('mammals:search'), {'q': word[:length]})
+
+
+def toggle_favorite(user):
+    """Favorita/desfavorita uma espécie e abre a lista de favoritos"""
+    user.post('mammals:toggle_favorite', reverse('mammals:toggle_favorite', args=[user.mammal_id()]), {})
+    user.get('mammals:favorites', reverse('mammals:favorites'), authenticated=True)
+
+
+def post_comment(user):
+    """Comenta uma espécie e volta para a página dela"""
+    mammal_id = user.mammal_id()
+    user.post('mammals:add_comment', reverse('mammals:add_comment', args=[mammal_id]), {
+        'content': f'[carga] comentário do usuário virtual {user.index}',
+    })
+    user.get('mammals:detail', reverse('mammals:detail', args=[mammal_id]), authenticated=True)
+
+
+SCENARIOS = {
+    'anonymous': browse_anonymous,
+    'english': browse_english,
+    'search': search_burst,
+    'favorite': toggle_favorite,
+    'comment': post_comment,
+}
+
+# Cenários que precisam de login
+AUTHENTICATED_SCENARIOS = {'favorite', 'comment'}
+
+
+def parse_mix(text):
+    """'anonymous=50,search=10' -> {'anonymous': 50, 'search': 10}"""
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(','))):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Cenário desconhecido: {name} (opções: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError('O mix precisa de ao menos um cenário com peso positivo')
+    return mix
+
+
+def run(transport_factory, mix, mammal_ids, credentials=(), users=10, duration=30.0,
+        iterations=0, think_time=0.0, seed=1500):
+    """
+    Executa o teste de carga e retorna o relatório
+
+    Args:
+        transport_factory: cria um transporte (InProcessTransport, HttpTransport...)
+        mix: pesos por cenário (ver parse_mix)
+        mammal_ids: espécies que os cenários visitam
+        credentials: (usuário, senha) por usuário virtual, para os cenários com login
+        duration: segundos de execução (ignorado se iterations > 0)
+        iterations: cenários por usuário virtual (execução reproduzível)
+        think_time: pausa entre cenários, em segundos
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    virtual_users = [
+        VirtualUser(index, transport_factory, mammal_ids,
+                    credentials[index % len(credentials)] if credentials else None, seed)
+        for index in range(users)
+    ]
+    deadline = time.perf_counter() + duration
+
+    def work(user):
+        try:
+            done = 0
+            while (done < iterations) if iterations else (time.perf_counter() < deadline):
+                name = user.rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    SCENARIOS[name](user)
+                except Exception as error:
+                    # Falha fora de request (ex.: reverse): erro do cenário, e o usuário segue
+                    user.record(f'cenário:{name}', start, type(error).__name__)
+                done += 1
+                if think_time:
+                    time.sleep(think_time)
+        finally:
+            user.close()
+
+    threads = [threading.Thread(target=work, args=(user,), daemon=True) for user in virtual_users]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = {}
+    for user in virtual_users:
+        for label, stats in user.stats.items():
+            merged.setdefault(label, EndpointStats()).merge(stats)
+    return report(merged, elapsed, users)
+
+
+def report(stats, elapsed, users):
+    endpoints = {}
+    for label, endpoint in sorted(stats.items()):
+        latencies = sorted(endpoint.latencies)
+        count = len(latencies)
+        endpoints[label] = {
+            'requests': count,
+            'throughput': round(count / elapsed, 2) if elapsed else 0.0,
+            'errors': endpoint.errors,
+            'error_rate': round(endpoint.errors / count, 4) if count else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            'statuses': {str(status): n for status, n in endpoint.statuses.items()},
+        }
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    errors = sum(endpoint['errors'] for endpoint in endpoints.values())
+    return {
+        'users': users,
+        'elapsed': round(elapsed, 3),
+        'requests': total,
+        'throughput': round(total / elapsed, 2) if elapsed else 0.0,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'endpoints': endpoints,
+    }
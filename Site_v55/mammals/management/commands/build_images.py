@@ -0,0 +1,127 @@
+"""
+Gera variantes responsivas (AVIF/WebP) e o manifesto de metadados
+(dimensões, tamanho, cor dominante, placeholder) das imagens de static/images
+
+Uso:
+    python manage.py build_images [--workers N] [--force]
+
+Incremental: imagens cujo conteúdo (hash) já está no manifesto não são
+reprocessadas. Execute antes do collectstatic.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from mammals import images
+
+
+class Command(BaseCommand):
+    help = 'Gera miniaturas WebP/AVIF e metadados das imagens em static/images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Número de processos paralelos (padrão: núcleos da CPU)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reprocessa todas as imagens, ignorando o manifesto'
+        )
+
+    def handle(self, *args, **options):
+        formats = images.available_formats()
+        if not formats:
+            self.stderr.write(self.style.ERROR('Pillow sem suporte a WebP/AVIF.'))
+            return
+
+        os.makedirs(images.get_variants_dir(), exist_ok=True)
+        manifest = {'files': {}, 'assets': {}} if options['force'] else images.load_manifest()
+        previous_files = manifest['files']
+
+        files = {}
+        pending = {}
+        for relative_path in images.iter_source_images():
+            full_path = os.path.join(images.get_images_dir(), *relative_path.split('/'))
+            stat = os.stat(full_path)
+            entry = previous_files.get(relative_path)
+
+            # Mesmo tamanho e mtime: reaproveitar o hash sem reler o arquivo
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == int(stat.st_mtime):
+                digest = entry['digest']
+            else:
+                digest = images.file_digest(full_path)
+
+            files[relative_path] = {
+                'digest': digest,
+                'size': stat.st_size,
+                'mtime': int(stat.st_mtime),
+            }
+            asset = manifest['assets'].get(digest)
+            if not asset or not self._variants_exist(asset, formats):
+                pending.setdefault(digest, relative_path)
+
+        self.stdout.write(
+            f'{len(files)} imagens encontradas, {len(pending)} para processar '
+            f'({", ".join(formats)}) com {options["workers"]} processos...'
+        )
+
+        errors = 0
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = {
+                executor.submit(images.build_variants, relative_path, digest, formats): digest
+                for digest, relative_path in pending.items()
+            }
+            for future in as_completed(futures):
+                digest = futures[future]
+                try:
+                    manifest['assets'][digest] = future.result()
+                    self.stdout.write(f'  ✓ {pending[digest]}')
+                except Exception as e:
+                    errors += 1
+                    files = {k: v for k, v in files.items() if v['digest'] != digest}
+                    self.stderr.write(f'  ✗ {pending[digest]}: {e}')
+
+        manifest['files'] = files
+        removed = self._prune(manifest)
+        images.save_manifest(manifest)
+        images.reset_manifest()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(pending) - errors} imagens processadas, '
+            f'{removed} variantes obsoletas removidas, {errors} erros.'
+        ))
+
+    def _variants_exist(self, asset, formats):
+        # Entradas antigas, sem metadados, precisam ser refeitas
+        if 'placeholder' not in asset:
+            return False
+        static_dir = os.path.join(images.get_images_dir(), os.pardir)
+        for fmt in formats:
+            variants = asset['variants'].get(fmt)
+            if not variants:
+                return False
+            for _, path in variants:
+                if not os.path.exists(os.path.join(static_dir, *path.split('/'))):
+                    return False
+        return True
+
+    def _prune(self, manifest):
+        """Remove assets e arquivos de variantes que não são mais referenciados"""
+        used = {entry['digest'] for entry in manifest['files'].values()}
+        for digest in list(manifest['assets']):
+            if digest not in used:
+                del manifest['assets'][digest]
+
+        removed = 0
+        variants_dir = images.get_variants_dir()
+        for name in os.listdir(variants_dir):
+            if name == images.MANIFEST_NAME or name.endswith('.tmp'):
+                continue
+            if name.split('-', 1)[0] not in used:
+                os.remove(os.path.join(variants_dir, name))
+                removed += 1
+        return removed
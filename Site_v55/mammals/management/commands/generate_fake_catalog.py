@@ -0,0 +1,89 @@
+"""
+Gera um catálogo sintético para testes de escala
+
+Uso:
+    python manage.py generate_fake_catalog --mammals 100000 --users 10000 --comments 500000
+        [--favorites N] [--ratings N] [--seed 1500] [--batch-size 2000]
+        [--coordinates-file caminho.json]
+
+Os dados (espécies com descrições, usuários, comentários, favoritos e
+avaliações) são inseridos em lotes com bulk_create e são determinísticos:
+a mesma semente sobre o mesmo banco gera as mesmas linhas. As coordenadas
+não ficam no banco; use --coordinates-file para gravá-las (formato do
+GEOCODING_DATA, indexado pelo id da espécie).
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mammals import synthetic
+
+
+class Command(BaseCommand):
+    help = 'Insere espécies, usuários, comentários, favoritos e avaliações sintéticos em lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mammals', type=int, default=0, help='Espécies a criar')
+        parser.add_argument('--users', type=int, default=0, help='Usuários a criar (com perfil)')
+        parser.add_argument('--comments', type=int, default=0, help='Comentários a criar')
+        parser.add_argument(
+            '--favorites',
+            type=int,
+            default=None,
+            help='Favoritos a criar (padrão: um por espécie nova)'
+        )
+        parser.add_argument(
+            '--ratings',
+            type=int,
+            default=None,
+            help='Avaliações a criar (padrão: um por espécie nova)'
+        )
+        parser.add_argument('--seed', type=int, default=1500, help='Semente do gerador')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Linhas por bulk_create')
+        parser.add_argument('--coordinates-file', default='', help='Grava as coordenadas geradas neste JSON')
+
+    def handle(self, *args, **options):
+        counts = {
+            name: options[name] if options[name] is not None else options['mammals']
+            for name in ('mammals', 'users', 'comments', 'favorites', 'ratings')
+        }
+        if any(count < 0 for count in counts.values()):
+            raise CommandError('As quantidades não podem ser negativas.')
+        if not any(counts.values()):
+            raise CommandError('Nada a gerar. Use --mammals, --users ou --comments.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size precisa ser positivo.')
+
+        self.stdout.write(f"🧪 Gerando catálogo sintético (semente {options['seed']})...")
+        started = time.perf_counter()
+        summary = synthetic.generate_catalog(
+            **counts, seed=options['seed'], batch_size=options['batch_size']
+        )
+        elapsed = time.perf_counter() - started
+
+        labels = {
+            'mammals': 'espécies', 'users': 'usuários', 'comments': 'comentários',
+            'favorites': 'favoritos', 'ratings': 'avaliações',
+        }
+        rows = 0
+        for name, label in labels.items():
+            self.stdout.write(f"   {label:<12} {summary[name]:>10}")
+            rows += summary[name]
+        if counts['users']:
+            # Cada usuário ganha também um perfil
+            rows += summary['users']
+
+        if options['coordinates_file']:
+            with open(options['coordinates_file'], 'w', encoding='utf-8') as f:
+                json.dump(summary['coordinates'], f, ensure_ascii=False)
+            self.stdout.write(f"🗺️  Coordenadas de {len(summary['coordinates'])} espécies em {options['coordinates_file']}")
+
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {rows} linhas em {elapsed:.1f}s ({rate:,.0f} linhas/s)"
+        ))
+        if summary['users']:
+            self.stdout.write(
+                f"🔑 Usuários '{synthetic.USERNAME_PREFIX}-NNNNNNN', senha '{synthetic.PASSWORD}'"
+            )
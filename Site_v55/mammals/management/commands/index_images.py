@@ -0,0 +1,195 @@
+"""
+Indexa as imagens de static/images e associa cada espécie a um asset canônico
+
+Uso:
+    python manage.py index_images [--threshold N] [--dry-run]
+
+- Calcula o hash perceptual (dHash) de todas as imagens em paralelo
+- Relata duplicatas (mesmo conteúdo em outro nome/formato), órfãs
+  (não usadas por nenhuma espécie) e referências quebradas
+- Grava em Mammal.image_asset o caminho canônico de cada imagem
+- Sincroniza as galerias (MammalImage) a partir das subpastas nomeadas
+  pelo nome científico da espécie (ex.: static/images/dusicyon_avus/)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from mammals import catalog, images
+from mammals.models import Mammal, MammalImage
+
+
+class Command(BaseCommand):
+    help = 'Relata imagens duplicadas/órfãs e atualiza Mammal.image_asset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=4,
+            help='Distância de Hamming máxima para considerar duplicata (padrão: 4)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Número de processos paralelos (padrão: núcleos da CPU)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas relata, sem alterar o banco'
+        )
+
+    def handle(self, *args, **options):
+        available = list(images.iter_source_images())
+        hashes = self._hash_all(available, options['workers'])
+
+        mammals = list(Mammal.objects.only(
+            'id', 'common_name', 'binomial_name', 'image_filename', 'image_asset'
+        ))
+        resolved = {
+            mammal.pk: images.resolve_image_asset(mammal.image_filename, available)
+            for mammal in mammals
+        }
+        referenced = set(resolved.values())
+
+        groups = self._group_duplicates(hashes, options['threshold'])
+        canonical = {}
+        for group in groups:
+            chosen = self._choose_canonical(group, referenced)
+            for path in group:
+                canonical[path] = chosen
+
+        # Relatório
+        self.stdout.write(f'\n🖼️  {len(available)} imagens, {len(hashes)} indexadas')
+
+        self.stdout.write(f'\n🔁 {len(groups)} grupos de duplicatas:')
+        for group in groups:
+            chosen = canonical[group[0]]
+            self.stdout.write(f'  • {chosen}')
+            for path in group:
+                if path != chosen:
+                    self.stdout.write(f'      = {path}')
+
+        orphans = [
+            path for path in available
+            if '/' not in path and path not in referenced and canonical.get(path, path) not in referenced
+        ]
+        self.stdout.write(f'\n🗑️  {len(orphans)} imagens órfãs:')
+        for path in orphans:
+            self.stdout.write(f'  • {path}')
+
+        missing = [m for m in mammals if m.image_filename and not resolved[m.pk]]
+        self.stdout.write(f'\n⚠️  {len(missing)} referências quebradas:')
+        for mammal in missing:
+            self.stdout.write(f'  • #{mammal.pk} {mammal.common_name}: {mammal.image_filename}')
+
+        # Atualizar o banco
+        changed = []
+        for mammal in mammals:
+            asset = resolved[mammal.pk]
+            asset = canonical.get(asset, asset)
+            if mammal.image_asset != asset:
+                mammal.image_asset = asset
+                changed.append(mammal)
+
+        gallery_images = self._gallery_images(available, hashes, canonical, mammals)
+
+        if options['dry_run']:
+            self.stdout.write(f'\n(dry-run) {len(changed)} espécies seriam atualizadas')
+            return
+
+        if changed:
+            # bulk_update não dispara signals: versionar o lote para o /sync/
+            version = catalog.bump_version()
+            for mammal in changed:
+                mammal.catalog_version = version
+            Mammal.objects.bulk_update(changed, ['image_asset', 'catalog_version'], batch_size=500)
+        MammalImage.objects.bulk_create(gallery_images, batch_size=500)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {len(changed)} espécies atualizadas, '
+            f'{len(gallery_images)} imagens adicionadas às galerias'
+        ))
+
+    def _gallery_images(self, available, hashes, canonical, mammals):
+        """Novas MammalImage para as subpastas de espécies (sem repetir imagens)"""
+        folders = {}
+        for path in available:
+            if '/' in path and path in hashes:
+                folders.setdefault(path.split('/', 1)[0], []).append(path)
+
+        by_folder = {
+            mammal.binomial_name.strip().lower().replace(' ', '_'): mammal.pk
+            for mammal in mammals
+        }
+        new_images = []
+        for folder, paths in sorted(folders.items()):
+            mammal_id = by_folder.get(folder.lower())
+            if not mammal_id:
+                self.stdout.write(f'\n📁 Pasta sem espécie correspondente: {folder}/')
+                continue
+
+            gallery = MammalImage.objects.filter(mammal_id=mammal_id)
+            seen = set(gallery.values_list('image_asset', flat=True))
+            position = gallery.aggregate(last=Max('position'))['last'] or 0
+            for path in paths:
+                asset = canonical.get(path, path)
+                if asset in seen:
+                    continue
+                seen.add(asset)
+                position += 1
+                # Nomes aleatórios (ex.: 0XaVuBgyfVhG.jpg) não viram legenda
+                stem = os.path.splitext(os.path.basename(path))[0]
+                caption = stem.replace('_', ' ') if '_' in stem else ''
+                new_images.append(MammalImage(
+                    mammal_id=mammal_id,
+                    image_asset=asset,
+                    caption=caption,
+                    position=position,
+                ))
+        return new_images
+
+    def _hash_all(self, available, workers):
+        hashes = {}
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {path: executor.submit(images.perceptual_hash, path) for path in available}
+            for path, future in futures.items():
+                try:
+                    hashes[path] = future.result()
+                except Exception as e:
+                    self.stderr.write(f'  ✗ {path}: {e}')
+        return hashes
+
+    def _group_duplicates(self, hashes, threshold):
+        """Agrupa imagens próximas (união transitiva por distância de Hamming)"""
+        paths = sorted(hashes)
+        parent = {path: path for path in paths}
+
+        def find(path):
+            while parent[path] != path:
+                parent[path] = parent[parent[path]]
+                path = parent[path]
+            return path
+
+        for i, a in enumerate(paths):
+            for b in paths[i + 1:]:
+                if images.hamming_distance(hashes[a], hashes[b]) <= threshold:
+                    parent[find(b)] = find(a)
+
+        groups = {}
+        for path in paths:
+            groups.setdefault(find(path), []).append(path)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _choose_canonical(self, group, referenced):
+        """Prefere imagens já referenciadas, na raiz de static/images, e maiores"""
+        images_dir = images.get_images_dir()
+
+        def score(path):
+            size = os.path.getsize(os.path.join(images_dir, *path.split('/')))
+            return (path in referenced, '/' not in path, size)
+
+        return max(group, key=score)
@@ -0,0 +1,92 @@
+"""
+Importa os dossiês científicos de dossiers.json para Dossier/DossierSection
+
+Uso:
+    python manage.py load_dossiers [--file caminho.json]
+
+Cada dossiê é associado à espécie pelo nome científico (nunca pelo pk).
+O HTML de cada seção é gerado aqui, com as tags {% static %} resolvidas
+pelo manifesto do collectstatic (rode depois dele). Seções sem alteração,
+inclusive nas URLs com hash, não são regravadas, preservando updated_at
+e, com ele, os fragmentos já em cache.
+"""
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from mammals.models import Dossier, DossierSection, Mammal, render_dossier_html
+
+
+SECTION_FIELDS = ('nav_label', 'title', 'body', 'html', 'position')
+
+
+class Command(BaseCommand):
+    help = 'Importa os dossiês científicos de dossiers.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            default=os.path.join(settings.BASE_DIR, 'dossiers.json'),
+            help='Arquivo JSON de origem (padrão: dossiers.json)'
+        )
+
+    def handle(self, *args, **options):
+        with open(options['file'], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        created = updated = 0
+        for item in data.get('dossiers', []):
+            mammal = Mammal.objects.filter(binomial_name__iexact=item['binomial_name']).first()
+            if not mammal:
+                self.stderr.write(f'  ✗ Espécie não encontrada: {item["binomial_name"]}')
+                continue
+
+            with transaction.atomic():
+                dossier, is_new = Dossier.objects.update_or_create(
+                    mammal=mammal,
+                    language=item.get('language', 'pt'),
+                    defaults={
+                        'title': item['title'],
+                        'subtitle': item.get('subtitle', ''),
+                        'map_points': item.get('map_points', []),
+                    }
+                )
+                changed = self._sync_sections(dossier, item.get('sections', []))
+
+            created += is_new
+            updated += not is_new and changed > 0
+            self.stdout.write(f'  ✓ {dossier} ({changed} seções alteradas)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {created} dossiês criados, {updated} atualizados.'
+        ))
+
+    def _sync_sections(self, dossier, sections):
+        """Cria/atualiza as seções do dossiê e remove as que saíram do arquivo"""
+        existing = {section.anchor: section for section in dossier.sections.all()}
+        changed = 0
+        for position, item in enumerate(sections, start=1):
+            values = {
+                'nav_label': item.get('nav_label') or item['title'],
+                'title': item['title'],
+                'body': item['body'],
+                'html': render_dossier_html(item['body']),
+                'position': position,
+            }
+            section = existing.pop(item['anchor'], None)
+            if section is None:
+                DossierSection.objects.create(dossier=dossier, anchor=item['anchor'], **values)
+                changed += 1
+            elif any(getattr(section, field) != values[field] for field in SECTION_FIELDS):
+                for field, value in values.items():
+                    setattr(section, field, value)
+                section.save()
+                changed += 1
+
+        if existing:
+            DossierSection.objects.filter(pk__in=[s.pk for s in existing.values()]).delete()
+            changed += len(existing)
+        return changed
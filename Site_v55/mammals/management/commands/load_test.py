@@ -0,0 +1,143 @@
+"""
+Teste de carga local com usuários virtuais concorrentes
+
+Uso:
+    python manage.py load_test [--users 20] [--duration 30] [--mix anonymous=50,search=20]
+    python manage.py load_test --url http://127.0.0.1:8000 [...]
+
+Sem --url, a aplicação é chamada no próprio processo, com a tradução
+automática substituída por um stub (sem rede). Os cenários gravam
+favoritos, comentários e usuários no banco configurado: fora do DEBUG
+(e dos testes) é preciso confirmar com --allow-writes. Com --url, as requisições
+vão para um servidor já em execução, que decide sozinho o backend de
+tradução; para o stub, inicie-o assim:
+    TRANSLATION_BACKEND=stub gunicorn extinct_mammals_django.wsgi:application -w 4
+O servidor precisa usar o mesmo banco: os usuários dos cenários com login
+(favoritos e comentários) são criados aqui, com mammals.synthetic.
+"""
+import json
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from mammals import loadtest, synthetic
+from mammals.models import Mammal
+
+
+class Command(BaseCommand):
+    help = 'Executa um teste de carga com usuários virtuais e mostra p50/p95/p99 por endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Usuários virtuais concorrentes')
+        parser.add_argument('--duration', type=float, default=30.0, help='Duração em segundos')
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=0,
+            help='Cenários por usuário virtual (substitui --duration)'
+        )
+        parser.add_argument(
+            '--mix',
+            default=loadtest.DEFAULT_MIX,
+            help=f"Pesos dos cenários (padrão: {loadtest.DEFAULT_MIX})"
+        )
+        parser.add_argument('--url', default='', help='Servidor alvo (ex.: http://127.0.0.1:8000)')
+        parser.add_argument('--think-time', type=float, default=0.0, help='Pausa entre cenários (ms)')
+        parser.add_argument('--seed', type=int, default=1500, help='Semente dos sorteios')
+        parser.add_argument('--json', default='', help='Grava o relatório completo neste arquivo')
+        parser.add_argument(
+            '--allow-writes',
+            action='store_true',
+            help='Permite rodar no processo com DEBUG=False (grava dados de carga no banco)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = loadtest.parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        in_process = not options['url']
+        if in_process and not (settings.DEBUG or settings.IS_TESTING or options['allow_writes']):
+            raise CommandError(
+                'No processo, o teste de carga grava no banco configurado (DEBUG=False). '
+                'Use --url ou confirme com --allow-writes.'
+            )
+
+        mammal_ids = list(Mammal.objects.values_list('pk', flat=True))
+        if not mammal_ids:
+            raise CommandError('Nenhuma espécie no banco. Rode generate_fake_catalog ou importe os dados.')
+
+        credentials = ()
+        if loadtest.AUTHENTICATED_SCENARIOS & mix.keys():
+            credentials = self._credentials(options['users'])
+
+        if not in_process:
+            factory = partial(loadtest.HttpTransport, options['url'])
+            target = options['url']
+        else:
+            factory = loadtest.InProcessTransport
+            target = 'WSGI no processo (tradução stub)'
+
+        duration = f"{options['iterations']} cenários/usuário" if options['iterations'] else f"{options['duration']:g}s"
+        self.stdout.write(f"🚀 {options['users']} usuários virtuais, {duration} → {target}")
+        if not in_process:
+            self.stdout.write(self.style.WARNING(
+                '⚠️  O backend de tradução é o do servidor: inicie-o com TRANSLATION_BACKEND=stub para não usar a rede.'
+            ))
+
+        run = partial(
+            loadtest.run, factory, mix, mammal_ids, credentials,
+            users=options['users'],
+            duration=options['duration'],
+            iterations=options['iterations'],
+            think_time=options['think_time'] / 1000,
+            seed=options['seed'],
+        )
+        if in_process:
+            with override_settings(TRANSLATION_BACKEND='stub'):
+                result = run()
+        else:
+            result = run()
+
+        self._print_report(result)
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f"💾 Relatório em {options['json']}")
+
+    def _credentials(self, count):
+        """Um usuário sintético por usuário virtual (criados se faltarem)"""
+        usernames = list(
+            User.objects.filter(username__startswith=synthetic.USERNAME_PREFIX)
+            .order_by('pk').values_list('username', flat=True)[:count]
+        )
+        if len(usernames) < count:
+            synthetic.generate_catalog(users=count - len(usernames))
+            return self._credentials(count)
+        return [(username, synthetic.PASSWORD) for username in usernames]
+
+    def _print_report(self, result):
+        self.stdout.write('')
+        self.stdout.write(
+            f"📊 {'endpoint':<28} {'req':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>7}"
+        )
+        for label, endpoint in result['endpoints'].items():
+            line = (
+                f"   {label:<28} {endpoint['requests']:>6} {endpoint['throughput']:>8.1f} "
+                f"{endpoint['p50_ms']:>8.1f} {endpoint['p95_ms']:>8.1f} {endpoint['p99_ms']:>8.1f} "
+                f"{endpoint['error_rate']:>7.1%}"
+            )
+            self.stdout.write(self.style.ERROR(line) if endpoint['errors'] else line)
+        self.stdout.write('')
+        summary = (
+            f"{result['requests']} requisições em {result['elapsed']:.1f}s "
+            f"({result['throughput']:.1f} req/s), {result['errors']} erros ({result['error_rate']:.1%})"
+        )
+        if result['errors']:
+            self.stdout.write(self.style.WARNING(f"⚠️  {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
@@ -0,0 +1,101 @@
+"""
+Executa as tarefas em segundo plano da fila no banco (mammals.jobs)
+
+Uso:
+    python manage.py run_worker [--processes 2] [--poll-interval 1] [--burst]
+
+Cada processo reserva e executa uma tarefa por vez; processos que morrem
+são substituídos e as tarefas que estavam com eles voltam para a fila.
+SIGTERM/Ctrl+C encerram depois das tarefas em andamento. Com --burst, os
+processos saem quando a fila esvazia (útil em cron ou no deploy).
+"""
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from mammals import jobs
+
+
+def _worker_process(stop, burst, poll_interval):
+    """Ponto de entrada de cada processo do pool"""
+    import django
+
+    django.setup()
+    # Ctrl+C chega ao grupo todo: o pai sinaliza stop e o filho termina a tarefa atual
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    jobs.work(stop=stop, burst=burst, poll_interval=poll_interval)
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano (tradução e imagens)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Processos do pool')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Segundos entre consultas quando a fila está vazia'
+        )
+        parser.add_argument('--burst', action='store_true', help='Sai quando não houver tarefas prontas')
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='Remove ao iniciar as tarefas concluídas há mais de N dias'
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes < 1:
+            raise CommandError('--processes precisa ser positivo.')
+
+        requeued = jobs.requeue_stale()
+        purged = jobs.purge_finished(options['keep_days'])
+        self.stdout.write(
+            f"⚙️  {processes} workers ({', '.join(sorted(jobs.TASKS))}); "
+            f"{requeued} tarefas presas devolvidas, {purged} concluídas removidas"
+        )
+
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        args = (stop, options['burst'], options['poll_interval'])
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+        # Conexões abertas não podem ser herdadas pelos filhos (fork)
+        connections.close_all()
+        pool = [self._start(context, args) for _ in range(processes)]
+        try:
+            while pool:
+                stop.wait(1.0)
+                alive = []
+                for process in pool:
+                    if process.is_alive():
+                        alive.append(process)
+                        continue
+                    process.join()
+                    if process.exitcode != 0:
+                        released = jobs.release(jobs.worker_name(process.pid))
+                        self.stderr.write(self.style.WARNING(
+                            f"⚠️  Worker {process.pid} saiu com código {process.exitcode}; "
+                            f"{released} tarefas devolvidas à fila"
+                        ))
+                        if not stop.is_set() and not options['burst']:
+                            connections.close_all()
+                            alive.append(self._start(context, args))
+                pool = alive
+        except KeyboardInterrupt:
+            stop.set()
+            self.stdout.write('⏹️  Encerrando depois das tarefas em andamento...')
+            for process in pool:
+                process.join()
+
+        self.stdout.write(self.style.SUCCESS('✅ Workers encerrados.'))
+
+    def _start(self, context, args):
+        process = context.Process(target=_worker_process, args=args, daemon=True)
+        process.start()
+        return process
@@ -0,0 +1,122 @@
+"""
+Prepara o catálogo para o tráfego depois do deploy (ou de um cache zerado)
+
+Uso:
+    python manage.py warm_caches [--workers 4] [--limit N] [--skip-pages]
+
+Traduz os textos de todas as espécies em paralelo e grava na tabela
+Translation, de onde todos os processos web leem (as requisições nunca
+chamam a API). Com CACHE_MODE=db (cache compartilhado) também visita, como
+visitante anônimo e em cada idioma, os endpoints JSON do catálogo (dados do
+mapa global e facetas), que ficam no cache com as respostas comprimidas.
+
+Com CACHE_MODE=locmem (produção) o cache é de cada processo: só as
+traduções são preparadas aqui, e cada worker do gunicorn aquece o próprio
+cache ao iniciar (gunicorn.conf.py, mammals.warmup.warm_process).
+
+No fim mostra a duração e a taxa de preenchimento (presentes / esperadas)
+do que os processos web vão ler; falhas encerram o comando com erro. No
+SQLite, gravações paralelas podem falhar: use --workers 1.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from mammals import warmup
+from mammals.models import Mammal
+
+
+class Command(BaseCommand):
+    help = 'Grava as traduções de todas as espécies e, com cache compartilhado, aquece os endpoints JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Threads em paralelo')
+        parser.add_argument('--limit', type=int, default=0, help='Só as N primeiras espécies (0 = todas)')
+        parser.add_argument(
+            '--skip-pages',
+            action='store_true',
+            help='Só as traduções (sem visitar os endpoints JSON)'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers precisa ser positivo.')
+
+        mammal_ids = Mammal.objects.order_by('pk').values_list('pk', flat=True)
+        if options['limit']:
+            mammal_ids = mammal_ids[:options['limit']]
+        mammal_ids = list(mammal_ids)
+
+        cache_mode = getattr(settings, 'CACHE_MODE', 'locmem')
+        shared = cache_mode == 'db'
+        languages = len(settings.LANGUAGES)
+        self.stdout.write(
+            f"🔥 Preparando o catálogo ({cache_mode}): {len(mammal_ids)} espécies, "
+            f"{languages} idiomas, {workers} workers"
+        )
+        if not shared:
+            self.stdout.write(
+                '   Cache em memória de cada processo: só as traduções (no banco); '
+                'cada worker do gunicorn aquece o próprio cache ao iniciar.'
+            )
+        if connection.vendor == 'sqlite' and workers > 1:
+            self.stdout.write(self.style.WARNING(
+                '⚠️  SQLite com várias threads: gravações podem falhar com o banco travado; use --workers 1.'
+            ))
+
+        keys = self._expected_keys(mammal_ids, shared)
+        before = {name: warmup.fill(name, values) for name, values in keys.items()}
+        started = time.perf_counter()
+
+        failures = warmup.warm_translations(mammal_ids, workers)
+        self.stdout.write(f"   traduções prontas em {time.perf_counter() - started:.1f}s")
+
+        visits = []
+        if shared and not options['skip_pages']:
+            urls = warmup.json_urls()
+            visits, page_failures = warmup.warm_pages(urls, workers)
+            failures += page_failures
+            self.stdout.write(f"   {len(urls)} endpoints, {len(visits)} requisições")
+            keys['pages'] = warmup.page_keys(visits)
+        elapsed = time.perf_counter() - started
+
+        # Recalculadas: as chaves do mapa mudam se o catálogo mudou durante o aquecimento
+        keys.update(self._expected_keys(mammal_ids, shared))
+        after = {name: warmup.fill(name, values) for name, values in keys.items()}
+        self._print_fill(before, after)
+
+        errors = [item for item in visits if item.status >= 400]
+        present = sum(filled for filled, total in after.values())
+        total = sum(total for filled, total in after.values())
+        summary = (
+            f"{elapsed:.1f}s, preenchimento {present}/{total} ({present / total if total else 1:.1%}), "
+            f"{len(errors) + len(failures)} erros"
+        )
+        if errors or failures:
+            for item in errors[:5]:
+                self.stderr.write(f"   {item.status} {item.url}")
+            for failure in failures[:5]:
+                self.stderr.write(f"   {failure.item}: {failure.error}")
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
+
+    def _expected_keys(self, mammal_ids, shared):
+        """Só o que os processos web leem: as traduções e, com cache compartilhado, o mapa"""
+        keys = warmup.expected_keys(mammal_ids)
+        if not shared:
+            del keys['map']
+        return keys
+
+    def _print_fill(self, before, after):
+        labels = {'translations': 'traduções', 'map': 'mapa', 'pages': 'respostas'}
+        self.stdout.write(f"📊 {'cache':<12} {'antes':>16} {'depois':>16}")
+        for name, (filled, total) in after.items():
+            previous = before.get(name)
+            previous_text = self._ratio(*previous) if previous else '-'
+            self.stdout.write(f"   {labels[name]:<12} {previous_text:>16} {self._ratio(filled, total):>16}")
+
+    def _ratio(self, filled, total):
+        return f"{filled}/{total} ({filled / total if total else 1:.0%})"
@@ -0,0 +1,178 @@
+"""
+Métricas por view: consultas SQL, tempo de banco, cache e tempo total
+
+As consultas do cache em banco (CACHE_MODE=db) contam no orçamento da view
+como qualquer outra e aparecem também em separado (cache_queries).
+
+O MetricsMiddleware mede cada requisição e acumula os valores por nome de
+view resolvida (ex.: mammals:detail). /metrics exporta tudo no formato de
+texto do Prometheus. Views com orçamento em settings.QUERY_BUDGETS que
+passarem do limite geram um aviso no log ou, com QUERY_BUDGET_ENFORCE
+(ativo nos testes), uma exceção.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Limites (segundos) do histograma de duração das requisições
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_current = ContextVar('mammals_request_metrics', default=None)
+
+# True enquanto o cache em banco (CACHE_MODE=db) executa as próprias consultas
+_cache_io = ContextVar('mammals_cache_io', default=False)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view executou mais consultas SQL do que o orçamento configurado"""
+
+
+class RequestMetrics:
+    """Contadores de uma requisição em andamento"""
+
+    def __init__(self):
+        self.queries = 0
+        self.cache_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper: conta as consultas (as do cache também à parte) e o tempo gasto no banco"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            if _cache_io.get():
+                self.cache_queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+@contextmanager
+def cache_io():
+    """Marca as consultas feitas pelo backend de cache (contadas também em cache_queries)"""
+    token = _cache_io.set(True)
+    try:
+        yield
+    finally:
+        _cache_io.reset(token)
+
+
+def record_cache(hits=0, misses=0):
+    """Registra acertos/faltas de cache na requisição atual (se houver)"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+class ViewStats:
+    """Valores acumulados de uma view"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.cache_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duration = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+class Registry:
+    """Métricas do processo, por view (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view_name, metrics, duration):
+        with self._lock:
+            stats = self._views.setdefault(view_name, ViewStats())
+            stats.requests += 1
+            stats.queries += metrics.queries
+            stats.cache_queries += metrics.cache_queries
+            stats.db_time += metrics.db_time
+            stats.cache_hits += metrics.cache_hits
+            stats.cache_misses += metrics.cache_misses
+            stats.duration += duration
+            for index, limit in enumerate(DURATION_BUCKETS):
+                if duration <= limit:
+                    stats.buckets[index] += 1
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def snapshot(self, view_name):
+        with self._lock:
+            return self._views.get(view_name)
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus"""
+        counters = (
+            ('mammals_view_requests_total', 'Requisições atendidas', 'requests'),
+            ('mammals_view_queries_total', 'Consultas SQL executadas', 'queries'),
+            ('mammals_view_cache_queries_total', 'Consultas SQL do cache em banco (incluídas nas consultas)', 'cache_queries'),
+            ('mammals_view_db_seconds_total', 'Tempo gasto no banco de dados', 'db_time'),
+            ('mammals_view_cache_hits_total', 'Acertos de cache', 'cache_hits'),
+            ('mammals_view_cache_misses_total', 'Faltas de cache', 'cache_misses'),
+        )
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = []
+            for name, help_text, attr in counters:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for view_name, stats in views:
+                    lines.append(f'{name}{{view="{_escape(view_name)}"}} {_number(getattr(stats, attr))}')
+
+            name = 'mammals_view_duration_seconds'
+            lines.append(f'# HELP {name} Tempo total da requisição')
+            lines.append(f'# TYPE {name} histogram')
+            for view_name, stats in views:
+                label = _escape(view_name)
+                for limit, count in zip(DURATION_BUCKETS, stats.buckets):
+                    lines.append(f'{name}_bucket{{view="{label}",le="{limit}"}} {count}')
+                lines.append(f'{name}_bucket{{view="{label}",le="+Inf"}} {stats.requests}')
+                lines.append(f'{name}_sum{{view="{label}"}} {_number(stats.duration)}')
+                lines.append(f'{name}_count{{view="{label}"}} {stats.requests}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return f'{value:.6f}' if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+def check_query_budget(view_name, queries):
+    """Compara o número de consultas com settings.QUERY_BUDGETS"""
+    budget = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+    if budget is None or queries <= budget:
+        return
+    message = f'{view_name} executou {queries} consultas SQL (orçamento: {budget})'
+    if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -1,9 +1,19 @@
 """
-Middleware para inicialização automática do banco de dados
+Middlewares do projeto: inicialização automática do banco de dados,
+compressão das respostas dinâmicas e métricas por view
 """
+import hashlib
 import os
 import json
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics
 
 
 class AutoInitMiddleware:
@@ -76,6 +86,11 @@ class AutoInitMiddleware:
                 
                 print(f"✅ {count} espécies importadas!")
             
+            # Importar dossiês científicos (associados pelo nome científico)
+            if os.path.exists(os.path.join(settings.BASE_DIR, 'dossiers.json')):
+                print("\n📚 Importando dossiês...")
+                call_command('load_dossiers')
+            
             print("\n" + "="*60)
             print(f"✅ PRONTO! {Mammal.objects.count()} espécies no banco")
             print("="*60 + "\n")
@@ -84,3 +99,116 @@ class AutoInitMiddleware:
             print(f"⚠️  Erro na inicialização: {e}")
             import traceback
             traceback.print_exc()
+
+
+def compressed_cache_key(full_path, encoding, etag):
+    """Chave dos bytes comprimidos de uma resposta com ETag (também usada no warm_caches)"""
+    url = hashlib.md5(full_path.encode('utf-8')).hexdigest()
+    return f'compressed:{encoding}:{url}:{etag.removeprefix("W/")}'
+
+
+class CompressionMiddleware:
+    """
+    Comprime respostas HTML e JSON com br, zstd ou gzip
+
+    Respostas com ETag (derivado da versão do catálogo) são públicas e
+    determinísticas: os bytes comprimidos ficam no cache junto do ETag e
+    as próximas requisições não comprimem de novo. As demais, e as que
+    trazem um token CSRF (do visitante, nunca de outro), usam apenas gzip
+    com preenchimento aleatório.
+    """
+
+    # Corpos menores que isso não compensam a compressão
+    MIN_SIZE = 1024
+    CACHE_TIMEOUT = 60 * 60 * 24
+    COMPRESSIBLE_TYPES = ('text/html', 'application/json', 'text/plain')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        etag = response.get('ETag')
+        cacheable = etag and not self._uses_csrf(request, response)
+        header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = compression.negotiate(header) if cacheable else compression.negotiate(header, ['gzip'])
+        if encoding is None:
+            return response
+
+        if cacheable:
+            content = self._cached_compress(request, response.content, encoding, etag)
+            # A representação comprimida não é idêntica byte a byte
+            if not etag.startswith('W/'):
+                response.headers['ETag'] = f'W/{etag}'
+        else:
+            content = compression.compress(response.content, encoding, padded=True)
+
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response.headers['Content-Length'] = str(len(content))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _is_compressible(self, response):
+        if response.streaming or response.status_code != 200:
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        return content_type in self.COMPRESSIBLE_TYPES and len(response.content) >= self.MIN_SIZE
+
+    def _uses_csrf(self, request, response):
+        """
+        A renderização chamou get_token ({% csrf_token %}): o corpo é deste
+        visitante. Depois do CsrfViewMiddleware a marca já foi consumida e
+        sobra o cookie do token na resposta.
+        """
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or request.META.get('CSRF_COOKIE_USED'):
+            return True
+        return settings.CSRF_COOKIE_NAME in response.cookies
+
+    def _cached_compress(self, request, content, encoding, etag):
+        """Bytes comprimidos guardados por (URL, ETag, codificação)"""
+        key = compressed_cache_key(request.get_full_path(), encoding, etag)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compression.compress(content, encoding)
+            cache.set(key, compressed, self.CACHE_TIMEOUT)
+        return compressed
+
+
+class MetricsMiddleware:
+    """
+    Mede consultas SQL, tempo de banco, cache e tempo total de cada requisição
+
+    Os valores são acumulados por view resolvida (exportados em /metrics) e
+    o número de consultas é comparado com settings.QUERY_BUDGETS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = request_metrics.activate()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(request_metrics))
+                response = self.get_response(request)
+        finally:
+            request_metrics.deactivate(token)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        if view_name != 'metrics':
+            metrics.registry.observe(view_name, request_metrics, duration)
+            metrics.check_query_budget(view_name, request_metrics.queries)
+        return response
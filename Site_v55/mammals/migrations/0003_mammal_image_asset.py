@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:52
+
+from django.db import migrations, models
+
+
+def resolve_image_assets(apps, schema_editor):
+    """Preenche image_asset das espécies existentes"""
+    from mammals.images import iter_source_images, resolve_image_asset
+
+    Mammal = apps.get_model('mammals', 'Mammal')
+    available = list(iter_source_images())
+    for mammal in Mammal.objects.exclude(image_filename__isnull=True).exclude(image_filename=''):
+        mammal.image_asset = resolve_image_asset(mammal.image_filename, available)
+        mammal.save(update_fields=['image_asset'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0002_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mammal',
+            name='image_asset',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Caminho validado e deduplicado da imagem em static/images (ver index_images)', max_length=255, verbose_name='Imagem Canônica'),
+        ),
+        migrations.RunPython(resolve_image_assets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0003_mammal_image_asset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MammalImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image_asset', models.CharField(help_text='Caminho da imagem em static/images (variantes geradas por build_images)', max_length=255, verbose_name='Imagem')),
+                ('caption', models.CharField(blank=True, default='', max_length=255, verbose_name='Legenda')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Posição')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Imagem da Galeria',
+                'verbose_name_plural': 'Imagens da Galeria',
+                'ordering': ['mammal', 'position', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='mammalimage',
+            name='mammal',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='mammals.mammal', verbose_name='Mamífero'),
+        ),
+        migrations.AddIndex(
+            model_name='mammalimage',
+            index=models.Index(fields=['mammal', 'position'], name='mammals_mam_mammal__629d6a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mammalimage',
+            unique_together={('mammal', 'image_asset')},
+        ),
+    ]
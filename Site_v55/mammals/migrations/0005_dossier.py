@@ -0,0 +1,66 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0004_mammalimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Dossier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(choices=[('pt', 'Português'), ('en', 'English')], default='pt', max_length=10, verbose_name='Idioma')),
+                ('title', models.CharField(max_length=200, verbose_name='Título')),
+                ('subtitle', models.CharField(blank=True, default='', help_text='Nome científico com autor e ano (ex.: Dusicyon avus Burmeister, 1866)', max_length=255, verbose_name='Subtítulo')),
+                ('map_points', models.JSONField(blank=True, default=list, help_text='Lista de {"location": ..., "lat": ..., "lon": ...}', verbose_name='Pontos do Mapa')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Dossiê',
+                'verbose_name_plural': 'Dossiês',
+                'ordering': ['mammal', 'language'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DossierSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anchor', models.SlugField(help_text='Identificador usado no menu de navegação (#âncora)', verbose_name='Âncora')),
+                ('nav_label', models.CharField(max_length=100, verbose_name='Rótulo no Menu')),
+                ('title', models.CharField(max_length=200, verbose_name='Título')),
+                ('body', models.TextField(help_text='HTML da seção; aceita a tag {% static %}', verbose_name='Conteúdo')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Posição')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Seção do Dossiê',
+                'verbose_name_plural': 'Seções do Dossiê',
+                'ordering': ['dossier', 'position', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='dossier',
+            name='mammal',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dossiers', to='mammals.mammal', verbose_name='Mamífero'),
+        ),
+        migrations.AddField(
+            model_name='dossiersection',
+            name='dossier',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='mammals.dossier', verbose_name='Dossiê'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dossier',
+            unique_together={('mammal', 'language')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='dossiersection',
+            unique_together={('dossier', 'anchor')},
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:11
+
+from django.db import migrations, models
+
+
+def initialize_catalog_version(apps, schema_editor):
+    """Cria o contador e coloca as espécies existentes na versão 1"""
+    CatalogState = apps.get_model('mammals', 'CatalogState')
+    Mammal = apps.get_model('mammals', 'Mammal')
+    CatalogState.objects.update_or_create(pk=1, defaults={'version': 1})
+    Mammal.objects.update(catalog_version=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0005_dossier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Versão')),
+            ],
+            options={
+                'verbose_name': 'Estado do Catálogo',
+                'verbose_name_plural': 'Estado do Catálogo',
+            },
+        ),
+        migrations.CreateModel(
+            name='MammalTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mammal_id', models.PositiveBigIntegerField(verbose_name='ID do Mamífero')),
+                ('catalog_version', models.PositiveBigIntegerField(db_index=True, verbose_name='Versão do Catálogo')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Removido em')),
+            ],
+            options={
+                'verbose_name': 'Mamífero Removido',
+                'verbose_name_plural': 'Mamíferos Removidos',
+                'ordering': ['catalog_version'],
+            },
+        ),
+        migrations.AddField(
+            model_name='mammal',
+            name='catalog_version',
+            field=models.PositiveBigIntegerField(db_index=True, default=0, editable=False, help_text='Versão do catálogo em que o registro foi alterado pela última vez (ver /sync/)', verbose_name='Versão do Catálogo'),
+        ),
+        migrations.RunPython(initialize_catalog_version, migrations.RunPython.noop),
+    ]
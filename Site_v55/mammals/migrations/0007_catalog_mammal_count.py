@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:25
+
+from django.db import migrations, models
+
+
+def initialize_mammal_count(apps, schema_editor):
+    """Preenche o total de espécies a partir do banco atual"""
+    CatalogState = apps.get_model('mammals', 'CatalogState')
+    Mammal = apps.get_model('mammals', 'Mammal')
+    CatalogState.objects.get_or_create(pk=1)
+    CatalogState.objects.filter(pk=1).update(mammal_count=Mammal.objects.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0006_catalog_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogstate',
+            name='mammal_count',
+            field=models.PositiveIntegerField(default=0, help_text='Mantido junto com a versão, para paginar sem COUNT(*)', verbose_name='Total de Espécies'),
+        ),
+        migrations.RunPython(initialize_mammal_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:29
+
+from django.db import migrations, models
+
+
+def populate_facet_keys(apps, schema_editor):
+    """Preenche as chaves normalizadas e o vocabulário a partir das espécies existentes"""
+    Mammal = apps.get_model('mammals', 'Mammal')
+    FacetTerm = apps.get_model('mammals', 'FacetTerm')
+
+    def normalize(value):
+        return (value or '').strip().lower()[:100]
+
+    mammals = list(Mammal.objects.only('id', 'continent', 'taxonomy_order'))
+    for mammal in mammals:
+        mammal.continent_key = normalize(mammal.continent)
+        mammal.taxonomy_key = normalize(mammal.taxonomy_order)
+        for kind, key, label in (
+            ('continent', mammal.continent_key, mammal.continent),
+            ('order', mammal.taxonomy_key, mammal.taxonomy_order),
+        ):
+            if key:
+                FacetTerm.objects.get_or_create(kind=kind, key=key, defaults={'label': label.strip()[:100]})
+    Mammal.objects.bulk_update(mammals, ['continent_key', 'taxonomy_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0007_catalog_mammal_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('continent', 'Continente'), ('order', 'Ordem Taxonômica')], max_length=20, verbose_name='Tipo')),
+                ('key', models.CharField(help_text='Valor normalizado', max_length=100, verbose_name='Chave')),
+                ('label', models.CharField(help_text='Grafia exibida nos filtros', max_length=100, verbose_name='Rótulo')),
+            ],
+            options={
+                'verbose_name': 'Termo de Filtro',
+                'verbose_name_plural': 'Termos de Filtro',
+                'ordering': ['kind', 'label'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='mammal',
+            name='mammals_mam_contine_7cb82a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='mammal',
+            name='mammals_mam_taxonom_1616a3_idx',
+        ),
+        migrations.AddField(
+            model_name='mammal',
+            name='continent_key',
+            field=models.CharField(blank=True, default='', editable=False, help_text='continent normalizado (ver FacetTerm)', max_length=100, verbose_name='Chave do Continente'),
+        ),
+        migrations.AddField(
+            model_name='mammal',
+            name='taxonomy_key',
+            field=models.CharField(blank=True, default='', editable=False, help_text='taxonomy_order normalizado (ver FacetTerm)', max_length=100, verbose_name='Chave da Ordem'),
+        ),
+        migrations.AddIndex(
+            model_name='mammal',
+            index=models.Index(fields=['continent_key'], name='mammals_mam_contine_e9f4e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mammal',
+            index=models.Index(fields=['taxonomy_key'], name='mammals_mam_taxonom_5f86a3_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='facetterm',
+            unique_together={('kind', 'key')},
+        ),
+        migrations.RunPython(populate_facet_keys, migrations.RunPython.noop),
+    ]
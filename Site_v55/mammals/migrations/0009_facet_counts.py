@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:33
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def populate_facet_counts(apps, schema_editor):
+    """Contagens iniciais a partir das espécies existentes"""
+    Mammal = apps.get_model('mammals', 'Mammal')
+    FacetCount = apps.get_model('mammals', 'FacetCount')
+
+    totals = Counter()
+    for continent_key, taxonomy_key in Mammal.objects.values_list('continent_key', 'taxonomy_key'):
+        if continent_key:
+            totals['continent', continent_key, ''] += 1
+        if taxonomy_key:
+            totals['order', '', taxonomy_key] += 1
+        if continent_key and taxonomy_key:
+            totals['pair', continent_key, taxonomy_key] += 1
+    FacetCount.objects.bulk_create(
+        FacetCount(kind=kind, continent_key=continent, taxonomy_key=taxonomy, count=n)
+        for (kind, continent, taxonomy), n in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0008_facet_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('continent', 'Continente'), ('order', 'Ordem Taxonômica'), ('pair', 'Continente e Ordem')], max_length=20, verbose_name='Tipo')),
+                ('continent_key', models.CharField(blank=True, default='', max_length=100, verbose_name='Continente')),
+                ('taxonomy_key', models.CharField(blank=True, default='', max_length=100, verbose_name='Ordem')),
+                ('count', models.IntegerField(default=0, verbose_name='Espécies')),
+            ],
+            options={
+                'verbose_name': 'Contagem de Filtro',
+                'verbose_name_plural': 'Contagens de Filtro',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='facetcount',
+            unique_together={('kind', 'continent_key', 'taxonomy_key')},
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
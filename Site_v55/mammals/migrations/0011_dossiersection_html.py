@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:44
+
+from django.db import migrations, models
+
+
+def render_sections(apps, schema_editor):
+    """Preenche o HTML das seções existentes"""
+    from mammals.models import render_dossier_html
+
+    DossierSection = apps.get_model('mammals', 'DossierSection')
+    for section in DossierSection.objects.only('body'):
+        section.html = render_dossier_html(section.body)
+        section.save(update_fields=['html'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0010_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dossiersection',
+            name='html',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Conteúdo com as URLs estáticas resolvidas (gerado ao salvar)', verbose_name='HTML renderizado'),
+        ),
+        migrations.RunPython(render_sections, migrations.RunPython.noop),
+    ]
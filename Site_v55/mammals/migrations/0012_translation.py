@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0011_dossiersection_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Translation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Idiomas e hash do texto original (get_translation_cache_key)', max_length=100, unique=True, verbose_name='Chave')),
+                ('text', models.TextField(verbose_name='Tradução')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizada em')),
+            ],
+            options={
+                'verbose_name': 'Tradução',
+                'verbose_name_plural': 'Traduções',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mammals', '0012_translation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mammal',
+            name='translation_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Incrementada pela tarefa translate_mammal (entra no ETag do detalhe)', verbose_name='Versão das Traduções'),
+        ),
+    ]
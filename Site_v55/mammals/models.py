@@ -1,4 +1,7 @@
-from django.db import models
+import re
+
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.cache import cache
@@ -45,6 +48,27 @@ class Mammal(models.Model):
         verbose_name="Nome do Arquivo de Imagem",
         help_text="Nome do arquivo de imagem na pasta static/images"
     )
+    image_asset = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Imagem Canônica",
+        help_text="Caminho validado e deduplicado da imagem em static/images (ver index_images)"
+    )
+    catalog_version = models.PositiveBigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name="Versão do Catálogo",
+        help_text="Versão do catálogo em que o registro foi alterado pela última vez (ver /sync/)"
+    )
+    translation_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Versão das Traduções",
+        help_text="Incrementada pela tarefa translate_mammal (entra no ETag do detalhe)"
+    )
     continent = models.CharField(
         max_length=100,
         blank=True,
@@ -59,6 +83,23 @@ class Mammal(models.Model):
         verbose_name="Ordem Taxonômica",
         help_text="Ordem taxonômica do mamífero"
     )
+    # Chaves normalizadas (minúsculas) para filtros por igualdade com índice
+    continent_key = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Chave do Continente",
+        help_text="continent normalizado (ver FacetTerm)"
+    )
+    taxonomy_key = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Chave da Ordem",
+        help_text="taxonomy_order normalizado (ver FacetTerm)"
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
@@ -68,13 +109,38 @@ class Mammal(models.Model):
         ordering = ['common_name']
         indexes = [
             models.Index(fields=['common_name']),
-            models.Index(fields=['continent']),
-            models.Index(fields=['taxonomy_order']),
+            # Filtros case-insensitive usam as chaves normalizadas
+            models.Index(fields=['continent_key']),
+            models.Index(fields=['taxonomy_key']),
         ]
 
+    # Valores gravados que os signals comparam no save (ver signals.remember_previous_values)
+    TRACKED_FIELDS = ('image_filename', 'continent_key', 'taxonomy_key')
+
     def __str__(self):
         return f"{self.common_name} ({self.binomial_name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_values()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_tracked_values()
+
+    def _remember_tracked_values(self):
+        """Guarda os valores gravados dos TRACKED_FIELDS carregados (adiados ficam de fora)"""
+        self._loaded_values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def save(self, *args, **kwargs):
+        # Versão e total do catálogo (pre_save), a linha e as contagens por
+        # faceta (post_save) na mesma transação: uma falha desfaz tudo
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._remember_tracked_values()
+
     def get_absolute_url(self):
         return reverse('mammals:detail', kwargs={'pk': self.pk})
 
@@ -133,6 +199,237 @@ class Mammal(models.Model):
             }
 
 
+class CatalogState(models.Model):
+    """Contador global de versões do catálogo (registro único, pk=1)"""
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Versão")
+    mammal_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Total de Espécies",
+        help_text="Mantido junto com a versão, para paginar sem COUNT(*)"
+    )
+
+    class Meta:
+        verbose_name = "Estado do Catálogo"
+        verbose_name_plural = "Estado do Catálogo"
+
+    def __str__(self):
+        return f"Catálogo v{self.version}"
+
+
+class MammalTombstone(models.Model):
+    """Registro de mamífero removido, para que a sincronização propague a exclusão"""
+    mammal_id = models.PositiveBigIntegerField(verbose_name="ID do Mamífero")
+    catalog_version = models.PositiveBigIntegerField(db_index=True, verbose_name="Versão do Catálogo")
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name="Removido em")
+
+    class Meta:
+        verbose_name = "Mamífero Removido"
+        verbose_name_plural = "Mamíferos Removidos"
+        ordering = ['catalog_version']
+
+    def __str__(self):
+        return f"#{self.mammal_id} removido na v{self.catalog_version}"
+
+
+class FacetTerm(models.Model):
+    """Vocabulário canônico de continentes e ordens (alimenta os filtros sem DISTINCT)"""
+    CONTINENT = 'continent'
+    ORDER = 'order'
+    KIND_CHOICES = [
+        (CONTINENT, 'Continente'),
+        (ORDER, 'Ordem Taxonômica'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Tipo")
+    key = models.CharField(max_length=100, verbose_name="Chave", help_text="Valor normalizado")
+    label = models.CharField(max_length=100, verbose_name="Rótulo", help_text="Grafia exibida nos filtros")
+
+    class Meta:
+        verbose_name = "Termo de Filtro"
+        verbose_name_plural = "Termos de Filtro"
+        ordering = ['kind', 'label']
+        unique_together = ['kind', 'key']
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.label}"
+
+
+class FacetCount(models.Model):
+    """
+    Contagens materializadas por continente, por ordem e por (continente, ordem)
+
+    Atualizadas nos signals de Mammal; em linhas por continente o
+    taxonomy_key fica vazio e vice-versa (ver o campo kind).
+    """
+    CONTINENT = 'continent'
+    ORDER = 'order'
+    PAIR = 'pair'
+    KIND_CHOICES = [
+        (CONTINENT, 'Continente'),
+        (ORDER, 'Ordem Taxonômica'),
+        (PAIR, 'Continente e Ordem'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Tipo")
+    continent_key = models.CharField(max_length=100, blank=True, default='', verbose_name="Continente")
+    taxonomy_key = models.CharField(max_length=100, blank=True, default='', verbose_name="Ordem")
+    count = models.IntegerField(default=0, verbose_name="Espécies")
+
+    class Meta:
+        verbose_name = "Contagem de Filtro"
+        verbose_name_plural = "Contagens de Filtro"
+        unique_together = ['kind', 'continent_key', 'taxonomy_key']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.continent_key}/{self.taxonomy_key}: {self.count}"
+
+
+class MammalImage(models.Model):
+    """Modelo para a galeria de imagens de um mamífero (dossiês)"""
+    mammal = models.ForeignKey(
+        Mammal,
+        on_delete=models.CASCADE,
+        related_name='images',
+        verbose_name="Mamífero"
+    )
+    image_asset = models.CharField(
+        max_length=255,
+        verbose_name="Imagem",
+        help_text="Caminho da imagem em static/images (variantes geradas por build_images)"
+    )
+    caption = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        verbose_name="Legenda"
+    )
+    position = models.PositiveIntegerField(default=0, verbose_name="Posição")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        verbose_name = "Imagem da Galeria"
+        verbose_name_plural = "Imagens da Galeria"
+        ordering = ['mammal', 'position', 'id']
+        unique_together = ['mammal', 'image_asset']
+        indexes = [
+            models.Index(fields=['mammal', 'position']),
+        ]
+
+    def __str__(self):
+        return f"{self.image_asset} ({self.mammal.common_name})"
+
+
+class Dossier(models.Model):
+    """Modelo para o dossiê científico completo de um mamífero, por idioma"""
+    LANGUAGE_CHOICES = [
+        ('pt', 'Português'),
+        ('en', 'English'),
+    ]
+
+    mammal = models.ForeignKey(
+        Mammal,
+        on_delete=models.CASCADE,
+        related_name='dossiers',
+        verbose_name="Mamífero"
+    )
+    language = models.CharField(
+        max_length=10,
+        choices=LANGUAGE_CHOICES,
+        default='pt',
+        verbose_name="Idioma"
+    )
+    title = models.CharField(max_length=200, verbose_name="Título")
+    subtitle = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        verbose_name="Subtítulo",
+        help_text="Nome científico com autor e ano (ex.: Dusicyon avus Burmeister, 1866)"
+    )
+    map_points = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="Pontos do Mapa",
+        help_text='Lista de {"location": ..., "lat": ..., "lon": ...}'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Dossiê"
+        verbose_name_plural = "Dossiês"
+        ordering = ['mammal', 'language']
+        unique_together = ['mammal', 'language']
+
+    def __str__(self):
+        return f"{self.title} ({self.get_language_display()})"
+
+
+# Única tag de template aceita no corpo das seções: {% static 'caminho' %}
+STATIC_TAG_RE = re.compile(r"""{%\s*static\s+(['"])(?P<path>[^'"]+)\1\s*%}""")
+
+
+def render_dossier_html(body):
+    """
+    HTML de uma seção com as tags {% static %} trocadas pelas URLs (com o
+    hash do collectstatic). O corpo não é compilado como template: qualquer
+    outra tag fica como texto.
+    """
+    from django.templatetags.static import static
+
+    def resolve(match):
+        try:
+            return static(match['path'])
+        except ValueError:
+            # Sem manifesto (antes do collectstatic): URL sem hash
+            return f"{settings.STATIC_URL}{match['path']}"
+
+    return STATIC_TAG_RE.sub(resolve, body)
+
+
+class DossierSection(models.Model):
+    """Modelo para uma seção (tópico) de um dossiê"""
+    dossier = models.ForeignKey(
+        Dossier,
+        on_delete=models.CASCADE,
+        related_name='sections',
+        verbose_name="Dossiê"
+    )
+    anchor = models.SlugField(
+        max_length=50,
+        verbose_name="Âncora",
+        help_text="Identificador usado no menu de navegação (#âncora)"
+    )
+    nav_label = models.CharField(max_length=100, verbose_name="Rótulo no Menu")
+    title = models.CharField(max_length=200, verbose_name="Título")
+    body = models.TextField(
+        verbose_name="Conteúdo",
+        help_text="HTML da seção; aceita a tag {% static %}"
+    )
+    html = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="HTML renderizado",
+        help_text="Conteúdo com as URLs estáticas resolvidas (gerado ao salvar)"
+    )
+    position = models.PositiveIntegerField(default=0, verbose_name="Posição")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Seção do Dossiê"
+        verbose_name_plural = "Seções do Dossiê"
+        ordering = ['dossier', 'position', 'id']
+        unique_together = ['dossier', 'anchor']
+
+    def __str__(self):
+        return f"{self.title} ({self.dossier.title})"
+
+    def save(self, *args, **kwargs):
+        self.html = render_dossier_html(self.body)
+        super().save(*args, **kwargs)
+
+
 class Comment(models.Model):
     """Modelo para comentários em mamíferos"""
     mammal = models.ForeignKey(
@@ -251,3 +548,79 @@ class Rating(models.Model):
     def stars_display(self):
         """Retorna representação visual das estrelas"""
         return '⭐' * self.score + '☆' * (5 - self.score)
+
+
+class Job(models.Model):
+    """
+    Tarefa em segundo plano (fila no banco, executada pelo run_worker)
+
+    Ver mammals.jobs: os workers reservam linhas pendentes com um UPDATE
+    condicional, e falhas voltam para a fila com espera crescente até
+    max_attempts.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendente'),
+        (RUNNING, 'Em execução'),
+        (DONE, 'Concluída'),
+        (FAILED, 'Falhou'),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name="Tarefa")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Argumentos")
+    key = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        verbose_name="Chave",
+        help_text="Tarefas pendentes com a mesma chave não são duplicadas"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, verbose_name="Situação")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="Máximo de Tentativas")
+    run_after = models.DateTimeField(verbose_name="Executar a partir de")
+    locked_by = models.CharField(max_length=100, blank=True, default='', verbose_name="Worker")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Reservada em")
+    last_error = models.TextField(blank=True, default='', verbose_name="Último Erro")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criada em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizada em")
+
+    class Meta:
+        verbose_name = "Tarefa em Segundo Plano"
+        verbose_name_plural = "Tarefas em Segundo Plano"
+        ordering = ['run_after', 'id']
+        indexes = [
+            # Próximas tarefas: status = pending ORDER BY run_after
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['key']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+
+class Translation(models.Model):
+    """
+    Tradução automática persistida (ver mammals.translation_service)
+
+    O run_worker grava aqui o que traduz; cada processo do servidor web lê a
+    linha na primeira vez e guarda no próprio cache em memória.
+    """
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Chave",
+        help_text="Idiomas e hash do texto original (get_translation_cache_key)"
+    )
+    text = models.TextField(verbose_name="Tradução")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizada em")
+
+    class Meta:
+        verbose_name = "Tradução"
+        verbose_name_plural = "Traduções"
+
+    def __str__(self):
+        return self.key
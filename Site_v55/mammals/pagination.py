@@ -0,0 +1,99 @@
+"""
+Paginação por cursor (keyset) para listagens ordenadas por (campo, id)
+
+Em vez de OFFSET + COUNT(*), cada página filtra a partir do último registro
+da anterior, usando o índice do campo de ordenação (common_name na página
+inicial, date_joined na lista de usuários): uma consulta só, e páginas
+profundas custam o mesmo que a primeira.
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+
+def encode_cursor(value, pk):
+    """Cursor opaco para a URL a partir da chave de ordenação (datas em ISO 8601)"""
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    raw = json.dumps([value, pk], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Chave (valor, id) do cursor, ou None se for inválido"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded).decode('utf-8'))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+    if not isinstance(value, str) or not isinstance(pk, int):
+        return None
+    return value, pk
+
+
+class KeysetPage:
+    """Uma página da listagem, com cursores para a próxima e a anterior"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    # Mesma interface do Page do Django (usada pelos templates)
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_page(queryset, per_page, after=None, before=None, field='common_name', descending=False):
+    """
+    Página de `queryset` depois do cursor `after` ou antes do cursor `before`
+
+    Ordena por (field, id), crescente ou decrescente. Busca um registro a
+    mais para saber se existe página seguinte (na direção percorrida), sem
+    COUNT. Cursores inválidos levam à primeira página.
+    """
+    forward, backward = ('lt', 'gt') if descending else ('gt', 'lt')
+    order = (f'-{field}', '-id') if descending else (field, 'id')
+    reverse_order = (field, 'id') if descending else (f'-{field}', '-id')
+
+    def beyond(lookup, value, pk):
+        return Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk})
+
+    key = decode_cursor(before) if before else None
+    if key is not None:
+        rows = list(queryset.filter(beyond(backward, *key)).order_by(*reverse_order)[:per_page + 1])
+        if rows:
+            has_more = len(rows) > per_page
+            # Voltando, sempre existe a página seguinte (a de onde viemos)
+            return _page(rows[:per_page][::-1], field, has_previous=has_more, has_next=True)
+
+    key = decode_cursor(after) if after else None
+    if key is not None:
+        queryset = queryset.filter(beyond(forward, *key))
+    rows = list(queryset.order_by(*order)[:per_page + 1])
+    has_more = len(rows) > per_page
+    return _page(rows[:per_page], field, has_previous=key is not None, has_next=has_more)
+
+
+def _page(rows, field, has_previous, has_next):
+    if not rows:
+        return KeysetPage([])
+    first, last = rows[0], rows[-1]
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(getattr(last, field), last.pk) if has_next else None,
+        previous_cursor=encode_cursor(getattr(first, field), first.pk) if has_previous else None,
+    )
@@ -0,0 +1,128 @@
+"""
+Signals do app mammals
+"""
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+
+from . import catalog, facets, tasks
+from .images import resolve_image_asset
+from .models import Comment, FacetTerm, Favorite, Mammal, MammalTombstone
+
+
+@receiver(pre_save, sender=Mammal)
+def remember_previous_values(sender, instance, raw=False, **kwargs):
+    """
+    Valores gravados antes da alteração, usados pelos receivers abaixo: os
+    carregados com a instância (Mammal.from_db) ou, se algum foi adiado por
+    only()/defer(), um SELECT
+    """
+    instance._previous_values = None
+    if raw or instance._state.adding:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if len(loaded) == len(Mammal.TRACKED_FIELDS):
+        instance._previous_values = dict(loaded)
+    else:
+        instance._previous_values = (
+            Mammal.objects.filter(pk=instance.pk).values(*Mammal.TRACKED_FIELDS).first()
+        )
+
+
+@receiver(pre_save, sender=Mammal)
+def resolve_mammal_image_asset(sender, instance, raw=False, **kwargs):
+    """Valida image_filename ao salvar, para que templates nunca resolvam caminhos"""
+    if raw:
+        return
+    previous = instance._previous_values
+    if instance.image_asset and previous and previous['image_filename'] == instance.image_filename:
+        return  # mantém o asset canônico (que o index_images pode ter trocado por uma duplicata)
+    instance.image_asset = resolve_image_asset(instance.image_filename)
+
+
+@receiver(pre_save, sender=Mammal)
+def normalize_mammal_facets(sender, instance, raw=False, **kwargs):
+    """Chaves normalizadas de continente e ordem (filtros por igualdade com índice)"""
+    if raw:
+        return
+    # Chaves gravadas antes da alteração, para ajustar as contagens no post_save
+    previous = instance._previous_values
+    instance._previous_facet_keys = previous and (previous['continent_key'], previous['taxonomy_key'])
+    facets.apply_keys(instance)
+
+
+@receiver(post_save, sender=Mammal)
+def register_mammal_facet_terms(sender, instance, raw=False, **kwargs):
+    """Acrescenta continentes e ordens novos ao vocabulário e atualiza as contagens"""
+    if raw:
+        return
+    facets.register_terms(instance)
+
+    keys = (instance.continent_key, instance.taxonomy_key)
+    previous = getattr(instance, '_previous_facet_keys', None)
+    if previous == keys:
+        return
+    if previous:
+        facets.adjust_counts(*previous, delta=-1)
+    facets.adjust_counts(*keys, delta=1)
+
+
+@receiver(pre_save, sender=Mammal)
+def bump_mammal_catalog_version(sender, instance, raw=False, **kwargs):
+    """
+    Marca o registro com uma nova versão do catálogo (sincronização do PWA),
+    na transação aberta por Mammal.save
+    """
+    if raw:
+        return
+    instance.catalog_version = catalog.bump_version(count_delta=1 if instance._state.adding else 0)
+
+
+@receiver(post_save, sender=Mammal)
+def queue_mammal_refresh(sender, instance, raw=False, **kwargs):
+    """A tradução fica para o run_worker"""
+    if raw:
+        return
+    tasks.queue_mammal_refresh([instance.pk])
+
+
+@receiver(post_delete, sender=Mammal)
+def record_mammal_tombstone(sender, instance, **kwargs):
+    """Registra a exclusão para que os clientes offline também removam a espécie"""
+    MammalTombstone.objects.create(mammal_id=instance.pk, catalog_version=catalog.bump_version(count_delta=-1))
+
+
+@receiver(post_delete, sender=Mammal)
+def decrement_mammal_facet_counts(sender, instance, **kwargs):
+    """Remove a espécie das contagens de continente e ordem"""
+    facets.adjust_counts(instance.continent_key, instance.taxonomy_key, delta=-1)
+
+
+@receiver([post_save, post_delete], sender=FacetTerm)
+def clear_facet_terms_cache(sender, instance, **kwargs):
+    """Rótulos editados no admin aparecem nos filtros imediatamente"""
+    facets.clear_terms(instance.kind)
+
+
+# Contadores de atividade do perfil (lista de usuários do painel admin)
+ACTIVITY_COUNTERS = {Comment: 'comment_count', Favorite: 'favorite_count'}
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Favorite)
+def increment_activity_count(sender, instance, created, raw=False, **kwargs):
+    """+1 no contador do autor, num UPDATE sem ler o perfil"""
+    if created and not raw:
+        field = ACTIVITY_COUNTERS[sender]
+        UserProfile.objects.filter(user_id=instance.user_id).update(**{field: F(field) + 1})
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Favorite)
+def decrement_activity_count(sender, instance, **kwargs):
+    """-1 no contador do autor (nunca abaixo de zero)"""
+    field = ACTIVITY_COUNTERS[sender]
+    UserProfile.objects.filter(user_id=instance.user_id).update(**{field: Greatest(F(field) - 1, 0)})
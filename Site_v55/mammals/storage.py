@@ -0,0 +1,47 @@
+"""
+Storage de arquivos estáticos com manifesto de precache do Service Worker
+
+Após o collectstatic gerar os nomes com hash, grava sw-precache.js com as
+URLs versionadas dos recursos essenciais e uma versão calculada a partir
+delas. O sw.js importa esse arquivo: só o que mudou é baixado de novo.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+PRECACHE_MANIFEST_NAME = 'sw-precache.js'
+
+
+def build_precache_script(static_urls, pages):
+    """Conteúdo de sw-precache.js para as URLs informadas"""
+    version = hashlib.sha1('\n'.join(static_urls + pages).encode('utf-8')).hexdigest()[:12]
+    return (
+        '// Gerado pelo collectstatic (mammals.storage) - não editar\n'
+        f'self.PRECACHE_VERSION = {json.dumps(version)};\n'
+        f'self.PRECACHE_STATIC_URLS = {json.dumps(static_urls, indent=2)};\n'
+        f'self.PRECACHE_PAGES = {json.dumps(pages)};\n'
+    )
+
+
+class PrecacheManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """CompressedManifestStaticFilesStorage que também gera sw-precache.js"""
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+
+        static_urls = [self.url(path, force=True) for path in settings.PWA_PRECACHE_STATIC]
+        content = build_precache_script(static_urls, list(settings.PWA_PRECACHE_PAGES))
+
+        # Nome fixo (sem hash): o navegador compara o arquivo a cada update do SW
+        if self.exists(PRECACHE_MANIFEST_NAME):
+            self.delete(PRECACHE_MANIFEST_NAME)
+        self._save(PRECACHE_MANIFEST_NAME, ContentFile(content.encode('utf-8')))
+        for name, compressed_name in self.compress_files([PRECACHE_MANIFEST_NAME]):
+            yield name, compressed_name, True
+        yield PRECACHE_MANIFEST_NAME, PRECACHE_MANIFEST_NAME, True
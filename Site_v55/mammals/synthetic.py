@@ -0,0 +1,220 @@
+"""
+Catálogo sintético para testes de escala e benchmarks
+
+Gera espécies, usuários, comentários, favoritos e avaliações fictícios de
+forma determinística (mesma semente, mesmos dados) e insere em lotes com
+bulk_create. Como bulk_create não dispara signals, as chaves de faceta, o
+total do catálogo, as contagens por faceta e os contadores de atividade dos
+perfis são preenchidos aqui.
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from accounts.models import UserProfile, refresh_activity_counts
+
+from . import catalog, facets
+from .models import Comment, Favorite, Mammal, Rating
+
+
+# Prefixo dos nomes de usuário sintéticos (facilita remover depois)
+USERNAME_PREFIX = 'sintetico'
+# Senha comum a todos os usuários sintéticos
+PASSWORD = 'sintetico-123'
+
+GENERA = (
+    'Nesophontes', 'Thylacinus', 'Dusicyon', 'Hippotragus', 'Prolagus', 'Chaeropus',
+    'Conilurus', 'Pteropus', 'Monachus', 'Nesoryzomys', 'Megaoryzomys', 'Geocapromys',
+    'Zalophus', 'Bettongia', 'Lagorchestes', 'Potorous', 'Onychogalea', 'Notomys',
+)
+EPITHETS = (
+    'hypomicrus', 'cynocephalus', 'avus', 'leucophaeus', 'sardus', 'ecaudatus',
+    'albipes', 'tokudae', 'tropicalis', 'indefessus', 'curioi', 'thoracatus',
+    'japonicus', 'pusilla', 'leporides', 'platyops', 'crescentea', 'longicaudatus',
+)
+NAME_PARTS = (
+    ('Rato', 'Morcego', 'Lobo', 'Canguru', 'Musaranho', 'Antílope', 'Foca', 'Bandicoot', 'Hutia'),
+    ('gigante', 'das ilhas', 'do deserto', 'de cauda longa', 'pigmeu', 'listrado', 'da montanha', 'costeiro'),
+)
+CONTINENTS = (
+    'Oceania', 'Austrália', 'América do Sul', 'América do Norte (Caribe)',
+    'África', 'Ásia', 'Europa', 'Oceania (Polynesia)',
+)
+ORDERS = (
+    'Rodentia', 'Chiroptera', 'Carnivora', 'Diprotodontia', 'Eulipotyphla',
+    'Primates', 'Artiodactyla', 'Peramelemorphia', 'Lagomorpha',
+)
+# Pontos de referência por continente (as coordenadas variam em torno deles)
+PLACES = {
+    'Oceania': ('Nova Zelândia', -41.0, 174.0),
+    'Austrália': ('Nova Gales do Sul', -32.0, 147.0),
+    'América do Sul': ('Patagônia', -41.8, -68.9),
+    'América do Norte (Caribe)': ('Hispaniola', 18.9, -71.0),
+    'África': ('Madagascar', -19.0, 46.7),
+    'Ásia': ('Okinawa', 26.3, 127.8),
+    'Europa': ('Sardenha', 40.1, 9.0),
+    'Oceania (Polynesia)': ('Taiti', -17.6, -149.4),
+}
+SENTENCES = (
+    'Espécie conhecida por poucos exemplares em museus.',
+    'Habitava florestas úmidas e áreas de vegetação densa.',
+    'Desapareceu após a chegada de predadores introduzidos.',
+    'Os últimos registros confiáveis datam do século XIX.',
+    'Alimentava-se principalmente de sementes, frutos e insetos.',
+    'A perda de habitat acelerou o declínio da população.',
+    'Relatos de naturalistas descrevem hábitos noturnos.',
+    'Restos subfósseis foram encontrados em cavernas da região.',
+)
+COMMENTS = (
+    'Que triste saber que esta espécie desapareceu.',
+    'Excelente descrição, muito informativa!',
+    'Alguém sabe se existem fotos do último exemplar?',
+    'Precisamos aprender com a história desta espécie.',
+    'Não conhecia, obrigado pelo material.',
+)
+
+
+def _mammal(rng, index):
+    continent = CONTINENTS[rng.randrange(len(CONTINENTS))]
+    order = ORDERS[rng.randrange(len(ORDERS))]
+    mammal = Mammal(
+        common_name=f'{rng.choice(NAME_PARTS[0])} {rng.choice(NAME_PARTS[1])} {index:06d}',
+        binomial_name=f'{rng.choice(GENERA)} {rng.choice(EPITHETS)} {index:06d}',
+        description=' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 12))),
+        habitat=rng.choice(SENTENCES),
+        distribution=PLACES[continent][0],
+        extinction_causes=rng.choice(SENTENCES),
+        continent=continent,
+        taxonomy_order=order,
+    )
+    facets.apply_keys(mammal)
+    return mammal
+
+
+def _coordinates(rng, continent):
+    """Lista de pontos no formato de mammals_complete.json"""
+    location, lat, lon = PLACES[continent]
+    return [
+        {'location': location, 'lat': round(lat + rng.uniform(-3, 3), 4), 'lon': round(lon + rng.uniform(-3, 3), 4)}
+        for _ in range(rng.randint(1, 3))
+    ]
+
+
+def _pairs(count, user_ids, mammal_ids):
+    """`count` pares (usuário, mamífero) distintos e determinísticos"""
+    count = min(count, len(user_ids) * len(mammal_ids))
+    for k in range(count):
+        user_index = k % len(user_ids)
+        mammal_index = (k // len(user_ids) + user_index * 7919) % len(mammal_ids)
+        yield user_ids[user_index], mammal_ids[mammal_index]
+
+
+def _insert(model, objects, batch_size):
+    """bulk_create em lotes, sem manter a lista inteira em memória"""
+    created = 0
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def generate_catalog(mammals=0, users=0, comments=0, favorites=0, ratings=0, seed=1500, batch_size=2000):
+    """
+    Insere dados sintéticos e retorna um resumo
+
+    Returns:
+        dict com as quantidades criadas e 'coordinates' ({id: [pontos]}),
+        no mesmo formato do GEOCODING_DATA das views
+    """
+    rng = random.Random(seed)
+    summary = {'mammals': 0, 'users': 0, 'comments': 0, 'favorites': 0, 'ratings': 0, 'coordinates': {}}
+
+    with transaction.atomic():
+        if mammals:
+            last_id = Mammal.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+            version = catalog.bump_version()
+            offset = Mammal.objects.count()
+
+            def build():
+                for index in range(offset, offset + mammals):
+                    mammal = _mammal(rng, index)
+                    mammal.catalog_version = version
+                    yield mammal
+
+            summary['mammals'] = _insert(Mammal, build(), batch_size)
+            new_mammals = Mammal.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'continent')
+            for pk, continent in new_mammals:
+                summary['coordinates'][pk] = {
+                    'id': pk, 'has_map': True, 'coordinates': _coordinates(rng, continent),
+                }
+
+            # Contadores e vocabulário que os signals manteriam
+            for continent in CONTINENTS:
+                facets.register_terms(_mammal_stub(continent, ''))
+            for order in ORDERS:
+                facets.register_terms(_mammal_stub('', order))
+            catalog.refresh_mammal_count()
+            facets.rebuild_counts()
+
+        if users:
+            password = make_password(PASSWORD)
+            first_user = User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+            taken = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+            summary['users'] = _insert(User, (
+                User(username=f'{USERNAME_PREFIX}-{index:07d}', email=f'{USERNAME_PREFIX}{index}@example.com', password=password)
+                for index in range(taken, taken + users)
+            ), batch_size)
+            _insert(UserProfile, (
+                UserProfile(user_id=pk)
+                for pk in list(User.objects.filter(pk__gt=first_user).values_list('pk', flat=True))
+            ), batch_size)
+
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        mammal_ids = list(Mammal.objects.values_list('pk', flat=True))
+        if not user_ids or not mammal_ids:
+            return summary
+
+        if comments:
+            summary['comments'] = _insert(Comment, (
+                Comment(
+                    user_id=rng.choice(user_ids),
+                    mammal_id=rng.choice(mammal_ids),
+                    content=rng.choice(COMMENTS),
+                )
+                for _ in range(comments)
+            ), batch_size)
+
+        existing = set(Favorite.objects.values_list('user_id', 'mammal_id'))
+        summary['favorites'] = _insert(Favorite, (
+            Favorite(user_id=user_id, mammal_id=mammal_id)
+            for user_id, mammal_id in _pairs(favorites, user_ids, mammal_ids)
+            if (user_id, mammal_id) not in existing
+        ), batch_size)
+
+        existing = set(Rating.objects.values_list('user_id', 'mammal_id'))
+        # Deslocamento diferente: avaliações não coincidem com os favoritos
+        summary['ratings'] = _insert(Rating, (
+            Rating(user_id=user_id, mammal_id=mammal_id, score=rng.randint(1, 5))
+            for user_id, mammal_id in _pairs(ratings, user_ids, mammal_ids[::-1])
+            if (user_id, mammal_id) not in existing
+        ), batch_size)
+
+        if summary['comments'] or summary['favorites']:
+            refresh_activity_counts()
+
+    return summary
+
+
+def _mammal_stub(continent, order):
+    mammal = Mammal(continent=continent, taxonomy_order=order)
+    facets.apply_keys(mammal)
+    return mammal
@@ -0,0 +1,78 @@
+"""
+Tarefas em segundo plano (executadas pelo run_worker, ver mammals.jobs)
+
+Salvar um Mammal agenda a tradução dos textos (gravada na tabela
+Translation, lida pelo servidor web); as variantes de imagem só são geradas
+no build (build_images). Todas aceitam ser executadas de novo e ignoram
+espécies que já foram removidas.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from . import catalog, images
+from .jobs import enqueue_many, task
+from .models import Mammal
+from .translation_service import TRANSLATED_FIELDS, prefill_translations
+
+
+# Tarefas agendadas a cada alteração de uma espécie
+MAMMAL_REFRESH_TASKS = ('translate_mammal',)
+
+# Espécies por tarefa de regeneração de imagens
+IMAGES_BATCH_SIZE = 500
+
+
+@task(max_attempts=5)
+def translate_mammal(mammal_id):
+    """Traduz os textos da espécie para os outros idiomas (fica na tabela Translation)"""
+    row = Mammal.objects.filter(pk=mammal_id).values_list(*TRANSLATED_FIELDS).first()
+    if row is not None and prefill_translations(row, raise_errors=True):
+        mark_translated(mammal_id)
+
+
+def mark_translated(mammal_id):
+    """Nova versão das traduções: muda o ETag do detalhe servido antes sem elas"""
+    Mammal.objects.filter(pk=mammal_id).update(translation_version=F('translation_version') + 1)
+
+
+@task()
+def regenerate_images(mammal_ids):
+    """
+    Revalida image_asset (um UPDATE por arquivo distinto, com uma nova versão
+    do catálogo). As variantes só são geradas no build (build_images).
+    """
+    available = list(images.iter_source_images())
+    by_asset = {}
+    rows = Mammal.objects.filter(pk__in=mammal_ids).values_list('pk', 'image_filename', 'image_asset')
+    for pk, image_filename, image_asset in rows:
+        resolved = images.resolve_image_asset(image_filename, available)
+        if resolved != image_asset:
+            by_asset.setdefault(resolved, []).append(pk)
+
+    if by_asset:
+        with transaction.atomic():
+            version = catalog.bump_version()
+            for asset, pks in by_asset.items():
+                Mammal.objects.filter(pk__in=pks).update(image_asset=asset, catalog_version=version)
+
+
+def queue_mammal_refresh(mammal_ids, names=MAMMAL_REFRESH_TASKS):
+    """
+    Agenda as tarefas de cada espécie (a chave evita duplicar as pendentes)
+
+    Returns:
+        Lista de Jobs criados
+    """
+    return enqueue_many(
+        (name, {'mammal_id': pk}, f'{name}:{pk}')
+        for pk in mammal_ids for name in names
+    )
+
+
+def queue_regenerate_images(mammal_ids):
+    """Uma tarefa por lote de IMAGES_BATCH_SIZE espécies"""
+    mammal_ids = list(mammal_ids)
+    return enqueue_many(
+        ('regenerate_images', {'mammal_ids': mammal_ids[i:i + IMAGES_BATCH_SIZE]}, '')
+        for i in range(0, len(mammal_ids), IMAGES_BATCH_SIZE)
+    )
@@ -0,0 +1,13 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def render_section(section):
+    """
+    HTML de uma seção de dossiê, já com as URLs estáticas resolvidas ao
+    salvar (DossierSection.html); o corpo nunca é compilado como template.
+    """
+    return mark_safe(section.html)
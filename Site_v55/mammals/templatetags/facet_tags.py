@@ -0,0 +1,14 @@
+from django import template
+
+from mammals import facets
+
+register = template.Library()
+
+
+@register.simple_tag
+def facet_terms(kind):
+    """
+    Vocabulário de um filtro (continent/order) como lista de (chave, rótulo).
+    Lido de FacetTerm (em cache), sem DISTINCT sobre os mamíferos.
+    """
+    return facets.terms(kind)
@@ -0,0 +1,40 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from mammals import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image_filename, alt='', sizes=images.CARD_SIZES, loading='lazy'):
+    """
+    Emite <picture> com srcset AVIF/WebP a partir do manifesto de variantes.
+    O <img> recebe width/height (evita layout shift) e, como fundo, a cor
+    dominante e o placeholder borrado, pintados antes da imagem chegar.
+    Sem variantes geradas, retorna um <img> simples apontando para o original.
+    """
+    src = static(f'images/{image_filename}')
+    asset = images.get_asset(image_filename)
+    if not asset:
+        return format_html('<img src="{}" alt="{}" loading="{}">', src, alt, loading)
+
+    sources = format_html_join(
+        '',
+        '<source type="image/{}" srcset="{}" sizes="{}">',
+        (
+            (fmt, images.build_srcset(asset, fmt), sizes)
+            for fmt in images.VARIANT_FORMATS
+            if asset['variants'].get(fmt)
+        )
+    )
+    placeholder = format_html(
+        'background: {} url({}) center / cover no-repeat',
+        asset.get('color', 'transparent'), asset.get('placeholder', '')
+    ) if asset.get('placeholder') else ''
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" width="{}" height="{}" style="{}" '
+        'loading="{}" decoding="async"></picture>',
+        sources, src, alt, asset['width'], asset['height'], placeholder, loading
+    )
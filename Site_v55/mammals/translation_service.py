@@ -1,11 +1,23 @@
 """
 Serviço de tradução automática com cache inteligente
 Usa deep-translator (Google Translate gratuito) com cache persistente
+
+Cada tradução é buscada no cache em memória do processo, depois na tabela
+Translation e só então na API. Só o run_worker e o warm_caches chamam a API
+e gravam na tabela (prefill_translations). Nas requisições uma tradução que
+falta não espera a API: a página mostra o original e a tarefa
+translate_mammal é agendada (translate_mammals).
+
+Com settings.TRANSLATION_BACKEND = 'stub' nenhuma chamada de rede é feita:
+o texto volta marcado com o idioma (usado nos testes de carga).
 """
+from django.conf import settings
 from django.core.cache import cache
-from django.db import models
+from django.db import DatabaseError
 import hashlib
 
+from .models import Translation
+
 
 def get_translation_cache_key(text, source_lang, target_lang):
     """Gera chave única para cache de tradução"""
@@ -13,7 +25,100 @@ def get_translation_cache_key(text, source_lang, target_lang):
     return f"trans_{source_lang}_{target_lang}_{text_hash}"
 
 
-def translate_text(text, source_lang='pt', target_lang='en'):
+# Tempo no cache em memória: a cópia permanente fica na tabela Translation
+TRANSLATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Campos do Mammal traduzidos automaticamente (ver TranslatedMammal)
+TRANSLATED_FIELDS = ('description', 'habitat', 'distribution', 'extinction_causes')
+
+
+def target_languages():
+    """Idiomas do site que passam pela tradução automática (todos menos o português)"""
+    codes = {code.split('-')[0].lower() for code, name in settings.LANGUAGES}
+    return sorted(codes - {'pt'})
+
+
+def clear_mammal_translations(queryset):
+    """
+    Descarta as traduções das espécies do queryset, no cache e na tabela
+    Translation (uma consulta, um delete_many e um DELETE); a próxima
+    visita traduz de novo
+
+    Returns:
+        Número de chaves removidas
+    """
+    keys = [
+        get_translation_cache_key(text, 'pt', lang)
+        for row in queryset.values_list(*TRANSLATED_FIELDS)
+        for text in row if text and text.strip()
+        for lang in target_languages()
+    ]
+    cache.delete_many(keys)
+    Translation.objects.filter(key__in=keys).delete()
+    return len(keys)
+
+
+def load_translations(texts, target_lang):
+    """
+    Traz da tabela Translation, numa consulta, as traduções dos textos que
+    faltam no cache em memória (antes de montar uma página com vários textos)
+
+    Returns:
+        Chaves que não estão nem no cache nem na tabela
+    """
+    target_lang = target_lang.split('-')[0].lower()
+    if target_lang == 'pt':
+        return set()
+    keys = {get_translation_cache_key(text, 'pt', target_lang) for text in texts if text and text.strip()}
+    missing = keys - set(cache.get_many(list(keys)))
+    if missing:
+        stored = dict(Translation.objects.filter(key__in=missing).values_list('key', 'text'))
+        cache.set_many(stored, TRANSLATION_CACHE_TIMEOUT)
+        missing -= set(stored)
+    return missing
+
+
+def _store_translation(cache_key, translated, persist=False, raise_errors=False):
+    """Guarda a tradução no cache e, com persist, na tabela"""
+    cache.set(cache_key, translated, TRANSLATION_CACHE_TIMEOUT)
+    if not persist:
+        return
+    try:
+        Translation.objects.update_or_create(key=cache_key, defaults={'text': translated})
+    except DatabaseError as e:
+        if raise_errors:
+            raise
+        print(f"Erro ao gravar tradução: {e}")
+
+
+def prefill_translations(texts, raise_errors=False):
+    """
+    Traduz os textos do português para os outros idiomas do site (gravados
+    na tabela Translation); os que já estão na tabela não são traduzidos
+
+    Returns:
+        Número de traduções novas
+    """
+    texts = [text for text in texts if text and text.strip()]
+    created = 0
+    for language in target_languages():
+        keys = {get_translation_cache_key(text, 'pt', language): text for text in texts}
+        stored = set(Translation.objects.filter(key__in=keys).values_list('key', flat=True))
+        for key, text in keys.items():
+            if key not in stored:
+                translate_text(text, 'pt', language, raise_errors=raise_errors, check_stored=False, persist=True)
+                created += 1
+    return created
+
+
+def stub_translate(text, source_lang, target_lang):
+    """Tradução falsa e instantânea (sem rede), para testes de carga"""
+    return f"[{target_lang}] {text}"
+
+
+def translate_text(
+    text, source_lang='pt', target_lang='en', raise_errors=False, check_stored=True, persist=False, call_api=True
+):
     """
     Traduz texto usando deep-translator com cache inteligente
     
@@ -21,6 +126,12 @@ def translate_text(text, source_lang='pt', target_lang='en'):
         text: Texto para traduzir
         source_lang: Idioma de origem (pt, en, es, etc.)
         target_lang: Idioma de destino (pt, en, es, etc.)
+        raise_errors: propaga falhas da API em vez de devolver o original
+            (tarefas em segundo plano, que tentam de novo)
+        check_stored: procura na tabela Translation quando falta no cache
+            (False se load_translations já procurou)
+        persist: grava a tradução na tabela Translation (worker e warm_caches)
+        call_api: False nas requisições: sem cache nem tabela, devolve o original
     
     Returns:
         Texto traduzido (instantâneo se estiver em cache)
@@ -36,12 +147,26 @@ def translate_text(text, source_lang='pt', target_lang='en'):
     if source_lang == target_lang:
         return text
     
-    # Buscar no cache primeiro (INSTANTÂNEO)
+    # Buscar no cache primeiro (INSTANTÂNEO); para gravar, a tabela é que conta
     cache_key = get_translation_cache_key(text, source_lang, target_lang)
-    cached = cache.get(cache_key)
+    cached = None if persist else cache.get(cache_key)
     if cached:
         return cached
+
+    if check_stored:
+        stored = Translation.objects.filter(key=cache_key).values_list('text', flat=True).first()
+        if stored:
+            cache.set(cache_key, stored, TRANSLATION_CACHE_TIMEOUT)
+            return stored
+
+    if not call_api:
+        return text
     
+    if getattr(settings, 'TRANSLATION_BACKEND', 'google') == 'stub':
+        translated = stub_translate(text, source_lang, target_lang)
+        _store_translation(cache_key, translated, persist, raise_errors)
+        return translated
+
     # Se não estiver em cache, traduzir via API
     try:
         from deep_translator import GoogleTranslator
@@ -72,8 +197,8 @@ def translate_text(text, source_lang='pt', target_lang='en'):
             
             translated = "\n\n".join(translated_paragraphs)
         
-        # Salvar no cache por 30 dias (praticamente permanente)
-        cache.set(cache_key, translated, 60 * 60 * 24 * 30)
+        # Salvar no cache (e na tabela, permanente)
+        _store_translation(cache_key, translated, persist, raise_errors)
         
         return translated
         
@@ -81,6 +206,8 @@ def translate_text(text, source_lang='pt', target_lang='en'):
         # Se deep-translator não estiver instalado, retornar texto original
         return text
     except Exception as e:
+        if raise_errors:
+            raise
         # Em caso de erro, retornar texto original
         print(f"Erro ao traduzir: {e}")
         return text
@@ -91,9 +218,10 @@ class TranslatedMammal:
     Wrapper que retorna mamífero com conteúdo traduzido
     Usa cache para performance máxima
     """
-    def __init__(self, mammal, target_lang='en'):
+    def __init__(self, mammal, target_lang='en', preloaded=False):
         self.mammal = mammal
         self.target_lang = target_lang.split('-')[0].lower()
+        self.preloaded = preloaded
         self._translation_cache = {}
     
     def _translate_field(self, field_name):
@@ -109,7 +237,9 @@ class TranslatedMammal:
         if self.target_lang == 'pt':
             translated = original_value
         else:
-            translated = translate_text(original_value, 'pt', self.target_lang)
+            translated = translate_text(
+                original_value, 'pt', self.target_lang, check_stored=not self.preloaded, call_api=False
+            )
         
         self._translation_cache[field_name] = translated
         return translated
@@ -169,3 +299,32 @@ class TranslatedMammal:
         """Fallback para atributos não traduzidos"""
         return getattr(self.mammal, name)
 
+
+
+def translate_mammals(mammals, target_lang):
+    """
+    TranslatedMammal de cada espécie, com as traduções guardadas na tabela
+    lidas numa consulta só (campos adiados por only() ficam de fora)
+
+    Espécies com textos ainda sem tradução aparecem no original e ganham uma
+    tarefa translate_mammal (uma pendente por espécie).
+    """
+    from .tasks import queue_mammal_refresh  # tasks importa este módulo
+
+    mammals = list(mammals)
+    texts = {
+        mammal.pk: [
+            getattr(mammal, field)
+            for field in TRANSLATED_FIELDS if field not in mammal.get_deferred_fields()
+        ]
+        for mammal in mammals
+    }
+    missing = load_translations([text for values in texts.values() for text in values], target_lang)
+    if missing:
+        language = target_lang.split('-')[0].lower()
+        untranslated = [
+            pk for pk, values in texts.items()
+            if any(get_translation_cache_key(text, 'pt', language) in missing for text in values if text)
+        ]
+        queue_mammal_refresh(untranslated, names=('translate_mammal',))
+    return [TranslatedMammal(mammal, target_lang, preloaded=True) for mammal in mammals]
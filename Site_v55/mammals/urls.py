@@ -7,11 +7,14 @@ urlpatterns = [
     # Páginas públicas
     path('', views.index, name='index'),
     path('mammal/<int:pk>/', views.mammal_detail, name='detail'),
+    path('mammal/<int:pk>/gallery/', views.mammal_gallery, name='gallery'),
     path('about/', views.about, name='about'),
     path('search/', views.search, name='search'),
     path('global-map/', views.global_map, name='global_map'),
     path('global-map-data/', views.global_map_data, name='global_map_data'),
     path('offline/', views.offline, name='offline'),
+    path('sync/', views.catalog_sync, name='sync'),
+    path('facets/', views.facet_counts, name='facets'),
     
     # Favoritos
     path('favorites/', views.favorites_view, name='favorites'),
@@ -22,14 +25,15 @@ urlpatterns = [
     path('comment/<int:comment_id>/delete/', views.delete_comment, name='delete_comment'),
     
     # Admin - Mamíferos
-    path('admin/mammals/', views.admin_mammals, name='admin_mammals'),
-    path('admin/mammals/add/', views.admin_add_mammal, name='admin_add_mammal'),
-    path('admin/mammals/<int:pk>/edit/', views.admin_edit_mammal, name='admin_edit_mammal'),
-    path('admin/mammals/<int:pk>/delete/', views.admin_delete_mammal, name='admin_delete_mammal'),
+    path('painel/mammals/', views.admin_mammals, name='admin_mammals'),
+    path('painel/mammals/add/', views.admin_add_mammal, name='admin_add_mammal'),
+    path('painel/mammals/bulk/', views.admin_bulk_mammals, name='admin_bulk_mammals'),
+    path('painel/mammals/<int:pk>/edit/', views.admin_edit_mammal, name='admin_edit_mammal'),
+    path('painel/mammals/<int:pk>/delete/', views.admin_delete_mammal, name='admin_delete_mammal'),
     
     # Admin - Usuários
-    path('admin/users/', views.admin_users, name='admin_users'),
-    path('admin/users/<int:user_id>/toggle_admin/', views.admin_toggle_admin, name='admin_toggle_admin'),
-    path('admin/users/<int:user_id>/delete/', views.admin_delete_user, name='admin_delete_user'),
+    path('painel/users/', views.admin_users, name='admin_users'),
+    path('painel/users/<int:user_id>/toggle_admin/', views.admin_toggle_admin, name='admin_toggle_admin'),
+    path('painel/users/<int:user_id>/delete/', views.admin_delete_user, name='admin_delete_user'),
 ]
 
@@ -2,16 +2,24 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponseRedirect
-from django.db.models import Q, Count
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.db.models import Q, Count, Max, OuterRef, Subquery
+from django.db.models.functions import Lower
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import get_language, gettext_lazy as _
 from django.urls import reverse
-from .models import Mammal, Comment, Favorite
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
+from django.views.decorators.http import condition
+from .models import Mammal, MammalImage, Dossier, DossierSection, Comment, Favorite, FacetTerm
 from .decorators import admin_required
-from .translation_service import TranslatedMammal
-from accounts.models import UserProfile
+from .translation_service import translate_mammals
+from .images import image_payload
+from .fastjson import FastJsonResponse, records
+from .pagination import keyset_page
+from . import bulk_actions, catalog, facets, metrics
+from accounts.models import get_profile
 import json
 import os
 
@@ -40,32 +48,52 @@ def load_geocoding_data():
 # Carregar dados de geocodificação uma vez
 GEOCODING_DATA = load_geocoding_data()
 
+# Imagens por página no endpoint de galeria
+GALLERY_PAGE_SIZE = 6
+GALLERY_SIZES = '(max-width: 700px) 100vw, 300px'
+
+
+# Mamíferos por página na listagem da página inicial
+INDEX_PAGE_SIZE = 24
+
+# Usuários e mamíferos por página no painel admin
+ADMIN_USERS_PAGE_SIZE = 50
+ADMIN_MAMMALS_PAGE_SIZE = 50
+
 
 def index(request):
     """Página inicial com lista de mamíferos"""
     # Otimizar query - carregar apenas campos necessários
     mammals_list = Mammal.objects.only(
         'id', 'common_name', 'binomial_name', 'description', 
-        'image_filename', 'continent', 'taxonomy_order'
-    ).all()
-    
-    # Paginação - 24 mamíferos por página
-    paginator = Paginator(mammals_list, 24)
-    page = request.GET.get('page', 1)
+        'image_asset', 'continent', 'taxonomy_order'
+    )
     
-    try:
-        mammals = paginator.page(page)
-    except PageNotAnInteger:
-        mammals = paginator.page(1)
-    except EmptyPage:
-        mammals = paginator.page(paginator.num_pages)
+    if 'page' in request.GET:
+        # Links antigos (?page=N): paginação por número, com COUNT(*)
+        paginator = Paginator(mammals_list, INDEX_PAGE_SIZE)
+        page = request.GET.get('page', 1)
+        
+        try:
+            mammals = paginator.page(page)
+        except PageNotAnInteger:
+            mammals = paginator.page(1)
+        except EmptyPage:
+            mammals = paginator.page(paginator.num_pages)
+    else:
+        # Paginação por cursor: uma consulta, páginas profundas custam o mesmo
+        mammals = keyset_page(
+            mammals_list, INDEX_PAGE_SIZE,
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
     
     # Traduzir mamíferos para o idioma atual
     current_lang = get_language()
     # Normalizar código de idioma (pt-br -> pt, en-us -> en)
     lang_code = current_lang.split('-')[0] if current_lang else 'pt'
     if lang_code != 'pt':
-        mammals.object_list = [TranslatedMammal(m, current_lang) for m in mammals.object_list]
+        mammals.object_list = translate_mammals(mammals.object_list, current_lang)
     
     # Obter favoritos do usuário se autenticado
     favorites = []
@@ -75,17 +103,49 @@ def index(request):
     context = {
         'mammals': mammals,
         'favorites': favorites,
-        'is_paginated': paginator.num_pages > 1,
+        # Total do contador do catálogo (em cache), sem COUNT(*)
+        'total_count': catalog.mammal_count(),
+        'is_paginated': mammals.has_other_pages(),
     }
     
     return render(request, 'mammals/index.html', context)
 
 
+def mammal_detail_etag(request, pk):
+    """
+    ETag do detalhe: versão do mamífero e das traduções, comentários, dossiê
+    e idioma, numa consulta só (subconsultas agregadas, sem JOIN entre elas).
+    Só para visitantes anônimos - usuários logados veem favoritos e formulários.
+    """
+    if request.user.is_authenticated:
+        return None
+
+    def per_mammal(queryset, group, aggregate):
+        return Subquery(queryset.order_by().values(group).annotate(value=aggregate).values('value'))
+
+    comments = Comment.objects.filter(mammal=OuterRef('pk'))
+    row = Mammal.objects.filter(pk=pk).annotate(
+        comment_count=per_mammal(comments, 'mammal', Count('id')),
+        comment_last=per_mammal(comments, 'mammal', Max('updated_at')),
+        dossier_last=per_mammal(Dossier.objects.filter(mammal=OuterRef('pk')), 'mammal', Max('updated_at')),
+        sections_last=per_mammal(
+            DossierSection.objects.filter(dossier__mammal=OuterRef('pk')), 'dossier__mammal', Max('updated_at')
+        ),
+    ).values_list(
+        'catalog_version', 'translation_version', 'comment_count', 'comment_last', 'dossier_last', 'sections_last'
+    ).first()
+    if row is None:
+        return None
+    return catalog.make_etag(pk, *row, get_language())
+
+
+@condition(etag_func=mammal_detail_etag)
 def mammal_detail(request, pk):
     """Página de detalhes de um mamífero"""
-    # Para os animais com dossiês completos, usar template especial
-    if pk in [41, 55]:  # Nesophontes hypomicrus e Dusicyon avus
-        return mammal_dossier(request, pk)
+    # Para os animais com dossiês completos, usar o template de dossiê
+    dossier = get_dossier(pk, get_language())
+    if dossier:
+        return mammal_dossier(request, pk, dossier)
     
     # Otimizar query - carregar comentários com usuários em uma query
     mammal_obj = get_object_or_404(
@@ -98,7 +158,7 @@ def mammal_detail(request, pk):
     # Normalizar código de idioma
     lang_code = current_lang.split('-')[0] if current_lang else 'pt'
     if lang_code != 'pt':
-        mammal = TranslatedMammal(mammal_obj, current_lang)
+        mammal = translate_mammals([mammal_obj], current_lang)[0]
     else:
         mammal = mammal_obj
     
@@ -163,6 +223,38 @@ def mammal_detail(request, pk):
     return render(request, 'mammals/detail.html', context)
 
 
+def mammal_gallery(request, pk):
+    """Endpoint JSON com a galeria de um mamífero, uma página por vez"""
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+
+    # Buscar um item a mais para saber se há próxima página (sem COUNT)
+    start = (page - 1) * GALLERY_PAGE_SIZE
+    rows = list(
+        MammalImage.objects.filter(mammal_id=pk)
+        .values_list('image_asset', 'caption')[start:start + GALLERY_PAGE_SIZE + 1]
+    )
+    has_next = len(rows) > GALLERY_PAGE_SIZE
+
+    # Galeria vazia: só então confirmar que o mamífero existe
+    if not rows and page == 1 and not Mammal.objects.filter(pk=pk).exists():
+        raise Http404
+
+    images = []
+    for image_asset, caption in rows[:GALLERY_PAGE_SIZE]:
+        item = image_payload(image_asset, GALLERY_SIZES)
+        item['caption'] = caption
+        images.append(item)
+
+    return FastJsonResponse({
+        'page': page,
+        'has_next': has_next,
+        'images': images,
+    })
+
+
 def about(request):
     """Página sobre o projeto"""
     return render(request, 'mammals/about.html')
@@ -179,16 +271,13 @@ def favorites_view(request):
     lang_code = current_lang.split('-')[0] if current_lang else 'pt'
     
     # Criar lista de mamíferos traduzidos para o template
-    mammals_list = []
-    for fav in favorites:
-        if lang_code != 'pt':
-            mammal = TranslatedMammal(fav.mammal, current_lang)
-        else:
-            mammal = fav.mammal
-        mammals_list.append({
-            'favorite': fav,
-            'mammal': mammal
-        })
+    favorite_mammals = [fav.mammal for fav in favorites]
+    if lang_code != 'pt':
+        favorite_mammals = translate_mammals(favorite_mammals, current_lang)
+    mammals_list = [
+        {'favorite': fav, 'mammal': mammal}
+        for fav, mammal in zip(favorites, favorite_mammals)
+    ]
     
     context = {
         'favorites': mammals_list,
@@ -197,17 +286,14 @@ def favorites_view(request):
     return render(request, 'mammals/favorites.html', context)
 
 
+@condition(etag_func=catalog.catalog_etag)
 def search(request):
     """Endpoint de busca/filtragem (AJAX) - CORRIGIDO"""
     query = request.GET.get('q', '').strip()
     region_filter = request.GET.get('region', '').strip()
     taxonomy_filter = request.GET.get('taxonomy', '').strip()
     
-    # Otimizar query - carregar apenas campos necessários
-    mammals = Mammal.objects.only(
-        'id', 'common_name', 'binomial_name', 'description',
-        'image_filename', 'continent', 'taxonomy_order'
-    ).all()  # IMPORTANTE: .all() para retornar todos quando não há filtros
+    mammals = Mammal.objects.all()  # IMPORTANTE: retorna todos quando não há filtros
     
     # Aplicar filtros apenas se existirem
     if query:
@@ -217,36 +303,17 @@ def search(request):
             Q(description__icontains=query)
         )
     
+    # Igualdade nas chaves normalizadas (usa índice, ao contrário de __iexact)
     if region_filter and region_filter.lower() != 'all':
-        mammals = mammals.filter(continent__iexact=region_filter)
+        mammals = mammals.filter(continent_key=facets.normalize(region_filter))
     
     if taxonomy_filter and taxonomy_filter.upper() != 'ALL':
-        mammals = mammals.filter(taxonomy_order__iexact=taxonomy_filter)
+        mammals = mammals.filter(taxonomy_key=facets.normalize(taxonomy_filter))
     
-    # Preparar resultados com tratamento de erros
-    results = []
-    for mammal in mammals:
-        try:
-            # Usar short_description se existir, senão description truncada
-            description = getattr(mammal, 'short_description', None)
-            if not description:
-                description = mammal.description[:200] if mammal.description else ''
-            
-            results.append({
-                'id': mammal.id,
-                'common_name': mammal.common_name or '',
-                'binomial_name': mammal.binomial_name or '',
-                'description': description,
-                'image_filename': mammal.image_filename or '',
-                'continent': mammal.continent or '',
-                'taxonomy_order': mammal.taxonomy_order or '',
-            })
-        except Exception as e:
-            # Log erro mas continua processando
-            print(f"Erro ao processar mammal {mammal.id}: {e}")
-            continue
+    # Tuplas direto do banco (descrição cortada no SQL), no formato do catálogo offline
+    results = records(catalog.SYNC_FIELDS, catalog.sync_rows(mammals))
     
-    return JsonResponse(results, safe=False)
+    return FastJsonResponse(results)
 
 
 # ============================================================================
@@ -255,16 +322,63 @@ def search(request):
 
 @admin_required
 def admin_mammals(request):
-    """Página administrativa de mamíferos"""
-    mammals = Mammal.objects.all()
+    """Página administrativa de mamíferos (por cursor, com filtros e ações em massa)"""
+    mammals = Mammal.objects.only(
+        'id', 'common_name', 'binomial_name', 'continent', 'taxonomy_order'
+    )
+    
+    # Filtros pelas chaves normalizadas (indexadas), como na busca
+    continent = facets.normalize(request.GET.get('continent', ''))
+    order = facets.normalize(request.GET.get('order', ''))
+    if continent:
+        mammals = mammals.filter(continent_key=continent)
+    if order:
+        mammals = mammals.filter(taxonomy_key=order)
+    
+    page = keyset_page(
+        mammals, ADMIN_MAMMALS_PAGE_SIZE,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    filters = {key: value for key, value in (('continent', continent), ('order', order)) if value}
     
     context = {
-        'mammals': mammals,
+        'mammals': page,
+        'continents': facets.terms(FacetTerm.CONTINENT),
+        'orders': facets.terms(FacetTerm.ORDER),
+        'continent': continent,
+        'order': order,
+        'filter_query': urlencode(filters),
+        'bulk_actions': [(name, label) for name, (func, label, message) in bulk_actions.ACTIONS.items()],
     }
     
     return render(request, 'admin_panel/mammals.html', context)
 
 
+@admin_required
+def admin_bulk_mammals(request):
+    """Aplica uma ação em massa às espécies selecionadas"""
+    back = request.POST.get('next', '')
+    if not url_has_allowed_host_and_scheme(back, allowed_hosts={request.get_host()}):
+        back = reverse('mammals:admin_mammals')
+    if request.method != 'POST':
+        return redirect(back)
+    
+    action = bulk_actions.ACTIONS.get(request.POST.get('action', ''))
+    ids = [int(pk) for pk in request.POST.getlist('ids') if pk.isdigit()]
+    if action is None or not ids:
+        messages.error(request, 'Selecione uma ação e ao menos uma espécie.')
+        return redirect(back)
+    
+    func, label, message = action
+    try:
+        count = func(Mammal.objects.filter(pk__in=ids))
+        messages.success(request, message.format(count))
+    except Exception as e:
+        messages.error(request, f'Erro ao aplicar "{label}": {str(e)}')
+    return redirect(back)
+
+
 @admin_required
 def admin_add_mammal(request):
     """Adicionar novo mamífero"""
@@ -295,7 +409,7 @@ def admin_add_mammal(request):
                 continent=continent,
                 taxonomy_order=taxonomy_order
             )
-            messages.success(request, 'Mamífero adicionado com sucesso!')
+            messages.success(request, 'Mamífero adicionado com sucesso! Traduções são atualizadas em segundo plano.')
             return redirect('mammals:admin_mammals')
         except ValueError as e:
             messages.error(request, f'Erro de validação: {str(e)}')
@@ -330,7 +444,7 @@ def admin_edit_mammal(request, pk):
         
         try:
             mammal.save()
-            messages.success(request, 'Mamífero atualizado com sucesso!')
+            messages.success(request, 'Mamífero atualizado com sucesso! Traduções são atualizadas em segundo plano.')
             return redirect('mammals:admin_mammals')
         except ValueError as e:
             messages.error(request, f'Erro de validação: {str(e)}')
@@ -364,14 +478,31 @@ def admin_delete_mammal(request, pk):
 
 @admin_required
 def admin_users(request):
-    """Página administrativa de usuários"""
-    users = User.objects.select_related('profile').annotate(
-        comment_count=Count('comments', distinct=True),
-        favorite_count=Count('favorites', distinct=True)
-    ).order_by('-date_joined')
+    """Página administrativa de usuários (mais recentes primeiro, por cursor)"""
+    users = User.objects.select_related('profile').only(
+        'id', 'username', 'email', 'date_joined',
+        'profile__is_admin', 'profile__comment_count', 'profile__favorite_count',
+    )
+    
+    # Busca por prefixo de username/email (índices LOWER(...) em auth_user)
+    query = request.GET.get('q', '').strip()
+    if query:
+        prefix = query.lower()
+        users = users.annotate(username_lower=Lower('username'), email_lower=Lower('email')).filter(
+            Q(username_lower__startswith=prefix) | Q(email_lower__startswith=prefix)
+        )
+    
+    page = keyset_page(
+        users, ADMIN_USERS_PAGE_SIZE,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        field='date_joined',
+        descending=True,
+    )
     
     context = {
-        'users': users,
+        'users': page,
+        'query': query,
     }
     
     return render(request, 'admin_panel/users.html', context)
@@ -385,8 +516,8 @@ def admin_toggle_admin(request, user_id):
             messages.error(request, 'Você não pode alterar seu próprio status de administrador.')
             return redirect('mammals:admin_users')
         
-        user = get_object_or_404(User, pk=user_id)
-        profile, created = UserProfile.objects.get_or_create(user=user)
+        user = get_object_or_404(User.objects.select_related('profile'), pk=user_id)
+        profile = get_profile(user)
         
         try:
             profile.is_admin = not profile.is_admin
@@ -453,11 +584,11 @@ def delete_comment(request, comment_id):
     """Deletar comentário"""
     if request.method == 'POST':
         comment = get_object_or_404(Comment, pk=comment_id)
-        mammal_id = comment.mammal.id
+        mammal_id = comment.mammal_id
         scroll_pos = request.POST.get('scroll_pos', '0')
         
         # Verificar se o usuário é o autor ou admin
-        if comment.user == request.user or (hasattr(request.user, 'profile') and request.user.profile.is_admin):
+        if comment.user_id == request.user.id or request.is_site_admin:
             try:
                 comment.delete()
                 messages.success(request, _('Comment removed successfully!'))
@@ -520,87 +651,101 @@ def global_map(request):
     return render(request, 'mammals/global_map.html')
 
 
-def global_map_data(request):
-    """Endpoint JSON com dados de todas as espécies para o mapa global"""
-    try:
-        # Buscar todos os mamíferos do banco de dados - apenas campos necessários
-        mammals = Mammal.objects.only(
-            'id', 'common_name', 'binomial_name', 'continent', 'image_filename'
-        ).all()
+# Dados do mapa global em cache por versão do catálogo (ver catalog.map_data_cache_key)
+MAP_DATA_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def build_global_map_data():
+    """Espécies agrupadas por localização e estatísticas do mapa global"""
+    # Buscar todos os mamíferos do banco de dados - tuplas, sem instanciar modelos
+    mammals = Mammal.objects.values_list(
+        'id', 'common_name', 'binomial_name', 'continent', 'image_asset'
+    )
+    
+    # Estrutura para armazenar dados agregados por localização
+    location_data = {}
+    
+    # Processar cada mamífero
+    for mammal_id, common_name, binomial_name, continent, image_asset in mammals:
+        geocoding_info = GEOCODING_DATA.get(mammal_id)
         
-        # Estrutura para armazenar dados agregados por localização
-        location_data = {}
+        if not geocoding_info or not geocoding_info.get('coordinates'):
+            continue
         
-        # Processar cada mamífero
-        for mammal in mammals:
-            geocoding_info = GEOCODING_DATA.get(mammal.pk)
-            
-            if not geocoding_info or not geocoding_info.get('coordinates'):
-                continue
-            
-            # Calcular centro geográfico das coordenadas do mamífero
-            coords = geocoding_info['coordinates']
-            if not coords:
-                continue
-            
-            # Calcular média das coordenadas para ter um ponto central
-            avg_lat = sum(c.get('lat', 0) for c in coords) / len(coords)
-            avg_lon = sum(c.get('lon', 0) for c in coords) / len(coords)
-            
-            # Arredondar MUITO para agrupar regiões (0 casas decimais = ~111km de precisão)
-            lat_rounded = round(avg_lat, 0)
-            lon_rounded = round(avg_lon, 0)
-            location_key = f"{lat_rounded},{lon_rounded}"
-            
-            # Pegar nome da primeira localização como referência
-            location_name = coords[0].get('location', 'Unknown')
-            
-            # Inicializar dados da localização se não existir
-            if location_key not in location_data:
-                location_data[location_key] = {
-                    'lat': lat_rounded,
-                    'lon': lon_rounded,
-                    'location_name': location_name,
-                    'species': [],
-                    'count': 0
-                }
-            
-            # Adicionar espécie à localização
-            species_info = {
-                'id': mammal.pk,
-                'common_name': mammal.common_name,
-                'binomial_name': mammal.binomial_name,
-                'continent': mammal.continent or 'Unknown',
-                'image_filename': mammal.image_filename or ''
-            }
-            
-            # Evitar duplicatas
-            if not any(s['id'] == mammal.pk for s in location_data[location_key]['species']):
-                location_data[location_key]['species'].append(species_info)
-                location_data[location_key]['count'] += 1
+        # Calcular centro geográfico das coordenadas do mamífero
+        coords = geocoding_info['coordinates']
+        if not coords:
+            continue
+        
+        # Calcular média das coordenadas para ter um ponto central
+        avg_lat = sum(c.get('lat', 0) for c in coords) / len(coords)
+        avg_lon = sum(c.get('lon', 0) for c in coords) / len(coords)
         
-        # Converter para lista
-        locations = list(location_data.values())
+        # Arredondar MUITO para agrupar regiões (0 casas decimais = ~111km de precisão)
+        lat_rounded = round(avg_lat, 0)
+        lon_rounded = round(avg_lon, 0)
+        location_key = f"{lat_rounded},{lon_rounded}"
         
-        # Calcular estatísticas
-        total_locations = len(locations)
-        total_species = sum(loc['count'] for loc in locations)
-        max_concentration = max((loc['count'] for loc in locations), default=0)
+        # Pegar nome da primeira localização como referência
+        location_name = coords[0].get('location', 'Unknown')
         
-        response_data = {
-            'success': True,
-            'locations': locations,
-            'statistics': {
-                'total_locations': total_locations,
-                'total_species': total_species,
-                'max_concentration': max_concentration
+        # Inicializar dados da localização se não existir
+        if location_key not in location_data:
+            location_data[location_key] = {
+                'lat': lat_rounded,
+                'lon': lon_rounded,
+                'location_name': location_name,
+                'species': [],
+                'count': 0
             }
+        
+        # Adicionar espécie à localização
+        species_info = {
+            'id': mammal_id,
+            'common_name': common_name,
+            'binomial_name': binomial_name,
+            'continent': continent or 'Unknown',
+            'image_filename': image_asset
+        }
+        
+        # Evitar duplicatas
+        if not any(s['id'] == mammal_id for s in location_data[location_key]['species']):
+            location_data[location_key]['species'].append(species_info)
+            location_data[location_key]['count'] += 1
+    
+    # Converter para lista
+    locations = list(location_data.values())
+    
+    # Calcular estatísticas
+    total_locations = len(locations)
+    total_species = sum(loc['count'] for loc in locations)
+    max_concentration = max((loc['count'] for loc in locations), default=0)
+    
+    return {
+        'success': True,
+        'locations': locations,
+        'statistics': {
+            'total_locations': total_locations,
+            'total_species': total_species,
+            'max_concentration': max_concentration
         }
+    }
+
+
+@condition(etag_func=catalog.catalog_etag)
+def global_map_data(request):
+    """Endpoint JSON com dados de todas as espécies para o mapa global"""
+    try:
+        cache_key = catalog.map_data_cache_key()
+        response_data = cache.get(cache_key)
+        if response_data is None:
+            response_data = build_global_map_data()
+            cache.set(cache_key, response_data, MAP_DATA_CACHE_TIMEOUT)
         
-        return JsonResponse(response_data)
+        return FastJsonResponse(response_data)
         
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -611,18 +756,46 @@ def offline(request):
     return render(request, 'offline.html')
 
 
-def mammal_dossier(request, pk):
+def catalog_sync(request):
+    """Endpoint de sincronização do catálogo offline (PWA): só o que mudou desde ?since="""
+    try:
+        since = max(0, int(request.GET.get('since', 0)))
+    except ValueError:
+        since = 0
+
+    return FastJsonResponse(catalog.changes_since(since))
+
+
+def prometheus_metrics(request):
+    """Métricas por view no formato do Prometheus (apenas endereços locais)"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@condition(etag_func=catalog.catalog_etag)
+def facet_counts(request):
+    """Contagens de espécies por continente, ordem e par (tabela materializada)"""
+    return FastJsonResponse(facets.facet_counts())
+
+
+def get_dossier(mammal_id, language):
+    """Dossiê do mamífero no idioma atual, com fallback para português"""
+    lang_code = language.split('-')[0] if language else 'pt'
+    dossiers = {
+        dossier.language: dossier
+        for dossier in Dossier.objects.filter(mammal_id=mammal_id, language__in={lang_code, 'pt'})
+    }
+    return dossiers.get(lang_code) or dossiers.get('pt')
+
+
+def mammal_dossier(request, pk, dossier=None):
     """View para exibir dossiê científico completo do mamífero"""
-    mammal = get_object_or_404(Mammal, pk=pk)
-    
-    # Determinar qual template de dossiê usar
-    if pk == 41:  # Nesophontes hypomicrus
-        template = 'mammals/nesophontes_full.html'
-    elif pk == 55:  # Dusicyon avus
-        template = 'mammals/dusicyon_full.html'
-    else:
-        # Para outros mamíferos, redirecionar para página normal
+    dossier = dossier or get_dossier(pk, get_language())
+    if not dossier:
+        # Para mamíferos sem dossiê, redirecionar para página normal
         return redirect('mammals:detail', pk=pk)
+    mammal = get_object_or_404(Mammal, pk=pk)
     
     # Buscar comentários
     comments = mammal.comments.select_related('user').all()
@@ -637,8 +810,10 @@ def mammal_dossier(request, pk):
     
     context = {
         'mammal': mammal,
+        'dossier': dossier,
+        'sections': dossier.sections.all(),
         'comments': comments,
         'is_favorite': is_favorite,
     }
     
-    return render(request, template, context)
+    return render(request, 'mammals/dossier.html', context)
@@ -0,0 +1,250 @@
+"""
+Aquecimento de cache: traduções, endpoints JSON e páginas da listagem
+
+Em produção o cache é o LocMemCache de cada processo, então o aquecimento
+tem duas partes:
+
+- warm_caches (antes do deploy, em threads): traduz os textos de todas as
+  espécies e grava na tabela Translation, a única parte que chega aos
+  processos web. Com um cache compartilhado (CACHE_MODE=db) também visita
+  os endpoints JSON do catálogo.
+- warm_process (em cada worker do gunicorn, antes de atender; ver
+  gunicorn.conf.py): carrega as traduções da tabela no cache do processo e
+  visita, em cada idioma, os endpoints JSON (dados do mapa global, facetas
+  e bytes comprimidos) e as páginas da listagem.
+
+Os endpoints JSON são visitados como um visitante anônimo e uma vez por
+codificação aceita pelo CompressionMiddleware. Páginas HTML levam o token
+CSRF do visitante e nunca vão para o cache comprimido: as da listagem são
+visitadas uma vez só, pelos caches que preenchem no caminho (traduções,
+vocabulário e contagens das facetas).
+"""
+import logging
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+from django.utils import translation
+from django.utils.http import urlencode
+
+from . import catalog, metrics
+from .compression import ENCODERS
+from .middleware import compressed_cache_key
+from .models import Mammal, Translation
+from .pagination import encode_cursor
+from .tasks import mark_translated
+from .translation_service import (
+    TRANSLATED_FIELDS, get_translation_cache_key, load_translations, prefill_translations, target_languages,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Resultado de uma requisição de aquecimento
+Visit = namedtuple('Visit', 'url encoding status etag content_encoding')
+
+# Item (espécie ou URL) cujo aquecimento levantou uma exceção
+Failure = namedtuple('Failure', 'item error')
+
+# Chaves por consulta ao medir o preenchimento (get_many) e ids por filtro pk__in
+FILL_BATCH_SIZE = 500
+ID_BATCH_SIZE = 500
+
+
+def _host():
+    """Um host aceito pelo ALLOWED_HOSTS (o Client usa 'testserver')"""
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+    return hosts[0] if hosts else 'localhost'
+
+
+def make_client():
+    from django.test import Client
+
+    return Client(HTTP_HOST=_host())
+
+
+def language_urls(view_name, *args):
+    """A mesma página em cada idioma do site (/pt-br/..., /en/...)"""
+    urls = []
+    for code, name in settings.LANGUAGES:
+        with translation.override(code):
+            urls.append(reverse(view_name, args=args))
+    return urls
+
+
+def visit(client, url, encodings=ENCODERS):
+    """Visita a URL uma vez por codificação"""
+    visits = []
+    for encoding in encodings:
+        response = client.get(url, HTTP_ACCEPT_ENCODING=encoding, secure=True)
+        visits.append(Visit(
+            url, encoding, response.status_code,
+            response.get('ETag', ''), response.get('Content-Encoding', ''),
+        ))
+    return visits
+
+
+# ============================================================================
+# CATÁLOGO INTEIRO
+# ============================================================================
+
+# Endpoints JSON do catálogo (ETag pela versão do catálogo, sem CSRF)
+JSON_VIEWS = ('mammals:global_map_data', 'mammals:facets')
+
+
+def json_urls():
+    """Endpoints JSON do catálogo em cada idioma"""
+    return [url for view_name in JSON_VIEWS for url in language_urls(view_name)]
+
+
+def list_urls():
+    """Todas as páginas da listagem (cursor da ordem padrão da página inicial) em cada idioma"""
+    from .views import INDEX_PAGE_SIZE
+
+    rows = list(Mammal.objects.order_by('common_name', 'id').values_list('common_name', 'pk'))
+    # Cursor de cada página seguinte: a última espécie da anterior (sem uma página vazia no fim)
+    queries = [''] + [
+        '?' + urlencode({'after': encode_cursor(*row)})
+        for row in rows[INDEX_PAGE_SIZE - 1:len(rows) - 1:INDEX_PAGE_SIZE]
+    ]
+    return [url + query for url in language_urls('mammals:index') for query in queries]
+
+
+def _in_threads(func, items, workers):
+    """
+    Divide os itens entre N threads; cada uma fecha as próprias conexões ao terminar
+
+    Uma exceção num item vira um Failure e a thread segue para o próximo.
+
+    Returns:
+        (resultados de func, lista de Failure)
+    """
+    results = [[] for _ in range(workers)]
+    failures = [[] for _ in range(workers)]
+
+    def run(index):
+        try:
+            for item in items[index::workers]:
+                try:
+                    results[index].extend(func(item))
+                except Exception as e:
+                    failures[index].append(Failure(item, e))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=run, args=(index,), daemon=True) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (
+        [result for chunk in results for result in chunk],
+        [failure for chunk in failures for failure in chunk],
+    )
+
+
+def _batches(ids):
+    ids = list(ids)
+    return [ids[start:start + ID_BATCH_SIZE] for start in range(0, len(ids), ID_BATCH_SIZE)]
+
+
+def _translated_rows(mammal_ids):
+    for batch in _batches(mammal_ids):
+        yield from Mammal.objects.filter(pk__in=batch).values_list(*TRANSLATED_FIELDS)
+
+
+def warm_translations(mammal_ids, workers=4):
+    """
+    Traduz os textos das espécies (chamadas à API em paralelo, gravadas na tabela Translation)
+
+    Returns:
+        Lista de Failure (uma por espécie que falhou)
+    """
+    def translate(pk):
+        row = Mammal.objects.filter(pk=pk).values_list(*TRANSLATED_FIELDS).first()
+        if row is not None and prefill_translations(row, raise_errors=True):
+            mark_translated(pk)
+        return []
+
+    return _in_threads(translate, list(mammal_ids), workers)[1]
+
+
+def warm_pages(urls, workers=4, encodings=ENCODERS):
+    """
+    Visita as URLs em N threads (um Client por thread)
+
+    Returns:
+        (lista de Visit, lista de Failure)
+    """
+    local = threading.local()
+
+    def visit_one(url):
+        if not hasattr(local, 'client'):
+            local.client = make_client()
+        return visit(local.client, url, encodings)
+
+    return _in_threads(visit_one, list(urls), workers)
+
+
+def warm_process():
+    """
+    Aquece o cache em memória deste processo: traduções guardadas na tabela,
+    endpoints JSON e páginas da listagem (chamado pelo gunicorn.conf.py)
+
+    Returns:
+        (lista de Visit, lista de Failure)
+    """
+    mammal_ids = list(Mammal.objects.order_by('pk').values_list('pk', flat=True))
+    for language in target_languages():
+        for batch in _batches(mammal_ids):
+            load_translations([text for row in _translated_rows(batch) for text in row], language)
+
+    visits, failures = warm_pages(json_urls(), workers=1)
+    list_visits, list_failures = warm_pages(list_urls(), workers=1, encodings=('gzip',))
+    visits += list_visits
+    failures += list_failures
+    for item in [item for item in visits if item.status >= 400] + failures:
+        logger.warning('Aquecimento falhou: %s', item)
+    # As visitas do aquecimento não entram nas métricas de /metrics
+    metrics.registry.reset()
+    return visits, failures
+
+
+def expected_keys(mammal_ids):
+    """Chaves que o aquecimento preenche, por tipo de cache (exceto as respostas comprimidas)"""
+    languages = target_languages()
+    translations = [
+        get_translation_cache_key(text, 'pt', language)
+        for row in _translated_rows(mammal_ids)
+        for text in row if text and text.strip()
+        for language in languages
+    ]
+    return {
+        'translations': translations,
+        'map': [catalog.map_data_cache_key()],
+    }
+
+
+def page_keys(visits):
+    """Chaves dos bytes comprimidos guardados pelo CompressionMiddleware"""
+    return [
+        compressed_cache_key(item.url, item.encoding, item.etag)
+        for item in visits
+        if item.status == 200 and item.etag and item.content_encoding == item.encoding
+    ]
+
+
+def fill(name, keys):
+    """(presentes, esperadas): as traduções na tabela Translation, o resto no cache"""
+    keys = list(dict.fromkeys(keys))
+    present = 0
+    for start in range(0, len(keys), FILL_BATCH_SIZE):
+        batch = keys[start:start + FILL_BATCH_SIZE]
+        if name == 'translations':
+            present += Translation.objects.filter(key__in=batch).count()
+        else:
+            present += len(cache.get_many(batch))
+    return present, len(keys)
@@ -0,0 +1,92 @@
+// ============================================================================
+// GALERIA DE IMAGENS - CARREGAMENTO PREGUIÇOSO E PAGINADO
+// ============================================================================
+// Uso: <div class="image-gallery" data-gallery-url="/mammal/1/gallery/"
+//           data-load-more-label="Carregar mais"></div>
+// A primeira página só é buscada quando a galeria se aproxima da tela.
+
+(function initGalleries() {
+    'use strict';
+
+    const galleries = document.querySelectorAll('[data-gallery-url]');
+    if (galleries.length === 0) return;
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text || '';
+        return div.innerHTML;
+    }
+
+    function renderImage(image) {
+        const sources = Object.entries(image.sources || {})
+            .map(([fmt, srcset]) => `<source type="image/${fmt}" srcset="${srcset}" sizes="${image.sizes}">`)
+            .join('');
+        const dimensions = image.width ? `width="${image.width}" height="${image.height}"` : '';
+        const placeholder = image.placeholder
+            ? `style="background: ${image.color} url(${image.placeholder}) center / cover no-repeat"`
+            : '';
+        const caption = image.caption ? `<div class="caption">${escapeHtml(image.caption)}</div>` : '';
+
+        return `
+            <figure class="gallery-item">
+                <picture>${sources}<img src="${image.src}" alt="${escapeHtml(image.caption)}"
+                     ${dimensions} ${placeholder} loading="lazy" decoding="async"></picture>
+                ${caption}
+            </figure>
+        `;
+    }
+
+    function loadPage(gallery, page) {
+        const url = `${gallery.dataset.galleryUrl}?page=${page}`;
+        return fetch(url)
+            .then(response => response.json())
+            .then(data => {
+                const button = gallery.querySelector('.gallery-load-more');
+                if (button) button.remove();
+
+                if (page === 1 && data.images.length === 0) {
+                    const section = gallery.closest('[data-gallery-section]');
+                    (section || gallery).style.display = 'none';
+                    return;
+                }
+
+                gallery.insertAdjacentHTML('beforeend', data.images.map(renderImage).join(''));
+
+                if (data.has_next) {
+                    const more = document.createElement('button');
+                    more.type = 'button';
+                    more.className = 'btn-secondary gallery-load-more';
+                    more.textContent = gallery.dataset.loadMoreLabel || '+';
+                    more.addEventListener('click', () => loadPage(gallery, page + 1));
+                    gallery.appendChild(more);
+                }
+            })
+            .catch(error => console.error('Erro ao carregar galeria:', error));
+    }
+
+    // Abrir imagem ampliada (modal dos dossiês, se existir)
+    galleries.forEach(gallery => {
+        gallery.addEventListener('click', (e) => {
+            const img = e.target.closest('img');
+            if (img && typeof window.openImageModal === 'function') {
+                window.openImageModal(img.currentSrc || img.src);
+            }
+        });
+    });
+
+    if (!('IntersectionObserver' in window)) {
+        galleries.forEach(gallery => loadPage(gallery, 1));
+        return;
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                loadPage(entry.target, 1);
+            }
+        });
+    }, { rootMargin: '300px' });
+
+    galleries.forEach(gallery => observer.observe(gallery));
+})();
@@ -44,6 +44,13 @@
         registration.update();
       }, 60 * 60 * 1000);
 
+      // Ao voltar a ficar online, baixar as alterações do catálogo offline
+      window.addEventListener('online', () => {
+        if (navigator.serviceWorker.controller) {
+          navigator.serviceWorker.controller.postMessage({ action: 'syncCatalog' });
+        }
+      });
+
     } catch (error) {
       console.error('[PWA] Falha ao registrar Service Worker:', error);
     }
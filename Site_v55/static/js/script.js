@@ -39,15 +39,50 @@ document.addEventListener("DOMContentLoaded", () => {
                 console.log('Mamíferos carregados:', data.length);
                 if (data.length > 0) {
                     console.log('Exemplo de mamífero:', data[0]);
-                    console.log('Taxonomias únicas:', [...new Set(data.map(m => m.taxonomy_order).filter(t => t))]);
                 }
                 allMammals = data;
                 filteredMammals = data;
+                // A lista completa substitui a paginação renderizada no servidor
+                const serverPagination = document.getElementById('server-pagination');
+                if (serverPagination) {
+                    serverPagination.hidden = true;
+                }
                 displayMammalsWithPagination();
             })
             .catch(error => console.error('Erro ao carregar mamíferos:', error));
     }
 
+    // Contagens dos filtros vindas do servidor (/facets/), sem percorrer o catálogo
+    function loadFacetCounts() {
+        const normalizeStr = (str) => str.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+        fetch('/facets/')
+            .then(response => response.json())
+            .then(data => {
+                filterButtons.forEach((button) => {
+                    const value = normalizeStr(button.dataset.filterValue);
+                    let count;
+                    if (button.dataset.filterType === 'region') {
+                        // Mesmo critério do filtro: o continente contém a região
+                        count = data.continents
+                            .filter(facet => normalizeStr(facet.key).includes(value))
+                            .reduce((total, facet) => total + facet.count, 0);
+                    } else {
+                        const facet = data.orders.find(facet => normalizeStr(facet.key) === value);
+                        count = facet ? facet.count : 0;
+                    }
+
+                    let badge = button.querySelector('.facet-count');
+                    if (!badge) {
+                        badge = document.createElement('span');
+                        badge.className = 'facet-count';
+                        button.append(' ', badge);
+                    }
+                    badge.textContent = `(${count})`;
+                });
+            })
+            .catch(error => console.error('Erro ao carregar contagens dos filtros:', error));
+    }
+
     function performSearch() {
         const query = searchInput ? searchInput.value.trim().toLowerCase() : "";
         
@@ -152,8 +187,10 @@ document.addEventListener("DOMContentLoaded", () => {
                     ${mammal.image_filename ? `
                     <div class="card-image">
                         <img src="/static/images/${mammal.image_filename}" 
+                             ${mammal.image_srcset ? `srcset="${mammal.image_srcset}" sizes="(max-width: 700px) 100vw, 400px"` : ''}
                              alt="${escapeHtml(mammal.common_name)}"
                              loading="lazy"
+                             decoding="async"
                              onerror="this.parentElement.style.display='none'">
                     </div>
                     ` : ''}
@@ -332,6 +369,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
     // Carregar mamíferos ao iniciar
     loadAllMammals();
+    loadFacetCounts();
 });
 
 
@@ -0,0 +1,17 @@
+// Valores de desenvolvimento: o collectstatic sobrescreve este arquivo
+// com as URLs versionadas (ver mammals.storage)
+self.PRECACHE_VERSION = 'dev';
+self.PRECACHE_STATIC_URLS = [
+  '/static/css/style.css',
+  '/static/css/accessibility.css',
+  '/static/css/alerts.css',
+  '/static/css/cookie-consent.css',
+  '/static/css/buttons_fix.css',
+  '/static/css/error-pages.css',
+  '/static/js/script.js',
+  '/static/js/cookie-consent.js',
+  '/static/js/pwa.js',
+  '/static/manifest.json',
+  '/static/images/icons/icon-192x192.png'
+];
+self.PRECACHE_PAGES = ['/', '/offline/'];
@@ -1,35 +1,39 @@
 // Service Worker para PWA - Catálogo de Mamíferos Extintos
-// Versão 49.0.0
-
-const CACHE_NAME = 'extinct-mammals-v49';
-const RUNTIME_CACHE = 'extinct-mammals-runtime-v49';
-
-// Recursos essenciais para cache inicial
-const PRECACHE_URLS = [
-  '/',
-  '/static/css/style.css',
-  '/static/css/alerts.css',
-  '/static/css/cookie-consent.css',
-  '/static/css/buttons_fix.css',
-  '/static/css/error-pages.css',
-  '/static/js/script.js',
-  '/static/js/cookie-consent.js',
-  '/static/manifest.json',
-  '/offline/',
+// A lista de precache e a versão vêm de sw-precache.js, gerado pelo
+// collectstatic a partir dos nomes com hash (ver mammals/storage.py)
+importScripts('/static/sw-precache.js');
+
+const CACHE_PREFIX = 'extinct-mammals-';
+const CACHE_NAME = `${CACHE_PREFIX}precache-${self.PRECACHE_VERSION}`;
+const RUNTIME_CACHE = `${CACHE_PREFIX}runtime`;
+const PAGES_CACHE = `${CACHE_PREFIX}pages`;
+const IMAGE_CACHE = `${CACHE_PREFIX}images`;
+
+// Cache de imagens: LRU com limite de entradas e validade
+const IMAGE_CACHE_MAX_ENTRIES = 200;
+const IMAGE_CACHE_MAX_AGE = 30 * 24 * 60 * 60 * 1000; // 30 dias
+const CACHED_AT_HEADER = 'sw-cached-at';
+
+// Rotas com prefixo de idioma opcional (ex.: /pt-br/mammal/41/)
+const LANG_PREFIX = '(?:/[a-z]{2}(?:-[a-z]{2})?)?';
+const BYPASS_ROUTE = new RegExp(`^${LANG_PREFIX}/(admin|painel|accounts)/`);
+const STALE_WHILE_REVALIDATE_ROUTES = [
+  new RegExp(`^${LANG_PREFIX}/search/$`),
+  new RegExp(`^${LANG_PREFIX}/global-map-data/$`),
+  new RegExp(`^${LANG_PREFIX}/facets/$`),
+  new RegExp(`^${LANG_PREFIX}/mammal/\\d+/(gallery/)?$`),
 ];
+const IMAGE_ROUTE = /^\/(static\/images|media)\/|\.(jpg|jpeg|png|gif|svg|webp|avif|ico)$/;
+
+// Nomes gerados pelo ManifestStaticFilesStorage (ex.: style.3f2a1b9c0d4e.css)
+const HASHED_URL = /\.[0-9a-f]{12}\.\w+$/;
 
 // Instalação do Service Worker
 self.addEventListener('install', (event) => {
-  console.log('[SW] Installing Service Worker v49...');
+  console.log(`[SW] Installing Service Worker ${self.PRECACHE_VERSION}...`);
   
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => {
-        console.log('[SW] Precaching essential resources');
-        return cache.addAll(PRECACHE_URLS.map(url => new Request(url, {
-          cache: 'reload'
-        })));
-      })
+    precache()
       .then(() => {
         console.log('[SW] Installation complete');
         return self.skipWaiting(); // Ativar imediatamente
@@ -40,9 +44,32 @@ self.addEventListener('install', (event) => {
   );
 });
 
+// Pré-carrega os recursos essenciais, baixando apenas o que mudou
+async function precache() {
+  const cache = await caches.open(CACHE_NAME);
+
+  // URLs com hash são imutáveis: reaproveitar as que já estão em cache
+  const missing = [];
+  await Promise.all(self.PRECACHE_STATIC_URLS.map(async (url) => {
+    const cached = HASHED_URL.test(url) && await caches.match(url);
+    if (cached) {
+      await cache.put(url, cached);
+    } else {
+      missing.push(url);
+    }
+  }));
+
+  console.log(`[SW] Precaching ${missing.length} of ${self.PRECACHE_STATIC_URLS.length} resources`);
+
+  // Páginas não têm hash: sempre buscar da rede
+  return cache.addAll(missing.concat(self.PRECACHE_PAGES).map(url => new Request(url, {
+    cache: 'reload'
+  })));
+}
+
 // Ativação do Service Worker
 self.addEventListener('activate', (event) => {
-  console.log('[SW] Activating Service Worker v49...');
+  console.log(`[SW] Activating Service Worker ${self.PRECACHE_VERSION}...`);
   
   event.waitUntil(
     caches.keys()
@@ -51,9 +78,8 @@ self.addEventListener('activate', (event) => {
         return Promise.all(
           cacheNames
             .filter((cacheName) => {
-              return cacheName.startsWith('extinct-mammals-') && 
-                     cacheName !== CACHE_NAME && 
-                     cacheName !== RUNTIME_CACHE;
+              return cacheName.startsWith(CACHE_PREFIX) && 
+                     ![CACHE_NAME, RUNTIME_CACHE, PAGES_CACHE, IMAGE_CACHE].includes(cacheName);
             })
             .map((cacheName) => {
               console.log('[SW] Deleting old cache:', cacheName);
@@ -65,43 +91,146 @@ self.addEventListener('activate', (event) => {
         console.log('[SW] Activation complete');
         return self.clients.claim(); // Assumir controle imediatamente
       })
+      .then(() => syncCatalog())
+      .catch((error) => {
+        console.error('[SW] Catalog sync failed:', error);
+      })
   );
 });
 
-// Estratégia de cache: Network First com fallback para Cache
+// Estratégias de cache por rota
 self.addEventListener('fetch', (event) => {
   const { request } = event;
   const url = new URL(request.url);
   
-  // Ignorar requisições não-GET
+  // Apenas requisições do próprio site
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+
+  // Ignorar requisições não-GET; ações (favoritar, comentar, idioma)
+  // tornam as páginas em cache obsoletas
   if (request.method !== 'GET') {
+    event.waitUntil(caches.delete(PAGES_CACHE));
     return;
   }
   
-  // Ignorar requisições de admin e autenticação
-  if (url.pathname.startsWith('/admin/') || 
-      url.pathname.startsWith('/accounts/login/') ||
-      url.pathname.startsWith('/accounts/logout/') ||
-      url.pathname.startsWith('/accounts/register/')) {
+  // Ignorar requisições de admin e autenticação (login/logout mudam as páginas)
+  if (BYPASS_ROUTE.test(url.pathname)) {
+    event.waitUntil(caches.delete(PAGES_CACHE));
     return;
   }
   
   // Estratégia para diferentes tipos de recursos
-  if (url.pathname.startsWith('/static/')) {
-    // Cache First para arquivos estáticos
-    event.respondWith(cacheFirst(request));
-  } else if (url.pathname.startsWith('/media/')) {
-    // Cache First para imagens
-    event.respondWith(cacheFirst(request));
-  } else if (url.pathname.match(/\.(jpg|jpeg|png|gif|svg|webp|ico)$/)) {
-    // Cache First para imagens
+  if (url.pathname.endsWith('/search/') && !url.search) {
+    // Listagem completa: servida do catálogo offline (IndexedDB)
+    event.respondWith(catalogSearch(request, event));
+  } else if (IMAGE_ROUTE.test(url.pathname)) {
+    // Cache First com LRU e validade para imagens
+    event.respondWith(imageCacheFirst(request, event));
+  } else if (url.pathname.startsWith('/static/')) {
+    // Cache First para arquivos estáticos (nomes com hash)
     event.respondWith(cacheFirst(request));
+  } else if (STALE_WHILE_REVALIDATE_ROUTES.some((route) => route.test(url.pathname))) {
+    // Stale-while-revalidate: resposta imediata do cache, atualização em segundo plano
+    event.respondWith(staleWhileRevalidate(request, event));
   } else {
-    // Network First para páginas HTML e API
+    // Network First para as demais páginas
     event.respondWith(networkFirst(request));
   }
 });
 
+// Resposta de fallback quando não há rede nem cache
+async function offlineResponse() {
+  const offlinePage = await caches.match('/offline/');
+  if (offlinePage) {
+    return offlinePage;
+  }
+  return new Response('Offline - Recurso não disponível', {
+    status: 503,
+    statusText: 'Service Unavailable',
+    headers: new Headers({
+      'Content-Type': 'text/plain'
+    })
+  });
+}
+
+// Estratégia Stale-While-Revalidate
+async function staleWhileRevalidate(request, event) {
+  const cache = await caches.open(PAGES_CACHE);
+  const cached = await cache.match(request);
+
+  // A revalidação usa o ETag do servidor: 304 quando nada mudou
+  const revalidate = fetch(request)
+    .then(async (response) => {
+      const changed = !cached || cached.headers.get('ETag') !== response.headers.get('ETag');
+      if (response.status === 200 && !response.redirected && changed) {
+        await cache.put(request, response.clone());
+        console.log('[SW] Revalidated:', request.url);
+      }
+      return response;
+    });
+
+  if (cached) {
+    event.waitUntil(revalidate.catch((error) => {
+      console.warn('[SW] Revalidation failed:', request.url, error);
+    }));
+    return cached;
+  }
+
+  try {
+    return await revalidate;
+  } catch (error) {
+    console.error('[SW] Network request failed:', error);
+    return offlineResponse();
+  }
+}
+
+// Estratégia Cache First para imagens (LRU com validade)
+async function imageCacheFirst(request, event) {
+  const cache = await caches.open(IMAGE_CACHE);
+  const cached = await cache.match(request);
+  const cachedAt = cached ? Number(cached.headers.get(CACHED_AT_HEADER)) : 0;
+
+  if (cached && Date.now() - cachedAt < IMAGE_CACHE_MAX_AGE) {
+    // Regravar a entrada a move para o fim da fila (mais recente)
+    event.waitUntil(cache.put(request, cached.clone()));
+    return cached;
+  }
+
+  try {
+    const response = await fetch(request);
+    if (response.status === 200) {
+      event.waitUntil(putImage(cache, request, response.clone()));
+    }
+    return response;
+  } catch (error) {
+    // Offline: uma imagem expirada é melhor que nenhuma
+    if (cached) {
+      return cached;
+    }
+    console.error('[SW] Image fetch failed:', error);
+    return offlineResponse();
+  }
+}
+
+async function putImage(cache, request, response) {
+  const headers = new Headers(response.headers);
+  headers.set(CACHED_AT_HEADER, String(Date.now()));
+  await cache.put(request, new Response(await response.blob(), {
+    status: response.status,
+    statusText: response.statusText,
+    headers
+  }));
+
+  // cache.keys() segue a ordem de inserção: as primeiras são as menos usadas
+  const keys = await cache.keys();
+  const excess = keys.length - IMAGE_CACHE_MAX_ENTRIES;
+  for (let i = 0; i < excess; i++) {
+    await cache.delete(keys[i]);
+  }
+}
+
 // Estratégia Cache First
 async function cacheFirst(request) {
   const cache = await caches.open(CACHE_NAME);
@@ -193,6 +322,117 @@ async function networkFirst(request) {
   }
 }
 
+// ============================================================================
+// Catálogo offline: cópia completa em IndexedDB, atualizada por deltas (/sync/)
+// ============================================================================
+const CATALOG_DB = 'extinct-mammals-catalog';
+const CATALOG_DB_VERSION = 1;
+
+let catalogSyncPromise = null;
+
+function promisifyRequest(request) {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function transactionDone(tx) {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+}
+
+function openCatalogDB() {
+  const request = indexedDB.open(CATALOG_DB, CATALOG_DB_VERSION);
+  request.onupgradeneeded = () => {
+    const db = request.result;
+    db.createObjectStore('mammals', { keyPath: 'id' });
+    db.createObjectStore('meta');
+  };
+  return promisifyRequest(request).then((db) => {
+    // Permite que clearCache apague o banco mesmo com conexões abertas
+    db.onversionchange = () => db.close();
+    return db;
+  });
+}
+
+// Baixa apenas as alterações desde a última versão sincronizada
+function syncCatalog() {
+  if (catalogSyncPromise) {
+    return catalogSyncPromise;
+  }
+
+  catalogSyncPromise = (async () => {
+    const db = await openCatalogDB();
+    const since = (await promisifyRequest(
+      db.transaction('meta').objectStore('meta').get('version')
+    )) || 0;
+
+    const response = await fetch(`/sync/?since=${since}`, { cache: 'no-store' });
+    if (!response.ok) {
+      throw new Error(`Sync failed with status ${response.status}`);
+    }
+    const data = await response.json();
+
+    const tx = db.transaction(['mammals', 'meta'], 'readwrite');
+    const store = tx.objectStore('mammals');
+    if (data.full) {
+      store.clear();
+    }
+    data.deleted.forEach((id) => store.delete(id));
+    data.rows.forEach((row) => {
+      store.put(Object.fromEntries(data.fields.map((field, i) => [field, row[i]])));
+    });
+    tx.objectStore('meta').put(data.version, 'version');
+    await transactionDone(tx);
+
+    console.log(`[SW] Catalog synced: v${since} -> v${data.version} ` +
+                `(${data.rows.length} changed, ${data.deleted.length} deleted)`);
+    return data.version;
+  })().finally(() => {
+    catalogSyncPromise = null;
+  });
+
+  return catalogSyncPromise;
+}
+
+async function readCatalog() {
+  const db = await openCatalogDB();
+  const mammals = await promisifyRequest(db.transaction('mammals').objectStore('mammals').getAll());
+  // Mesma ordem de /search/ (Mammal.Meta.ordering)
+  return mammals.sort((a, b) => (a.common_name < b.common_name ? -1 : a.common_name > b.common_name ? 1 : 0));
+}
+
+// /search/ sem filtros: responde do IndexedDB e sincroniza os deltas em segundo plano
+async function catalogSearch(request, event) {
+  const sync = syncCatalog().catch((error) => {
+    console.error('[SW] Catalog sync failed:', error);
+  });
+
+  try {
+    let mammals = await readCatalog();
+    if (mammals.length === 0) {
+      // Primeiro acesso: aguardar a cópia completa
+      await sync;
+      mammals = await readCatalog();
+    } else {
+      event.waitUntil(sync);
+    }
+    if (mammals.length > 0) {
+      return new Response(JSON.stringify(mammals), {
+        headers: { 'Content-Type': 'application/json' }
+      });
+    }
+  } catch (error) {
+    console.error('[SW] Catalog read failed:', error);
+  }
+
+  return networkFirst(request);
+}
+
 // Sincronização em background
 self.addEventListener('sync', (event) => {
   console.log('[SW] Background sync:', event.tag);
@@ -200,6 +440,10 @@ self.addEventListener('sync', (event) => {
   if (event.tag === 'sync-favorites') {
     event.waitUntil(syncFavorites());
   }
+
+  if (event.tag === 'sync-catalog') {
+    event.waitUntil(syncCatalog());
+  }
 });
 
 async function syncFavorites() {
@@ -249,15 +493,20 @@ self.addEventListener('message', (event) => {
     self.skipWaiting();
   }
   
+  if (event.data.action === 'syncCatalog') {
+    event.waitUntil(syncCatalog());
+  }
+
   if (event.data.action === 'clearCache') {
     event.waitUntil(
       caches.keys().then((cacheNames) => {
         return Promise.all(
           cacheNames.map((cacheName) => caches.delete(cacheName))
+            .concat(promisifyRequest(indexedDB.deleteDatabase(CATALOG_DB)))
         );
       })
     );
   }
 });
 
-console.log('[SW] Service Worker v49 loaded');
+console.log(`[SW] Service Worker ${self.PRECACHE_VERSION} loaded`);
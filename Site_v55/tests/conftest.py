@@ -3,9 +3,17 @@ Configurações e fixtures compartilhadas para todos os testes
 """
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from accounts.models import UserProfile
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cache limpo a cada teste (o banco é revertido, o cache não)"""
+    cache.clear()
+    yield
+
+
 @pytest.fixture
 def create_user(db):
     """Fixture para criar usuários de teste"""
@@ -5,13 +5,23 @@ Testa o sistema de autenticação:
 - Registro de novo usuário
 - Login com credenciais corretas
 - Login com senha errada
+- Verificação de administrador sem consultas extras (request.is_site_admin)
+- Perfil criado só no cadastro, com fallback e backfill para contas antigas
+- Sessões em cache (cached_db) e idioma em cookie
 """
 
 import pytest
 from django.test import Client
 from django.urls import reverse
 from django.contrib.auth.models import User
-from accounts.models import UserProfile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from accounts.backends import ProfileModelBackend
+from django.conf import settings
+from django.utils import translation
+from django.core.management import call_command
+from accounts.models import UserProfile, get_profile
+from mammals.models import Comment, Mammal
 
 
 @pytest.mark.django_db
@@ -269,3 +279,110 @@ class TestAuthenticationEdgeCases:
         # Deve redirecionar para index
         assert response.redirect_chain[-1][0] == reverse('mammals:index')
 
+
+
+@pytest.mark.django_db
+class TestSiteAdminCheck:
+    """Testes para o perfil carregado junto com o usuário"""
+
+    def profile_queries(self, call):
+        """SELECTs que leem accounts_userprofile sozinhos (sem o JOIN com auth_user)"""
+        with CaptureQueriesContext(connection) as queries:
+            response = call()
+        return response, [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith('SELECT') and 'accounts_userprofile' in q['sql'] and 'auth_user' not in q['sql']
+        ]
+
+    def test_admin_views_do_not_query_profile(self, admin_client, admin_user):
+        """admin_required usa o perfil carregado com o usuário (uma consulta)"""
+        with CaptureQueriesContext(connection) as queries:
+            ProfileModelBackend().get_user(admin_user.pk)
+        assert len(queries) == 1
+
+        url = reverse('mammals:admin_users')
+        response, profile_queries = self.profile_queries(lambda: admin_client.get(url))
+        assert response.status_code == 200
+        assert profile_queries == []
+
+    def test_comment_permission_without_profile_query(self, admin_client, regular_user):
+        """O admin apaga comentários de outros sem consulta extra de permissão"""
+        mammal = Mammal.objects.create(common_name="Tilacino")
+        comment = Comment.objects.create(mammal=mammal, user=regular_user, content="Triste.")
+
+        url = reverse('mammals:delete_comment', args=[comment.pk])
+        response, profile_queries = self.profile_queries(lambda: admin_client.post(url))
+        assert response.status_code == 302
+        assert profile_queries == []
+        assert not Comment.objects.filter(pk=comment.pk).exists()
+
+    def test_sessions_from_model_backend_stay_valid(self, client, regular_user):
+        """Sessões abertas com o ModelBackend (antes do deploy) continuam autenticadas"""
+        client.force_login(regular_user, backend='django.contrib.auth.backends.ModelBackend')
+        request = client.get(reverse('mammals:index')).wsgi_request
+        assert request.user == regular_user
+
+    def test_user_without_profile_is_not_admin(self, client):
+        """Usuários antigos sem perfil continuam sendo barrados nas páginas admin"""
+        user = User.objects.create_user(username='antigo', password='pass123')
+        UserProfile.objects.filter(user=user).delete()
+        client.login(username='antigo', password='pass123')
+
+        request = client.get(reverse('mammals:index')).wsgi_request
+        assert not request.is_site_admin
+
+
+@pytest.mark.django_db
+class TestProfileLifecycle:
+    """Testes para a criação do UserProfile"""
+
+    def test_login_does_not_touch_profiles(self, client, regular_user):
+        """O login (que salva last_login) não consulta nem grava perfis"""
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse('accounts:login'), {'username': 'regular', 'password': 'pass123'})
+        assert response.status_code == 302
+        assert not [q for q in queries.captured_queries if 'accounts_userprofile' in q['sql']]
+
+    def test_legacy_users_get_profiles_lazily_or_in_bulk(self):
+        """Contas sem perfil: get_profile cria na hora e backfill_profiles cria em lote"""
+        users = [User.objects.create_user(username=f'antigo{i}', password='pass123') for i in range(5)]
+        UserProfile.objects.filter(user__in=users).delete()
+
+        legacy = User.objects.get(pk=users[0].pk)
+        assert get_profile(legacy).is_admin is False
+        assert UserProfile.objects.filter(user__in=users).count() == 1
+
+        call_command('backfill_profiles', batch_size=2)
+        assert UserProfile.objects.filter(user__in=users).count() == 5
+        call_command('backfill_profiles')
+        assert UserProfile.objects.count() == User.objects.count()
+
+
+@pytest.mark.django_db
+class TestSessions:
+    """Testes para o uso da tabela de sessões"""
+
+    def session_queries(self, queries):
+        return [q['sql'] for q in queries.captured_queries if 'django_session' in q['sql']]
+
+    def test_anonymous_browsing_and_logout_skip_session_table(self, client):
+        """Visitantes não criam sessões; o logout guarda o idioma em cookie"""
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse('mammals:index'))
+            client.get(reverse('mammals:search'))
+            # override restaura o idioma da thread depois da requisição em /en/
+            with translation.override('en'):
+                response = client.get(reverse('accounts:logout'))
+
+        assert self.session_queries(queries) == []
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == 'en'
+
+    def test_authenticated_requests_read_session_from_cache(self, client, regular_user):
+        """Depois do login, a sessão vem do cache e não do banco"""
+        response = client.post(reverse('accounts:login'), {'username': 'regular', 'password': 'pass123'})
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == 'pt-br'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('mammals:favorites'))
+        assert response.status_code == 200
+        assert self.session_queries(queries) == []
@@ -0,0 +1,91 @@
+"""
+Testes da Compressão de Respostas - test_compression.py
+
+Testa o CompressionMiddleware:
+- Negociação do Accept-Encoding
+- gzip de respostas JSON com ETag (bytes comprimidos em cache)
+- Páginas com token CSRF nunca vêm do cache de outro visitante
+- Corpos pequenos não são comprimidos
+"""
+
+import gzip
+import re
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from mammals import compression
+from mammals.models import Mammal
+
+
+class TestNegotiation:
+    """Testes para a escolha da codificação"""
+
+    def test_prefers_best_available_encoding(self):
+        """Escolhe a primeira codificação disponível aceita pelo cliente"""
+        assert compression.negotiate('gzip, deflate') == 'gzip'
+        assert compression.negotiate('identity') is None
+        assert compression.negotiate('gzip;q=0, br;q=0') is None
+        assert compression.negotiate('br, zstd, gzip', ['gzip']) == 'gzip'
+        assert compression.negotiate('br, gzip') == next(
+            name for name in compression.ENCODERS if name in ('br', 'gzip')
+        )
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """Testes para a compressão das respostas dinâmicas"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        cache.clear()
+        for index in range(20):
+            Mammal.objects.create(
+                common_name=f"Espécie {index}",
+                binomial_name=f"Genus species{index}",
+                description="Mamífero extinto descrito no século XIX. " * 5
+            )
+
+    def test_json_is_gzipped_once_per_etag(self):
+        """A segunda requisição com o mesmo ETag reutiliza os bytes em cache"""
+        url = reverse('mammals:search')
+        with mock.patch.object(compression, 'compress', wraps=compression.compress) as compress:
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        assert first['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in first['Vary']
+        assert first['ETag'].startswith('W/')
+        assert compress.call_count == 1
+        assert second.content == first.content
+        assert len(gzip.decompress(first.content)) > len(first.content)
+
+        # O ETag fraco continua válido para revalidação (304)
+        revalidated = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        assert revalidated.status_code == 304
+
+    def test_csrf_token_is_not_shared_between_visitors(self):
+        """O token CSRF servido ao segundo visitante é o dele (POST aceito)"""
+        url = reverse('mammals:detail', args=[Mammal.objects.first().pk])
+        first, second = Client(enforce_csrf_checks=True), Client(enforce_csrf_checks=True)
+        for client in (first, second):
+            response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            assert response['Content-Encoding'] == 'gzip'
+
+        html = gzip.decompress(response.content).decode()
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', html)[1]
+        response = second.post(reverse('set_language'), {'language': 'en', 'csrfmiddlewaretoken': token})
+        assert response.status_code == 302
+
+    def test_small_and_unaccepted_responses_are_untouched(self):
+        """Sem Accept-Encoding ou com corpo pequeno, a resposta segue como está"""
+        url = reverse('mammals:search')
+        assert not self.client.get(url).has_header('Content-Encoding')
+
+        small = self.client.get(url, {'q': 'inexistente'}, HTTP_ACCEPT_ENCODING='gzip')
+        assert small.content == b'[]'
+        assert not small.has_header('Content-Encoding')
@@ -6,14 +6,20 @@ Testa operações de banco de dados:
 - Listar todos os mamíferos
 - Queries complexas
 - Integridade de dados
+- Filtros por chaves normalizadas e vocabulário (FacetTerm)
+- Contagens materializadas por faceta (FacetCount)
+- Catálogo sintético (generate_fake_catalog)
 """
 
 import pytest
 from django.test import Client
 from django.contrib.auth.models import User
-from mammals.models import Mammal, Comment, Favorite
+from mammals.models import Mammal, Comment, Favorite, FacetTerm, Rating
 from accounts.models import UserProfile
 from django.db.models import Count
+from django.core.management import call_command
+from django.urls import reverse
+from mammals import catalog, facets, synthetic
 
 
 @pytest.mark.django_db
@@ -297,3 +303,82 @@ class TestDatabaseQueries:
         assert not Comment.objects.filter(user_id=user_id).exists()
         assert not Favorite.objects.filter(user_id=user_id).exists()
 
+
+@pytest.mark.django_db
+class TestFacetFilters:
+    """Testes para os filtros de continente e ordem"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = Client()
+        Mammal.objects.create(common_name="Tilacino", description="-", continent="Oceania ", taxonomy_order="Dasyuromorphia")
+        Mammal.objects.create(common_name="Rato", description="-", continent="OCEANIA", taxonomy_order="Rodentia")
+        Mammal.objects.create(common_name="Quagga", description="-", continent="África", taxonomy_order="Perissodactyla")
+
+    def test_filters_use_normalized_keys(self):
+        """Filtro ignora maiúsculas/espaços e compara por igualdade na chave indexada"""
+        response = self.client.get('/search/', {'region': 'oceania'}, follow=True)
+        assert sorted(m['common_name'] for m in response.json()) == ['Rato', 'Tilacino']
+
+        response = self.client.get('/search/', {'taxonomy': 'RODENTIA'}, follow=True)
+        assert [m['common_name'] for m in response.json()] == ['Rato']
+
+        sql = str(Mammal.objects.filter(continent_key='oceania').query)
+        assert 'UPPER(' not in sql
+
+    def test_vocabulary_keeps_first_spelling(self):
+        """Uma entrada por termo normalizado, com a primeira grafia como rótulo"""
+        continents = FacetTerm.objects.filter(kind=FacetTerm.CONTINENT)
+        assert list(continents.values_list('key', 'label')) == [('oceania', 'Oceania'), ('áfrica', 'África')]
+        assert FacetTerm.objects.filter(kind=FacetTerm.ORDER).count() == 3
+
+    def test_facet_counts_follow_saves_and_deletes(self):
+        """Contagens ajustadas a cada save/delete e iguais a um recálculo completo"""
+        data = self.client.get(reverse('mammals:facets')).json()
+        assert {c['key']: c['count'] for c in data['continents']} == {'oceania': 2, 'áfrica': 1}
+        assert ['oceania', 'rodentia', 1] in data['pairs']
+
+        rato = Mammal.objects.get(common_name="Rato")
+        rato.continent = "Ásia"
+        rato.save()
+        Mammal.objects.get(common_name="Quagga").delete()
+
+        data = self.client.get(reverse('mammals:facets')).json()
+        assert {c['key']: c['count'] for c in data['continents']} == {'oceania': 1, 'ásia': 1}
+        assert {o['label']: o['count'] for o in data['orders']} == {'Dasyuromorphia': 1, 'Rodentia': 1}
+
+        incremental = data
+        facets.rebuild_counts()
+        assert facets.facet_counts() == incremental
+
+
+@pytest.mark.django_db
+class TestGenerateFakeCatalog:
+    """Testes para o gerador de dados sintéticos"""
+
+    def test_command_creates_rows_and_derived_state(self, tmp_path):
+        """Linhas em lote com chaves de faceta, total e contagens como os signals fariam"""
+        coordinates_file = tmp_path / 'coords.json'
+        call_command(
+            'generate_fake_catalog', mammals=40, users=5, comments=60,
+            favorites=30, ratings=25, batch_size=7, coordinates_file=str(coordinates_file),
+        )
+
+        assert Mammal.objects.count() == 40
+        assert User.objects.filter(username__startswith=synthetic.USERNAME_PREFIX).count() == 5
+        assert UserProfile.objects.count() == 5
+        assert (Comment.objects.count(), Favorite.objects.count(), Rating.objects.count()) == (60, 30, 25)
+        assert not Mammal.objects.filter(continent_key='').exists()
+        assert catalog.mammal_count() == 40
+        assert sum(item['count'] for item in facets.facet_counts()['continents']) == 40
+        assert coordinates_file.exists()
+
+    def test_same_seed_same_data(self):
+        """A mesma semente gera os mesmos dados"""
+        synthetic.generate_catalog(mammals=15, seed=42)
+        first = list(Mammal.objects.order_by('pk').values_list('common_name', 'description', 'continent'))
+        Mammal.objects.all().delete()
+
+        synthetic.generate_catalog(mammals=15, seed=42)
+        second = list(Mammal.objects.order_by('pk').values_list('common_name', 'description', 'continent'))
+        assert first == second
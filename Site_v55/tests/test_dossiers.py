@@ -0,0 +1,149 @@
+"""
+Testes dos Dossiês Científicos - test_dossiers.py
+
+Testa o registro de dossiês baseado em dados:
+- Detalhe de espécie com dossiê usa o template compartilhado
+- Fallback de idioma e espécies sem dossiê
+- Cache por seção (invalidado ao editar a seção)
+- HTML gerado ao salvar, sem executar o corpo como template
+- Comando load_dossiers (idempotente)
+"""
+
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from mammals.models import Dossier, DossierSection, Mammal
+
+
+@pytest.mark.django_db
+class TestDossier:
+    """Testes para a página de dossiê"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        cache.clear()
+        self.mammal = Mammal.objects.create(
+            common_name="Argentinean Warrah",
+            binomial_name="Dusicyon avus",
+            description="Canídeo extinto da América do Sul."
+        )
+        self.dossier = Dossier.objects.create(
+            mammal=self.mammal,
+            title="Argentinean Warrah",
+            subtitle="Dusicyon avus Burmeister, 1866",
+            map_points=[{'location': 'Pampas', 'lat': -34.6, 'lon': -58.4}]
+        )
+        self.section = DossierSection.objects.create(
+            dossier=self.dossier,
+            anchor='taxonomia',
+            nav_label='Taxonomia',
+            title='1. Taxonomia',
+            body="<p>Descrito em 1866.</p><img src=\"{% static 'images/nesophontes_hypomicrus/Reconstrucao_artistica.jpeg' %}\">",
+            position=1
+        )
+
+    def test_detail_renders_dossier(self):
+        """Espécie com dossiê usa o template compartilhado, sem checar pk"""
+        response = self.client.get(reverse('mammals:detail', args=[self.mammal.pk]))
+
+        assert response.status_code == 200
+        assert 'mammals/dossier.html' in [t.name for t in response.templates]
+        content = response.content.decode()
+        assert '<h2 id="taxonomia">1. Taxonomia</h2>' in content
+        assert '<a href="#taxonomia">Taxonomia</a>' in content
+        assert 'src="/static/images/nesophontes_hypomicrus/Reconstrucao_artistica.' in content
+        assert 'dossier-map-points' in content
+
+    def test_section_body_is_not_a_template(self):
+        """Só {% static %} é resolvido; outras tags do corpo não são executadas"""
+        self.section.body = "<p>{{ request.user }} {% now 'Y' %}</p><img src=\"{% static 'img/a.png' %}\">"
+        self.section.save()
+
+        assert self.section.html == "<p>{{ request.user }} {% now 'Y' %}</p><img src=\"/static/img/a.png\">"
+        content = self.client.get(reverse('mammals:detail', args=[self.mammal.pk])).content.decode()
+        assert "{% now 'Y' %}" in content
+
+    def test_mammal_without_dossier_uses_detail(self):
+        """Espécie sem dossiê continua na página de detalhes comum"""
+        other = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            description="Marsupial extinto."
+        )
+        response = self.client.get(reverse('mammals:detail', args=[other.pk]))
+        assert 'mammals/detail.html' in [t.name for t in response.templates]
+
+    def test_language_falls_back_to_portuguese(self):
+        """Sem dossiê no idioma pedido, usa o dossiê em português"""
+        from mammals.views import get_dossier
+
+        assert get_dossier(self.mammal.pk, 'en') == self.dossier
+        english = Dossier.objects.create(mammal=self.mammal, language='en', title="Warrah")
+        assert get_dossier(self.mammal.pk, 'en') == english
+        assert get_dossier(self.mammal.pk, 'pt-br') == self.dossier
+
+    def test_section_fragment_is_cached_until_edited(self):
+        """O HTML da seção vem do cache até a seção ser salva novamente"""
+        url = reverse('mammals:detail', args=[self.mammal.pk])
+        self.client.get(url)
+
+        # Alteração sem save() (mesmo updated_at): fragmento em cache
+        DossierSection.objects.filter(pk=self.section.pk).update(body='<p>Alterado</p>')
+        assert 'Descrito em 1866' in self.client.get(url).content.decode()
+
+        self.section.refresh_from_db()
+        self.section.save()
+        assert 'Alterado' in self.client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+class TestLoadDossiers:
+    """Testes para o comando load_dossiers"""
+
+    def test_load_is_idempotent(self, tmp_path):
+        """Reimportar sem mudanças não regrava seções"""
+        mammal = Mammal.objects.create(
+            common_name="Nesofonte de Atalaye",
+            binomial_name="Nesophontes hypomicrus",
+            description="Insetívoro extinto."
+        )
+        source = tmp_path / 'dossiers.json'
+        source.write_text(json.dumps({'dossiers': [{
+            'binomial_name': 'nesophontes hypomicrus',
+            'language': 'pt',
+            'title': 'Nesofonte de Atalaye',
+            'sections': [
+                {'anchor': 'introducao', 'nav_label': 'Introdução', 'title': '1. INTRODUÇÃO', 'body': '<p>a</p>'},
+                {'anchor': 'extincao', 'title': '2. EXTINÇÃO', 'body': '<p>b</p>'},
+            ],
+        }]}), encoding='utf-8')
+
+        call_command('load_dossiers', file=str(source), stdout=io.StringIO())
+        dossier = mammal.dossiers.get()
+        assert list(dossier.sections.values_list('anchor', 'nav_label')) == [
+            ('introducao', 'Introdução'),
+            ('extincao', '2. EXTINÇÃO'),
+        ]
+
+        stamps = list(dossier.sections.values_list('updated_at', flat=True))
+        out = io.StringIO()
+        call_command('load_dossiers', file=str(source), stdout=out)
+        assert '0 seções alteradas' in out.getvalue()
+        assert list(dossier.sections.values_list('updated_at', flat=True)) == stamps
+
+    def test_shipped_dossiers_file_is_valid(self):
+        """dossiers.json do projeto tem seções com âncoras únicas"""
+        from django.conf import settings
+
+        with open(settings.BASE_DIR / 'dossiers.json', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['dossiers']
+        for item in data['dossiers']:
+            anchors = [section['anchor'] for section in item['sections']]
+            assert len(anchors) == len(set(anchors))
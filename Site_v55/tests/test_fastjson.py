@@ -0,0 +1,76 @@
+"""
+Testes da Serialização JSON - test_fastjson.py
+
+Testa o helper mammals.fastjson:
+- orjson e a biblioteca padrão produzem o mesmo JSON
+- Endpoints da API continuam com o mesmo formato
+- Descrição cortada no SQL (sem transferir o texto completo)
+"""
+
+import datetime
+import json
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from mammals import catalog, fastjson
+from mammals.models import Mammal
+
+
+class TestFastJson:
+    """Testes para dumps() e FastJsonResponse"""
+
+    def test_backends_agree_on_django_types(self):
+        """Com ou sem orjson, tipos do Django são convertidos igual ao JsonResponse"""
+        data = {
+            'name': gettext_lazy('Gallery'),
+            'when': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+            'value': Decimal('1.50'),
+            'rows': fastjson.records(('id', 'nome'), [(1, 'Tilacino'), (2, 'Quagga')]),
+        }
+        fast = json.loads(fastjson.dumps(data))
+        with mock.patch.object(fastjson, 'orjson', None):
+            stdlib = json.loads(fastjson.dumps(data))
+
+        assert fast == stdlib
+        assert fast['when'] == '2024-05-01T12:30:15.123'
+        assert fast['rows'][1] == {'id': 2, 'nome': 'Quagga'}
+
+
+@pytest.mark.django_db
+class TestJsonEndpoints:
+    """Testes para os endpoints servidos pelo FastJsonResponse"""
+
+    def test_search_rows_match_catalog_format(self, client):
+        """A busca devolve as mesmas colunas do catálogo offline"""
+        Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            description="Marsupial carnívoro. " * 20
+        )
+        response = client.get(reverse('mammals:search'))
+
+        assert response['Content-Type'] == 'application/json'
+        [row] = response.json()
+        assert tuple(row) == catalog.SYNC_FIELDS
+        assert row['common_name'] == "Tilacino"
+        assert row['description'].endswith('...')
+
+    def test_description_is_truncated_in_sql(self, client):
+        """Uma consulta, com SUBSTR; reticências só acima do limite"""
+        Mammal.objects.create(common_name="Exato", description="a" * catalog.DESCRIPTION_LENGTH)
+        Mammal.objects.create(common_name="Longo", description="b" * 5000)
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = client.get(reverse('mammals:search')).json()
+
+        [sql] = [q['sql'] for q in queries.captured_queries if 'mammals_mammal' in q['sql']]
+        assert 'SUBSTR' in sql.upper()
+        descriptions = {row['common_name']: row['description'] for row in rows}
+        assert descriptions['Exato'] == "a" * catalog.DESCRIPTION_LENGTH
+        assert descriptions['Longo'] == "b" * catalog.DESCRIPTION_LENGTH + '...'
@@ -0,0 +1,266 @@
+"""
+Testes do Pipeline de Imagens - test_images.py
+
+Testa a geração de variantes responsivas:
+- Comando build_images (incremental, por hash de conteúdo)
+- Metadados do manifesto (dimensões, cor dominante, placeholder)
+- Template tag responsive_image
+- Comando index_images (duplicatas, órfãs e asset canônico)
+- Galerias (MammalImage) e endpoint paginado
+"""
+
+import io
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from mammals import facets, images
+from mammals.models import Mammal, MammalImage
+
+
+@pytest.fixture
+def image_root(tmp_path, settings):
+    """Cria uma árvore static/images temporária com uma imagem de teste"""
+    settings.BASE_DIR = tmp_path
+    settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    images_dir = tmp_path / 'static' / 'images'
+    images_dir.mkdir(parents=True)
+    Image.new('RGB', (800, 400), (120, 80, 40)).save(images_dir / 'Tilacino.jpg')
+    images.reset_manifest()
+    yield images_dir
+    images.reset_manifest()
+
+
+class TestBuildImages:
+    """Testes para o comando build_images"""
+
+    def test_generates_variants_without_upscaling(self, image_root):
+        """Gera 320/640 e a largura original, nunca acima dela"""
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+
+        asset = images.get_asset('Tilacino.jpg')
+        assert asset['width'] == 800
+        assert asset['height'] == 400
+        widths = [width for width, _ in asset['variants']['webp']]
+        assert widths == [320, 640, 800]
+        for _, path in asset['variants']['webp']:
+            assert (image_root.parent / path).exists()
+
+    def test_incremental_build_skips_unchanged(self, image_root):
+        """Segunda execução não reprocessa imagens já presentes no manifesto"""
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+        variant = image_root / 'variants' / os.listdir(image_root / 'variants')[0]
+        mtime = variant.stat().st_mtime_ns
+
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+        assert variant.stat().st_mtime_ns == mtime
+
+    def test_template_tag_emits_srcset(self, image_root):
+        """A tag emite <picture> com srcset quando há variantes"""
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+        images.reset_manifest()
+
+        html = Template(
+            "{% load image_tags %}{% responsive_image 'Tilacino.jpg' alt='Tilacino' %}"
+        ).render(Context())
+        assert '<picture>' in html
+        assert 'type="image/webp"' in html
+        assert '320w' in html and '640w' in html
+
+    def test_manifest_records_metadata(self, image_root):
+        """O manifesto registra tamanho, cor dominante e placeholder"""
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+
+        asset = images.get_asset('Tilacino.jpg')
+        assert asset['bytes'] == (image_root / 'Tilacino.jpg').stat().st_size
+        # JPEG altera levemente a cor original (120, 80, 40)
+        color = bytes.fromhex(asset['color'][1:])
+        assert all(abs(a - b) <= 3 for a, b in zip(color, (120, 80, 40)))
+        assert asset['placeholder'].startswith('data:image/webp;base64,')
+        assert len(asset['placeholder']) < 1000
+
+    def test_template_tag_emits_dimensions_and_placeholder(self, image_root):
+        """A tag emite width/height e o placeholder como fundo do <img>"""
+        call_command('build_images', workers=1, stdout=open(os.devnull, 'w'))
+
+        html = Template(
+            "{% load image_tags %}{% responsive_image 'Tilacino.jpg' alt='Tilacino' %}"
+        ).render(Context())
+        assert 'width="800" height="400"' in html
+        assert 'url(data:image/webp;base64,' in html
+        assert f"background: {images.get_asset('Tilacino.jpg')['color']}" in html
+
+    def test_template_tag_falls_back_to_original(self, image_root):
+        """Sem manifesto, a tag emite um <img> para o arquivo original"""
+        html = Template(
+            "{% load image_tags %}{% responsive_image 'Tilacino.jpg' alt='Tilacino' %}"
+        ).render(Context())
+        assert '<picture>' not in html
+        assert 'src="/static/images/Tilacino.jpg"' in html
+
+
+@pytest.mark.django_db
+class TestIndexImages:
+    """Testes para o comando index_images e Mammal.image_asset"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, image_root):
+        """Adiciona uma cópia da imagem em outro formato e uma imagem órfã"""
+        self.image_root = image_root
+        Image.new('RGB', (400, 200), (120, 80, 40)).save(image_root / 'tilacino.webp')
+        gradient = Image.linear_gradient('L').rotate(-90).convert('RGB')
+        gradient.save(image_root / 'Sobra.png')
+
+    def test_save_resolves_case_and_extension(self):
+        """Salvar uma espécie resolve o arquivo real ignorando caixa/extensão"""
+        mammal = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            image_filename="TILACINO.png"
+        )
+        assert mammal.image_asset in ('Tilacino.jpg', 'tilacino.webp')
+
+    def test_save_keeps_canonical_asset(self, monkeypatch):
+        """Salvar sem mudar image_filename mantém o asset; a pasta é lida uma vez"""
+        walks = []
+        iter_source_images = images.iter_source_images
+        monkeypatch.setattr(images, 'iter_source_images', lambda: walks.append(1) or iter_source_images())
+        mammal = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            image_filename="TILACINO.png"
+        )
+        # Asset canônico escolhido pelo index_images entre as duplicatas
+        Mammal.objects.filter(pk=mammal.pk).update(image_asset='Sobra.png')
+        mammal.refresh_from_db()
+        mammal.habitat = "Tasmânia"
+        mammal.save()
+        assert mammal.image_asset == 'Sobra.png'
+
+        mammal.image_filename = "tilacino.webp"
+        mammal.save()
+        assert mammal.image_asset == 'tilacino.webp'
+        assert len(walks) == 1
+
+    def test_save_compares_with_loaded_values(self):
+        """Os valores anteriores vêm da instância carregada: sem SELECT antes do UPDATE"""
+        Mammal.objects.create(common_name="Tilacino", image_filename="TILACINO.png", continent="Oceania")
+        mammal = Mammal.objects.get()
+        mammal.continent = "Ásia"
+        with CaptureQueriesContext(connection) as queries:
+            mammal.save()
+
+        selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'FROM "mammals_mammal"' in q['sql']]
+        assert selects == []
+        assert Mammal.objects.get().continent_key == 'ásia'
+        counts = {item['key']: item['count'] for item in facets.facet_counts()['continents']}
+        assert counts.get('oceania', 0) == 0 and counts['ásia'] == 1
+
+    def test_missing_file_has_no_asset(self):
+        """Arquivo inexistente resulta em image_asset vazio (sem 404)"""
+        mammal = Mammal.objects.create(
+            common_name="Fantasma",
+            binomial_name="Nullus nullus",
+            image_filename="nao_existe.jpg"
+        )
+        assert mammal.image_asset == ''
+
+    def test_index_reports_duplicates_and_orphans(self):
+        """Duplicatas apontam para o asset canônico e órfãs são relatadas"""
+        mammal = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            image_filename="tilacino.webp"
+        )
+        out = io.StringIO()
+        call_command('index_images', workers=1, stdout=out)
+        output = out.getvalue()
+
+        assert '1 grupos de duplicatas' in output
+        assert 'Sobra.png' in output.split('imagens órfãs')[1]
+        mammal.refresh_from_db()
+        # A cópia referenciada é mantida como canônica
+        assert mammal.image_asset == 'tilacino.webp'
+
+    def test_dry_run_does_not_write(self):
+        """--dry-run não altera o banco"""
+        mammal = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            image_filename="Tilacino.jpg"
+        )
+        Mammal.objects.filter(pk=mammal.pk).update(image_asset='')
+        call_command('index_images', workers=1, dry_run=True, stdout=io.StringIO())
+
+        mammal.refresh_from_db()
+        assert mammal.image_asset == ''
+
+
+@pytest.mark.django_db
+class TestMammalGallery:
+    """Testes para a galeria de imagens de cada mamífero"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, image_root):
+        self.mammal = Mammal.objects.create(
+            common_name="Lobo-das-malvinas",
+            binomial_name="Dusicyon australis",
+            image_filename="Tilacino.jpg"
+        )
+
+    def test_gallery_is_paginated(self, client):
+        """Endpoint retorna uma página por vez e indica se há próxima"""
+        MammalImage.objects.bulk_create([
+            MammalImage(mammal=self.mammal, image_asset=f'foto_{i}.jpg', position=i)
+            for i in range(8)
+        ])
+        url = reverse('mammals:gallery', args=[self.mammal.pk])
+
+        data = client.get(url).json()
+        assert data['has_next'] is True
+        assert len(data['images']) == 6
+        assert data['images'][0]['src'].endswith('/static/images/foto_0.jpg')
+
+        data = client.get(url, {'page': 2}).json()
+        assert data['has_next'] is False
+        assert len(data['images']) == 2
+
+    def test_empty_gallery(self, client):
+        """Mamífero sem galeria retorna lista vazia"""
+        data = client.get(reverse('mammals:gallery', args=[self.mammal.pk])).json()
+        assert data['images'] == []
+        assert data['has_next'] is False
+
+    def test_detail_alt_includes_short_description(self, client):
+        """O alt da imagem do detalhe termina com a descrição curta"""
+        Mammal.objects.filter(pk=self.mammal.pk).update(description="Raposa das Ilhas Malvinas.")
+        response = client.get(reverse('mammals:detail', args=[self.mammal.pk]))
+        assert 'mamífero extinto. Raposa das Ilhas Malvinas."' in response.content.decode()
+
+    def test_gallery_of_missing_mammal_is_404(self, client):
+        """Mamífero inexistente retorna 404 (não uma galeria vazia)"""
+        response = client.get(reverse('mammals:gallery', args=[self.mammal.pk + 1000]))
+        assert response.status_code == 404
+
+    def test_index_images_fills_gallery_from_folder(self, image_root):
+        """index_images cria a galeria a partir da pasta com o nome científico"""
+        folder = image_root / 'dusicyon_australis'
+        folder.mkdir()
+        gradient = Image.linear_gradient('L').rotate(-90).convert('RGB')
+        gradient.save(folder / 'Cranio_lateral.png')
+        Image.effect_noise((64, 64), 80).convert('RGB').save(folder / 'Xk3fA9.png')
+
+        call_command('index_images', workers=1, stdout=io.StringIO())
+        call_command('index_images', workers=1, stdout=io.StringIO())
+
+        gallery = list(self.mammal.images.values_list('image_asset', 'caption'))
+        assert gallery == [
+            ('dusicyon_australis/Cranio_lateral.png', 'Cranio lateral'),
+            ('dusicyon_australis/Xk3fA9.png', ''),
+        ]
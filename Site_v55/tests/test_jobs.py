@@ -0,0 +1,123 @@
+"""
+Testes da Fila de Tarefas - test_jobs.py
+
+Testa as tarefas em segundo plano (mammals.jobs / mammals.tasks):
+- Agendamento ao salvar um Mammal, sem duplicar pendentes
+- Execução pelo worker, novas tentativas e reserva exclusiva
+- Ações em massa que só agendam tarefas
+"""
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+
+from mammals import bulk_actions, jobs
+from mammals.models import Job, Mammal, Translation
+from mammals.translation_service import get_translation_cache_key
+
+
+@pytest.fixture
+def mammal(db):
+    return Mammal.objects.create(
+        common_name="Lobo-da-Tasmânia",
+        binomial_name="Thylacinus cynocephalus",
+        description="Marsupial carnívoro extinto em 1936.",
+        habitat="Florestas e campos abertos.",
+    )
+
+
+@pytest.fixture
+def failing_task():
+    calls = []
+
+    @jobs.task(name='falha_teste', max_attempts=2)
+    def fail():
+        calls.append(1)
+        raise RuntimeError('API fora do ar')
+
+    yield calls
+    del jobs.TASKS['falha_teste']
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    """Testes para o agendamento e a execução das tarefas"""
+
+    def test_save_enqueues_refresh_once(self, mammal):
+        """Salvar agenda a tradução; salvar de novo não duplica"""
+        mammal.habitat = "Florestas úmidas."
+        mammal.save()
+
+        pending = Job.objects.filter(status=Job.PENDING)
+        assert list(pending.values_list('name', flat=True)) == ['translate_mammal']
+        assert pending.get(name='translate_mammal').payload == {'mammal_id': mammal.pk}
+
+    @override_settings(TRANSLATION_BACKEND='stub')
+    def test_worker_translation_reaches_web_process(self, mammal, client):
+        """O worker grava a tradução no banco; outro processo (cache vazio) a lê de lá"""
+        cache.clear()
+        assert jobs.work(burst=True) == 1
+
+        key = get_translation_cache_key(mammal.description, 'pt', 'en')
+        assert Translation.objects.get(key=key).text == f"[en] {mammal.description}"
+        assert Job.objects.filter(status=Job.DONE).count() == 1
+
+        cache.clear()
+        with override_settings(TRANSLATION_BACKEND='google'):
+            response = client.get(f'/en/mammal/{mammal.pk}/')
+        assert f"[en] {mammal.description}" in response.content.decode()
+
+    @override_settings(TRANSLATION_BACKEND='stub')
+    def test_untranslated_page_enqueues_instead_of_translating(self, mammal, client):
+        """Sem tradução guardada, a página mostra o original e agenda a tradução"""
+        Job.objects.all().delete()
+        cache.clear()
+        content = client.get(f'/en/mammal/{mammal.pk}/').content.decode()
+
+        assert mammal.description in content
+        assert f"[en] {mammal.description}" not in content
+        assert list(Job.objects.values_list('name', 'payload')) == [('translate_mammal', {'mammal_id': mammal.pk})]
+
+    def test_failed_job_is_retried_then_marked_failed(self, db, failing_task):
+        """Falhas voltam para a fila com espera crescente até max_attempts"""
+        job = jobs.enqueue('falha_teste')
+
+        assert jobs.work(burst=True) == 1
+        job.refresh_from_db()
+        assert job.status == Job.PENDING and job.attempts == 1
+        assert 'API fora do ar' in job.last_error
+        assert jobs.work(burst=True) == 0  # ainda esperando o RETRY_DELAY
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        jobs.work(burst=True)
+        job.refresh_from_db()
+        assert job.status == Job.FAILED and len(failing_task) == 2
+
+        assert jobs.retry(Job.objects.all()) == 1
+        assert Job.objects.get(pk=job.pk).attempts == 0
+
+    def test_claim_is_exclusive_and_release_requeues(self, db, failing_task):
+        """Uma tarefa reservada não é entregue a outro worker; release a devolve"""
+        jobs.enqueue('falha_teste')
+        job = jobs.claim('maquina:1')
+        assert job.status == Job.RUNNING and job.locked_by == 'maquina:1'
+        assert jobs.claim('maquina:2') is None
+
+        assert jobs.release('maquina:1') == 1
+        assert jobs.claim('maquina:2').pk == job.pk
+
+    def test_bulk_actions_only_enqueue(self, mammal):
+        """Traduzir e regenerar imagens em massa respondem sem executar o trabalho"""
+        Job.objects.all().delete()
+        queryset = Mammal.objects.filter(pk=mammal.pk)
+
+        assert bulk_actions.retranslate_mammals(queryset) == 1
+        assert bulk_actions.regenerate_images(queryset) == 1
+        assert sorted(Job.objects.values_list('name', flat=True)) == ['regenerate_images', 'translate_mammal']
+        assert Job.objects.get(name='regenerate_images').payload == {'mammal_ids': [mammal.pk]}
+
+    def test_run_worker_validates_processes(self, db):
+        """--processes precisa ser positivo"""
+        with pytest.raises(CommandError, match='positivo'):
+            call_command('run_worker', processes=0)
@@ -0,0 +1,104 @@
+"""
+Testes do Teste de Carga - test_loadtest.py
+
+Testa o harness de carga (mammals.loadtest / manage.py load_test):
+- Mix de cenários e percentis
+- Execução no processo com usuários virtuais concorrentes
+- Tradução stub (sem rede)
+- Confirmação (--allow-writes) para gravar fora do DEBUG
+- Erros de cenário no relatório e aviso do backend no modo HTTP
+"""
+
+import io
+import json
+
+import pytest
+from django.core.management import call_command, CommandError
+
+from mammals import loadtest
+from mammals.models import Comment, Mammal
+from mammals.translation_service import translate_text
+
+
+class TestLoadTestHelpers:
+    """Testes para as funções auxiliares"""
+
+    def test_parse_mix_and_percentiles(self):
+        """O mix aceita pesos por cenário e os percentis usam o posto mais próximo"""
+        assert loadtest.parse_mix('anonymous=3, search') == {'anonymous': 3.0, 'search': 1.0}
+        with pytest.raises(ValueError, match='desconhecido'):
+            loadtest.parse_mix('checkout=1')
+
+        values = [i / 1000 for i in range(1, 101)]
+        assert loadtest.percentile(values, 50) == 0.05
+        assert loadtest.percentile(values, 99) == 0.099
+        assert loadtest.percentile([], 95) == 0.0
+
+    def test_stub_translation_backend(self, db, settings):
+        """Com o backend 'stub' a tradução é instantânea e não usa a rede"""
+        settings.TRANSLATION_BACKEND = 'stub'
+        assert translate_text('Marsupial extinto.', 'pt', 'en') == '[en] Marsupial extinto.'
+
+
+    def test_scenario_errors_are_recorded(self, monkeypatch):
+        """Uma exceção fora de request entra no relatório e o usuário virtual continua"""
+        def broken(user):
+            raise LookupError('rota inexistente')
+
+        monkeypatch.setitem(loadtest.SCENARIOS, 'anonymous', broken)
+        result = loadtest.run(FakeTransport, {'anonymous': 1}, [1], users=2, iterations=3)
+
+        assert result['errors'] == 6
+        assert result['endpoints']['cenário:anonymous']['requests'] == 6
+
+
+class FakeTransport:
+    """Transporte que não faz requisições"""
+
+    def close(self):
+        pass
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTestCommand:
+    """Testes para o comando load_test (aplicação no processo)"""
+
+    def test_runs_mix_and_writes_report(self, tmp_path):
+        """Todos os cenários rodam sem erros e o relatório traz p50/p95/p99 por endpoint"""
+        Mammal.objects.create(common_name="Rato gigante", description="Roedor extinto.")
+        Mammal.objects.create(common_name="Lobo das Malvinas", description="Canídeo extinto.")
+        output = tmp_path / 'carga.json'
+
+        call_command(
+            'load_test', users=2, iterations=10, seed=7,
+            mix='anonymous=1,english=1,search=1,favorite=1,comment=1', json=str(output),
+        )
+
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert report['requests'] > 0 and report['errors'] == 0
+        for endpoint in report['endpoints'].values():
+            assert endpoint['p50_ms'] <= endpoint['p95_ms'] <= endpoint['p99_ms']
+        assert {'mammals:search', 'en:mammals:detail', 'mammals:add_comment'} <= report['endpoints'].keys()
+        assert Comment.objects.filter(content__startswith='[carga]').exists()
+
+    def test_http_mode_warns_about_server_backend(self):
+        """Com --url o stub não é aplicado aqui: o aviso lembra de iniciar o servidor com ele"""
+        Mammal.objects.create(common_name="Rato gigante", description="Roedor extinto.")
+        out = io.StringIO()
+        # Porta fechada: as requisições falham, mas o relatório sai
+        call_command('load_test', url='http://127.0.0.1:9', users=1, iterations=1, mix='search=1', stdout=out)
+        assert 'TRANSLATION_BACKEND=stub' in out.getvalue()
+
+    def test_requires_mammals(self):
+        """Sem espécies no banco o comando falha com uma mensagem clara"""
+        with pytest.raises(CommandError, match='Nenhuma espécie'):
+            call_command('load_test', iterations=1)
+
+    def test_in_process_requires_debug_or_allow_writes(self, settings):
+        """Fora do DEBUG, rodar no processo exige --allow-writes"""
+        settings.DEBUG = False
+        settings.IS_TESTING = False
+        Mammal.objects.create(common_name="Rato gigante", description="Roedor extinto.")
+
+        with pytest.raises(CommandError, match='--allow-writes'):
+            call_command('load_test', iterations=1)
+        call_command('load_test', users=1, iterations=1, mix='anonymous=1', allow_writes=True, stdout=io.StringIO())
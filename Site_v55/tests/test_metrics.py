@@ -0,0 +1,56 @@
+"""
+Testes das Métricas - test_metrics.py
+
+Testa o MetricsMiddleware:
+- Consultas, cache e duração acumulados por view
+- Exportação em /metrics (formato Prometheus, apenas local)
+- Orçamento de consultas por view
+"""
+
+import pytest
+from django.urls import reverse
+
+from mammals import metrics
+from mammals.models import Mammal
+
+
+@pytest.mark.django_db
+class TestMetricsMiddleware:
+    """Testes para a coleta e exportação das métricas"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        metrics.registry.reset()
+        Mammal.objects.create(common_name="Tilacino", description="Marsupial extinto.")
+
+    def test_queries_and_cache_are_recorded_per_view(self):
+        """Cada view acumula requisições, consultas e acertos/faltas de cache"""
+        self.client.get(reverse('mammals:facets'))
+        self.client.get(reverse('mammals:facets'))
+
+        stats = metrics.registry.snapshot('mammals:facets')
+        assert stats.requests == 2
+        assert stats.queries > 0
+        # Primeira requisição: falta; segunda: contagens vêm do cache
+        assert stats.cache_misses >= 1 and stats.cache_hits >= 1
+        assert stats.duration > 0 and stats.buckets[-1] == 2
+
+    def test_metrics_endpoint_is_local_only(self):
+        """/metrics exporta texto do Prometheus para 127.0.0.1 e 404 para os demais"""
+        self.client.get(reverse('mammals:search'))
+
+        response = self.client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.content.decode()
+        assert 'mammals_view_requests_total{view="mammals:search"} 1' in body
+        assert 'mammals_view_duration_seconds_bucket{view="mammals:search",le="+Inf"} 1' in body
+
+        assert self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code == 404
+
+    def test_query_budget_fails_when_exceeded(self, settings):
+        """Passar do orçamento de consultas gera QueryBudgetExceeded nos testes"""
+        settings.QUERY_BUDGETS = {'mammals:search': 0}
+        with pytest.raises(metrics.QueryBudgetExceeded, match='mammals:search'):
+            self.client.get(reverse('mammals:search'))
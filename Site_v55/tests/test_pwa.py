@@ -0,0 +1,186 @@
+"""
+Testes do PWA - test_pwa.py
+
+Testa o suporte offline:
+- Manifesto de precache (sw-precache.js) gerado no collectstatic
+- Sincronização do catálogo por deltas (/sync/)
+- ETags para a revalidação em segundo plano (stale-while-revalidate)
+"""
+
+import io
+import re
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models.signals import pre_save
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from mammals import catalog, tasks
+from mammals.models import CatalogState, Mammal
+from mammals.storage import build_precache_script
+
+
+class TestPrecacheManifest:
+    """Testes para o sw-precache.js gerado pelo storage"""
+
+    def test_version_is_computed_from_urls(self):
+        """A versão muda apenas quando alguma URL versionada muda"""
+        pages = ['/', '/offline/']
+        first = build_precache_script(['/static/css/style.aaa.css'], pages)
+        same = build_precache_script(['/static/css/style.aaa.css'], pages)
+        changed = build_precache_script(['/static/css/style.bbb.css'], pages)
+
+        version = re.compile(r'PRECACHE_VERSION = "(\w+)"')
+        assert version.search(first).group(1) == version.search(same).group(1)
+        assert version.search(first).group(1) != version.search(changed).group(1)
+
+    def test_collectstatic_writes_hashed_urls(self, tmp_path, settings):
+        """collectstatic grava sw-precache.js com os nomes com hash"""
+        source = tmp_path / 'src'
+        (source / 'css').mkdir(parents=True)
+        (source / 'css' / 'style.css').write_text('body { color: black; }')
+        (source / 'sw-precache.js').write_text("self.PRECACHE_VERSION = 'dev';")
+        settings.STATICFILES_DIRS = [source]
+        settings.STATIC_ROOT = tmp_path / 'root'
+        settings.STATICFILES_STORAGE = 'mammals.storage.PrecacheManifestStaticFilesStorage'
+        settings.PWA_PRECACHE_STATIC = ['css/style.css']
+        settings.PWA_PRECACHE_PAGES = ['/offline/']
+
+        call_command('collectstatic', interactive=False, verbosity=0, stdout=io.StringIO())
+
+        script = (tmp_path / 'root' / 'sw-precache.js').read_text()
+        assert re.search(r'"/static/css/style\.[0-9a-f]{12}\.css"', script)
+        assert '"/offline/"' in script
+        assert "'dev'" not in script
+        assert (tmp_path / 'root' / 'sw-precache.js.gz').exists()
+
+
+@pytest.mark.django_db
+class TestCatalogSync:
+    """Testes para o endpoint /sync/ do catálogo offline"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        self.thylacine = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            description="Marsupial carnívoro. " * 20,
+            continent="Oceania"
+        )
+        self.quagga = Mammal.objects.create(
+            common_name="Quagga",
+            binomial_name="Equus quagga quagga",
+            description="Subespécie de zebra."
+        )
+
+    def sync(self, since):
+        response = self.client.get(reverse('mammals:sync'), {'since': since})
+        assert response.status_code == 200
+        return response.json()
+
+    def test_first_sync_returns_full_catalog(self):
+        """since=0 devolve o catálogo completo em linhas compactas"""
+        data = self.sync(0)
+
+        assert data['full'] is True
+        assert data['version'] == catalog.current_version()
+        rows = [dict(zip(data['fields'], row)) for row in data['rows']]
+        assert [row['common_name'] for row in rows] == ['Tilacino', 'Quagga']
+        assert rows[0]['description'].endswith('...')
+        assert len(rows[0]['description']) == catalog.DESCRIPTION_LENGTH + 3
+
+    def test_delta_contains_only_changes_and_deletions(self):
+        """Depois de uma versão, só as espécies alteradas e os ids removidos"""
+        version = self.sync(0)['version']
+
+        self.thylacine.continent = "Austrália"
+        self.thylacine.save()
+        quagga_id = self.quagga.pk
+        self.quagga.delete()
+
+        data = self.sync(version)
+        assert data['full'] is False
+        assert data['version'] > version
+        assert [row[0] for row in data['rows']] == [self.thylacine.pk]
+        assert data['deleted'] == [quagga_id]
+
+        # Já sincronizado: nada a transferir
+        latest = self.sync(data['version'])
+        assert latest['rows'] == [] and latest['deleted'] == []
+
+    def test_failed_save_does_not_bump_catalog(self):
+        """Se o save falha, a versão e o total do catálogo não mudam"""
+        def fail(sender, **kwargs):
+            raise IntegrityError('falha simulada')
+
+        state = CatalogState.objects.values_list('version', 'mammal_count').get(pk=1)
+        pre_save.connect(fail, sender=Mammal)
+        try:
+            with pytest.raises(IntegrityError):
+                Mammal.objects.create(common_name="Quagga", binomial_name="Equus quagga")
+        finally:
+            pre_save.disconnect(fail, sender=Mammal)
+        assert CatalogState.objects.values_list('version', 'mammal_count').get(pk=1) == state
+
+    def test_unknown_version_forces_full_sync(self):
+        """Versão maior que a atual (banco recriado) devolve cópia completa"""
+        data = self.sync(catalog.current_version() + 100)
+        assert data['full'] is True
+        assert len(data['rows']) == 2
+
+
+@pytest.mark.django_db
+class TestRevalidationETags:
+    """Testes para os ETags usados na revalidação do Service Worker"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        self.mammal = Mammal.objects.create(
+            common_name="Tilacino",
+            binomial_name="Thylacinus cynocephalus",
+            description="Marsupial extinto."
+        )
+
+    def test_search_returns_304_until_catalog_changes(self):
+        """Mesmo ETag devolve 304; salvar uma espécie gera novo ETag"""
+        url = reverse('mammals:search')
+        etag = self.client.get(url).headers['ETag']
+
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        self.mammal.description = "Lobo-da-tasmânia."
+        self.mammal.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    @override_settings(TRANSLATION_BACKEND='stub')
+    def test_detail_etag_changes_when_translated(self):
+        """Página servida sem tradução não fica presa em 304; revalidar custa uma consulta"""
+        # override restaura o idioma da thread depois das requisições em /en/
+        with translation.override('en'):
+            url = reverse('mammals:detail', args=[self.mammal.pk])
+            etag = self.client.get(url).headers['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+            assert len(queries) == 1
+
+            tasks.translate_mammal(self.mammal.pk)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert '[en] Marsupial extinto.' in response.content.decode()
+
+    def test_detail_etag_only_for_anonymous(self, django_user_model):
+        """Páginas com estado do usuário (favoritos) não recebem ETag"""
+        url = reverse('mammals:detail', args=[self.mammal.pk])
+        assert 'ETag' in self.client.get(url).headers
+
+        user = django_user_model.objects.create_user(username='leitor', password='senha-segura-123')
+        self.client.force_login(user)
+        assert 'ETag' not in self.client.get(url).headers
@@ -5,10 +5,17 @@ Testes adicionais para aumentar cobertura de código nas views
 """
 
 import pytest
+from datetime import timedelta
 from django.test import Client
 from django.urls import reverse
 from django.contrib.auth.models import User
-from mammals.models import Mammal, Comment, Favorite
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mammals import catalog, facets, views
+from mammals.bulk_actions import delete_mammals
+from mammals.models import Mammal, Comment, Dossier, DossierSection, Favorite, FacetCount, MammalTombstone
 from accounts.models import UserProfile
 
 
@@ -405,3 +412,173 @@ class TestCommentOperations:
         # Comentário não deve ser deletado
         assert Comment.objects.filter(pk=comment_id).exists()
 
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Testes para a paginação por cursor da página inicial"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Nomes repetidos testam o desempate pelo id"""
+        self.client = Client()
+        for index in range(30):
+            Mammal.objects.create(
+                common_name=f"Espécie {index // 2:02d}",
+                binomial_name=f"Genus species{index}",
+                description="Mamífero extinto."
+            )
+
+    def test_pages_follow_cursor_without_gaps(self):
+        """Próxima e anterior percorrem (common_name, id) sem repetir nem pular"""
+        first = self.client.get(reverse('mammals:index')).context['mammals']
+        assert len(first) == views.INDEX_PAGE_SIZE and not first.has_previous()
+
+        second = self.client.get(reverse('mammals:index'), {'after': first.next_cursor}).context['mammals']
+        assert not second.has_next()
+
+        expected = list(Mammal.objects.order_by('common_name', 'id').values_list('id', flat=True))
+        assert [m.pk for m in first] + [m.pk for m in second] == expected
+
+        back = self.client.get(reverse('mammals:index'), {'before': second.previous_cursor}).context['mammals']
+        assert [m.pk for m in back] == [m.pk for m in first]
+
+    def test_listing_is_one_query_with_cached_total(self):
+        """Total vem do contador do catálogo: sem COUNT(*) a cada requisição"""
+        response = self.client.get(reverse('mammals:index'))
+        assert response.context['total_count'] == 30
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('mammals:index'), {'after': 'cursor-invalido'})
+        sql = [q['sql'] for q in queries.captured_queries]
+        assert not any('COUNT(' in q.upper() for q in sql)
+        assert len([q for q in sql if 'mammals_mammal' in q]) == 1
+
+        Mammal.objects.first().delete()
+        assert self.client.get(reverse('mammals:index')).context['total_count'] == 29
+
+
+@pytest.mark.django_db
+class TestAdminUsersList:
+    """Testes para a lista de usuários do painel admin (contadores e cursor)"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, admin_client):
+        self.client = admin_client
+        self.mammal = Mammal.objects.create(common_name="Tilacino")
+        base = timezone.now() - timedelta(days=30)
+        for i in range(4):
+            user = User.objects.create_user(username=f'leitor{i}', email=f'leitor{i}@example.com', password='x')
+            User.objects.filter(pk=user.pk).update(date_joined=base + timedelta(days=i))
+
+    def get(self, **params):
+        return self.client.get(reverse('mammals:admin_users'), params)
+
+    def test_counters_follow_comments_and_favorites(self):
+        """Comentar e favoritar atualiza os contadores do perfil; apagar desfaz"""
+        user = User.objects.get(username='leitor0')
+        comment = Comment.objects.create(mammal=self.mammal, user=user, content="Triste.")
+        Favorite.objects.create(mammal=self.mammal, user=user)
+        profile = UserProfile.objects.get(user=user)
+        assert (profile.comment_count, profile.favorite_count) == (1, 1)
+
+        comment.delete()
+        self.mammal.delete()  # apaga o favorito em cascata
+        profile.refresh_from_db()
+        assert (profile.comment_count, profile.favorite_count) == (0, 0)
+
+    def test_keyset_pages_and_prefix_search(self, monkeypatch):
+        """Mais recentes primeiro, por cursor; a busca filtra pelo início do username/email"""
+        monkeypatch.setattr(views, 'ADMIN_USERS_PAGE_SIZE', 2)
+
+        first = self.get()
+        content = first.content.decode()
+        assert first.status_code == 200
+        assert content.index('<td>admin</td>') < content.index('<td>leitor3</td>')
+        assert 'leitor1' not in content and 'after=' in content
+
+        cursor = content.split('after=')[1].split('"')[0]
+        second = self.get(after=cursor).content.decode()
+        assert 'leitor2' in second and 'leitor1' in second and 'leitor3' not in second
+
+        found = self.get(q='LEITOR2@').content.decode()
+        assert 'leitor2@example.com' in found and 'leitor1' not in found
+
+
+@pytest.mark.django_db
+class TestAdminMammalsBulk:
+    """Testes para a lista admin de mamíferos (filtros) e as ações em massa"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, admin_client, regular_user):
+        self.client = admin_client
+        self.reader = regular_user
+        self.mammals = [
+            Mammal.objects.create(common_name=f"Rato {i}", continent="Oceania" if i % 2 else "Ásia",
+                                  taxonomy_order="Rodentia", description="Roedor extinto. " * 50)
+            for i in range(6)
+        ]
+
+    def test_list_filters_by_continent(self):
+        """O filtro usa a chave normalizada e a tabela traz só as espécies do continente"""
+        response = self.client.get(reverse('mammals:admin_mammals'), {'continent': 'OCEANIA'})
+        content = response.content.decode()
+        assert response.status_code == 200
+        assert 'Rato 1' in content and 'Rato 3' in content and 'Rato 0' not in content
+
+    def test_panel_does_not_shadow_django_admin(self):
+        """O painel fica em painel/; admin/mammals/ continua sendo do admin do Django"""
+        assert reverse('mammals:admin_mammals') == '/pt-br/painel/mammals/'
+        # Admin do painel não é staff: o admin do Django responde com o login dele
+        response = self.client.get('/pt-br/admin/mammals/')
+        assert response.status_code == 302
+        assert response['Location'].startswith('/pt-br/admin/login/')
+
+    def test_bulk_delete_keeps_catalog_consistent(self):
+        """Exclusão em massa: tombstones, total, contagens por faceta e contadores dos perfis"""
+        doomed = self.mammals[:4]
+        for mammal in doomed:
+            Comment.objects.create(mammal=mammal, user=self.reader, content="Triste.")
+        dossier = Dossier.objects.create(mammal=doomed[0], language='pt-br', title="Dossiê")
+        DossierSection.objects.create(dossier=dossier, anchor='historia', nav_label="História", title="História")
+        catalog.refresh_mammal_count()
+        count_rows = set(FacetCount.objects.values_list('pk', flat=True))
+
+        response = self.client.post(
+            reverse('mammals:admin_bulk_mammals'),
+            {'action': 'delete', 'ids': [m.pk for m in doomed], 'next': '/pt-br/'}
+        )
+
+        assert response.status_code == 302 and response['Location'] == '/pt-br/'
+        assert Mammal.objects.count() == 2
+        assert set(MammalTombstone.objects.values_list('mammal_id', flat=True)) == {m.pk for m in doomed}
+        assert catalog.mammal_count() == 2
+        assert sum(item['count'] for item in facets.facet_counts()['continents']) == 2
+        # Só as linhas das chaves removidas mudam; nada é recalculado do zero
+        assert set(FacetCount.objects.values_list('pk', flat=True)) == count_rows
+        assert UserProfile.objects.get(user=self.reader).comment_count == 0
+        # Tabelas filhas vêm das relações dos modelos, inclusive as netas (seções do dossiê)
+        assert not Dossier.objects.exists() and not DossierSection.objects.exists()
+
+    def test_bulk_delete_query_count_does_not_grow_per_row(self):
+        """Uma espécie ou quatro, com comentários e favoritos: as mesmas consultas, sem signals"""
+        for mammal in self.mammals:
+            Comment.objects.create(mammal=mammal, user=self.reader, content="Triste.")
+            Favorite.objects.create(mammal=mammal, user=self.reader)
+        deleted = []
+
+        def on_delete(sender, **kwargs):
+            deleted.append(sender)
+
+        def delete(mammals):
+            with CaptureQueriesContext(connection) as queries:
+                delete_mammals(Mammal.objects.filter(pk__in=[m.pk for m in mammals]))
+            return len(queries)
+
+        post_delete.connect(on_delete)
+        try:
+            assert delete(self.mammals[:1]) == delete(self.mammals[1:5])
+        finally:
+            post_delete.disconnect(on_delete)
+        assert not {Mammal, Comment, Favorite} & set(deleted)
+        assert not Comment.objects.exclude(mammal=self.mammals[5]).exists()
@@ -0,0 +1,150 @@
+"""
+Testes do Aquecimento de Cache - test_warmup.py
+
+Testa o warm_caches (mammals.warmup) e os caches que ele preenche:
+- Traduções gravadas no banco, mapa global e respostas JSON comprimidas
+- Aquecimento do cache de cada processo (warm_process) e falhas contadas
+- Dados do mapa em cache por versão do catálogo
+- Consultas do cache em banco no orçamento de SQL das views
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.cache import cache, caches
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mammals import catalog, metrics, warmup
+from mammals.models import Mammal, Translation
+from mammals.translation_service import get_translation_cache_key, target_languages
+
+
+def create_mammals(count):
+    for i in range(count):
+        Mammal.objects.create(
+            common_name=f"Espécie {i:02d}", binomial_name=f"Genus species{i}",
+            description=f"Espécie {i:02d}, extinta no século XIX. " * 60,
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWarmCaches:
+    """Testes para o comando warm_caches e o aquecimento de cada processo"""
+
+    @override_settings(TRANSLATION_BACKEND='stub')
+    def test_stores_every_translation(self):
+        """Com cache em memória, o comando grava as traduções e não visita endpoints"""
+        create_mammals(30)
+        out = StringIO()
+        call_command('warm_caches', workers=1, stdout=out)
+
+        output = out.getvalue()
+        assert 'preenchimento' in output and '(100.0%), 0 erros' in output
+        assert 'endpoints' not in output and 'mapa' not in output
+        for description in Mammal.objects.values_list('description', flat=True):
+            assert Translation.objects.filter(key=get_translation_cache_key(description, 'pt', 'en')).exists()
+
+    # Os orçamentos de consultas são os do LocMemCache: no cache em banco cada get é SQL
+    @override_settings(
+        TRANSLATION_BACKEND='stub', CACHE_MODE='db', QUERY_BUDGET_ENFORCE=False,
+        CACHES={'default': {'BACKEND': 'mammals.cache.InstrumentedDatabaseCache', 'LOCATION': 'test_warm_cache'}},
+    )
+    def test_shared_cache_gets_json_endpoints(self):
+        """Com cache compartilhado, também ficam no cache o mapa e os endpoints JSON"""
+        call_command('createcachetable', 'test_warm_cache')
+        create_mammals(3)
+        out = StringIO()
+        call_command('warm_caches', workers=1, stdout=out)
+
+        output = out.getvalue()
+        assert '(100.0%), 0 erros' in output and '4 endpoints' in output
+        assert cache.get(catalog.map_data_cache_key()) is not None
+        assert sorted(warmup.json_urls()) == [
+            '/en/facets/', '/en/global-map-data/', '/pt-br/facets/', '/pt-br/global-map-data/',
+        ]
+
+    @override_settings(TRANSLATION_BACKEND='stub')
+    def test_failures_fail_the_command(self, monkeypatch):
+        """Uma espécie que falha é contada como erro e o comando termina com erro"""
+        create_mammals(3)
+        original = warmup.prefill_translations
+
+        def prefill(texts, raise_errors=False):
+            if texts[0].startswith('Espécie 01'):
+                raise RuntimeError('API fora do ar')
+            return original(texts, raise_errors)
+
+        monkeypatch.setattr(warmup, 'prefill_translations', prefill)
+        with pytest.raises(CommandError, match='1 erros'):
+            call_command('warm_caches', workers=1, stdout=StringIO(), stderr=StringIO())
+        assert Translation.objects.count() == 2 * len(target_languages())
+
+    def test_warm_process_fills_this_process_cache(self):
+        """Cada worker carrega as traduções da tabela e visita mapa, facetas e listagem"""
+        create_mammals(30)
+        description = Mammal.objects.values_list('description', flat=True).first()
+        key = get_translation_cache_key(description, 'pt', 'en')
+        Translation.objects.create(key=key, text='Extinct species.')
+        cache.clear()
+        metrics.registry.reset()
+
+        visits, failures = warmup.warm_process()
+
+        assert failures == [] and all(item.status == 200 for item in visits)
+        assert len(warmup.list_urls()) == 4  # 2 páginas de 24 em cada idioma
+        assert {item.url for item in visits} >= set(warmup.json_urls() + warmup.list_urls())
+        assert cache.get(key) == 'Extinct species.'
+        assert cache.get(catalog.map_data_cache_key()) is not None
+        assert metrics.registry.snapshot('mammals:index') is None
+
+    def test_rejects_invalid_workers(self):
+        """--workers precisa ser positivo"""
+        with pytest.raises(CommandError, match='positivo'):
+            call_command('warm_caches', workers=0)
+
+
+@pytest.mark.django_db
+class TestWarmedCaches:
+    """Testes para os caches preenchidos pelo aquecimento"""
+
+    def test_map_data_cached_per_catalog_version(self, client):
+        """O mapa é montado uma vez por versão do catálogo"""
+        Mammal.objects.create(common_name="Foca-monge-do-caribe", binomial_name="Neomonachus tropicalis")
+        cache.clear()
+        url = reverse('mammals:global_map_data')
+
+        with CaptureQueriesContext(connection) as first:
+            client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            client.get(url)
+        assert any('"mammals_mammal"' in query['sql'] for query in first.captured_queries)
+        assert not any('"mammals_mammal"' in query['sql'] for query in second.captured_queries)
+        assert cache.get(catalog.map_data_cache_key())['success'] is True
+
+        catalog.bump_version()
+        assert cache.get(catalog.map_data_cache_key()) is None
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'mammals.cache.InstrumentedLocMemCache'},
+        'shared': {'BACKEND': 'mammals.cache.InstrumentedDatabaseCache', 'LOCATION': 'test_shared_cache'},
+    })
+    def test_database_cache_queries_counted(self):
+        """Consultas do cache em banco contam no orçamento e aparecem à parte"""
+        call_command('createcachetable', 'test_shared_cache')
+        shared = caches['shared']
+        request_metrics = metrics.RequestMetrics()
+        token = request_metrics.activate()
+        try:
+            with connection.execute_wrapper(request_metrics):
+                shared.set('mapa', {'success': True})
+                assert shared.get('mapa') == {'success': True}
+                assert shared.get('ausente') is None
+        finally:
+            request_metrics.deactivate(token)
+
+        assert request_metrics.queries == request_metrics.cache_queries > 0
+        assert (request_metrics.cache_hits, request_metrics.cache_misses) == (1, 1)